@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Offscreen animation export time for a graph BFS trace and a maze wave trace.
+
+Records both searches headlessly and exports each trace with
+search_common.animation_export. Graph frames are rendered by Agg with a
+random layout, and maze frames come from NumPy pixel buffers. The output is
+written to --out-dir. Reports the trace length, the frame count and the
+record/export times for each worker count in --processes.
+
+    python benchmarks/bench_export.py --nodes 5000 --maze 300 --processes 1 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'lab_1_2'))
+sys.path.insert(0, os.path.join(ROOT, 'lab_3_4'))
+
+import networkx as nx
+import search_core
+from search_trace import record_graph_search
+from trace_export import export_graph_trace
+from maze_search import DEFAULT_OPERATOR, PASSAGE, generate_grid
+from maze_trace import record_wave_search
+from maze_export import export_maze_trace
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--nodes', type=int, default=5000)
+    ap.add_argument('--maze', type=int, default=300, help='maze side in cells')
+    ap.add_argument('--walls', type=float, default=0.2, help='maze wall density')
+    ap.add_argument('--frames', type=int, default=300)
+    ap.add_argument('--processes', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    ap.add_argument('--format', choices=['gif', 'mp4'], default='gif')
+    ap.add_argument('--out-dir', default=tempfile.gettempdir())
+    ap.add_argument('--seed', type=int, default=1)
+    args = ap.parse_args()
+
+    G = search_core.ensure_connected_graph(args.nodes, 3 * args.nodes, seed=args.seed)
+    pos = nx.random_layout(G, seed=args.seed)
+    grid = generate_grid(args.maze, args.maze, args.walls, random.Random(args.seed))
+    goal = (args.maze - 1, args.maze - 1)
+    grid[0][0] = grid[goal[0]][goal[1]] = PASSAGE
+
+    t = time.perf_counter()
+    graph_trace = record_graph_search(G, 0, args.nodes - 1, 'BFS')
+    t_graph = time.perf_counter() - t
+    t = time.perf_counter()
+    maze_trace = record_wave_search(grid, (0, 0), goal, DEFAULT_OPERATOR)
+    t_maze = time.perf_counter() - t
+    jobs = [('graph', graph_trace, t_graph, lambda path, p: export_graph_trace(graph_trace, G, pos, path, args.frames,
+                                                                              processes=p)),
+            ('maze', maze_trace, t_maze, lambda path, p: export_maze_trace(maze_trace, grid, path, args.frames,
+                                                                           processes=p))]
+
+    print(f"{'trace':<6} {'events':>8} {'record (s)':>11} {'workers':>8} {'frames':>7} {'export (s)':>11} {'size KB':>8}")
+    for name, trace, t_record, export in jobs:
+        for p in args.processes:
+            path = os.path.join(args.out_dir, f"{name}_search.{args.format}")
+            t = time.perf_counter()
+            frames = export(path, p)
+            elapsed = time.perf_counter() - t
+            print(f"{name:<6} {len(trace):>8} {t_record:>11.2f} {p:>8} {frames:>7} {elapsed:>11.2f} "
+                  f"{os.path.getsize(path) // 1024:>8}")
+
+
+if __name__ == '__main__':
+    main()
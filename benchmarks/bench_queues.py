@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Uniform-cost search time with each priority queue on the generated graph families.
+
+Builds the editor's graph families (tree, undirected, directed; as in Run
+Experiments) with random integer weights up to each --max-weights value and
+runs a full single-source Dijkstra from a few sources with the binary,
+pairing and radix heaps. All queues must give the same distances; the table
+reports the best time over the sources and the speed relative to the binary heap.
+
+    python benchmarks/bench_queues.py --nodes 200000 --max-weights 1 100 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'lab_1_2'))
+
+from priority_queues import QUEUES
+import search_core
+import weighted_search
+
+
+def families(nodes, edges, max_weight, seed):
+    return [('tree', search_core.ensure_connected_graph(nodes, nodes - 1, seed=seed, max_weight=max_weight)),
+            ('undirected', search_core.ensure_connected_graph(nodes, edges, seed=seed, max_weight=max_weight)),
+            ('directed', search_core.ensure_connected_graph(nodes, edges, directed=True, seed=seed,
+                                                            max_weight=max_weight))]
+
+
+def time_queue(G, sources, queue):
+    best = float('inf')
+    results = []
+    for s in sources:
+        t = time.perf_counter()
+        dist = weighted_search.ucs_distances(G, [s], queue)
+        best = min(best, time.perf_counter() - t)
+        results.append(dist)
+    return best, results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--nodes', type=int, default=50000)
+    ap.add_argument('--edges', type=int, default=None, help='default: 3 per node')
+    ap.add_argument('--max-weights', type=int, nargs='+', default=[1, 100, 100000])
+    ap.add_argument('--sources', type=int, default=3)
+    ap.add_argument('--seed', type=int, default=1)
+    args = ap.parse_args()
+    edges = args.edges or 3 * args.nodes
+    sources = random.Random(args.seed).sample(range(args.nodes), args.sources)
+
+    print(f"{'family':<11} {'max w':>7} {'reached':>8} " + ' '.join(f"{q + ' (ms)':>14}" for q in QUEUES)
+          + '  ' + ' '.join(f"{q:>8}" for q in QUEUES))
+    for max_weight in args.max_weights:
+        for family, G in families(args.nodes, edges, max_weight, args.seed):
+            times = {}
+            reference = None
+            for queue in QUEUES:
+                times[queue], results = time_queue(G, sources, queue)
+                reference = reference or results
+                if results != reference:
+                    raise SystemExit(f"{queue} heap disagrees with {next(iter(QUEUES))} heap on {family}")
+            base = times[next(iter(QUEUES))]
+            print(f"{family:<11} {max_weight:>7} {len(reference[0]):>8} "
+                  + ' '.join(f"{1000 * times[q]:>14.1f}" for q in QUEUES)
+                  + '  ' + ' '.join(f"{base / times[q]:>7.2f}x" for q in QUEUES))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Memory and time of the searches with each visited/parent store.
+
+Runs the bidirectional wave search on a procedural maze and DFS/BFS on a
+random connected graph, once per store, and reports the tracemalloc peak
+(Python heap, i.e. everything but the mapped visited/parent arrays) and the
+wall time. Frontier queues are included in the peak and are the same for
+every store.
+
+    python benchmarks/bench_stores.py --rows 1500 --cols 1500 --nodes 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'lab_1_2'))
+sys.path.insert(0, os.path.join(ROOT, 'lab_3_4'))
+
+from search_common.implicit import ProceduralMaze
+from search_common.stores import BitmapStore, GridStore, MmapStore, store_bytes
+import maze_search
+import search_core
+
+
+def measure(run):
+    tracemalloc.start()
+    t = time.perf_counter()
+    reached = run()
+    elapsed = time.perf_counter() - t
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed, reached
+
+
+def wave_runs(rows, cols, density, seed):
+    maze = ProceduralMaze(rows, cols, density, seed)
+    goal = (rows - 1, cols - 1)
+
+    def run(store):
+        def go():
+            st = maze_search.WaveState((0, 0), goal, store)
+            for _ in maze_search.wave_search_events(maze, (0, 0), goal, None, st):
+                pass
+            reached = len(st.visited_start) + len(st.visited_goal)
+            st.close()
+            return reached
+        return go
+
+    grid_store = lambda: GridStore(rows, cols)
+    mmap_store = lambda: GridStore(rows, cols, mmap=True)
+    # bitmap stores keep their parent arrays in anonymous mappings, outside the traced heap
+    return [('set/dict', run(None), 0), ('grid bitmap', run(grid_store), 2 * store_bytes(rows * cols)),
+            ('grid mmap', run(mmap_store), 2 * store_bytes(rows * cols))]
+
+
+def graph_runs(nodes, engine):
+    G = search_core.ensure_connected_graph(nodes, int(nodes * 1.5), seed=1)
+    events = search_core.dfs_events if engine == 'DFS' else search_core.bfs_events
+
+    def run(store):
+        def go():
+            r = search_core.SearchRun()
+            for _ in events(G, 0, -1, run=r, store=store):
+                pass
+            reached = len(r.visited)
+            r.close()
+            return reached
+        return go
+
+    return [('set/dict', run(None), 0), ('bitmap', run(lambda: BitmapStore(nodes)), store_bytes(nodes)),
+            ('mmap', run(lambda: MmapStore(nodes)), store_bytes(nodes))]
+
+
+def report(title, runs):
+    print(f"\n{title}")
+    print(f"{'store':<12} {'reached':>10} {'heap peak (MB)':>15} {'B/node':>8} {'mmap (MB)':>10} {'time (s)':>9}")
+    base = None
+    for name, run, mapped in runs:
+        peak, elapsed, reached = measure(run)
+        base = base or peak
+        print(f"{name:<12} {reached:>10} {peak / 2**20:>15.1f} {peak / max(reached, 1):>8.1f} "
+              f"{mapped / 2**20:>10.1f} {elapsed:>9.2f}   x{base / max(peak, 1):.1f} less heap")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--rows', type=int, default=1000)
+    ap.add_argument('--cols', type=int, default=1000)
+    ap.add_argument('--density', type=float, default=0.3)
+    ap.add_argument('--nodes', type=int, default=100000)
+    ap.add_argument('--seed', type=int, default=1)
+    args = ap.parse_args()
+    report(f"Wave search, {args.rows}x{args.cols} procedural maze",
+           wave_runs(args.rows, args.cols, args.density, args.seed))
+    for engine in ('BFS', 'DFS'):
+        report(f"{engine}, {args.nodes} nodes (full traversal)", graph_runs(args.nodes, engine))
+
+
+if __name__ == '__main__':
+    main()
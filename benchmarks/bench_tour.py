@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Multi-stop tour optimization time on a generated weighted graph.
+
+Picks --stops random nodes of a connected graph with random integer weights
+(as in the editor's generator), builds their distance matrix and solves the
+tour: exactly with Held-Karp up to tour.EXACT_LIMIT stops, with nearest
+neighbour + 2-opt/Or-opt above it. For each worker count in --processes
+reports the matrix and solve times, the end-to-end tour.plan_tour time
+(matrix, solve and unrolling the legs into roads) and the improvement over
+the plain nearest-neighbour tour.
+
+    python benchmarks/bench_tour.py --stops 8 12 50 200 --nodes 20000 --processes 1 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'lab_1_2'))
+sys.path.insert(0, os.path.join(ROOT, 'lab_5'))
+
+import search_core
+import tour
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--nodes', type=int, default=20000)
+    ap.add_argument('--edges', type=int, default=None, help='default: 3 per node')
+    ap.add_argument('--max-weight', type=int, default=100)
+    ap.add_argument('--stops', type=int, nargs='+', default=[8, 12, 50, 200])
+    ap.add_argument('--open', action='store_true', help='do not return to the first stop')
+    ap.add_argument('--processes', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    ap.add_argument('--seed', type=int, default=1)
+    args = ap.parse_args()
+    G = search_core.ensure_connected_graph(args.nodes, args.edges or 3 * args.nodes, seed=args.seed,
+                                           max_weight=args.max_weight)
+    rng = random.Random(args.seed)
+
+    print(f"{'stops':>6} {'workers':>8} {'method':<8} {'matrix (ms)':>12} {'solve (ms)':>11} {'total (ms)':>11} "
+          f"{'length':>9} {'nearest nb':>11} {'gain':>7}")
+    for n in args.stops:
+        stops = rng.sample(list(G.nodes()), n)
+        for p in args.processes:
+            t = time.perf_counter()
+            matrix, _ = tour.distance_matrix(G, stops, processes=p)
+            t_matrix = time.perf_counter() - t
+            t = time.perf_counter()
+            if n <= tour.EXACT_LIMIT:
+                method, (_, length) = 'exact', tour.held_karp(matrix, not args.open)
+            else:
+                method, (_, length) = '2-opt', tour.improve(matrix, tour.nearest_neighbor(matrix), not args.open)
+            t_solve = time.perf_counter() - t
+            t = time.perf_counter()
+            tour.plan_tour(G, stops, not args.open, processes=p)
+            t_total = time.perf_counter() - t
+            greedy = tour._length(matrix, tour.nearest_neighbor(matrix), not args.open)
+            print(f"{n:>6} {p:>8} {method:<8} {1000 * t_matrix:>12.1f} {1000 * t_solve:>11.1f} {1000 * t_total:>11.1f} "
+                  f"{length:>9.0f} {greedy:>11.0f} {100 * (1 - length / greedy):>6.1f}%")
+
+
+if __name__ == '__main__':
+    main()
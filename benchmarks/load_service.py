@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Load test of the routing/search service on localhost.
+
+Starts lab_5/route_service.py in-process on a free port (or targets a running
+one with --port), then keeps --clients keep-alive connections busy with a
+mixed workload: road routes between random cities, weighted paths on the
+generated graph, maze paths, and small many-to-many distance requests. A
+share of the queries repeats a few popular ones, which exercises coalescing
+and the result cache. Prints the client-side throughput and latency and the
+service's /metrics.
+
+    python benchmarks/load_service.py --requests 2000 --clients 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lab_5'))
+
+import route_service
+from road_data import POSITIONS
+
+
+async def request(reader, writer, method, path, body=None):
+    data = json.dumps(body).encode('utf-8') if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n".encode('utf-8')
+                 + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':')[1])
+    return status, json.loads(await reader.readexactly(length))
+
+
+def workload(count, nodes, maze, seed, popular=0.3):
+    rng = random.Random(seed)
+    cities = sorted(POSITIONS)
+
+    def fresh():
+        kind = rng.random()
+        if kind < 0.35:
+            a, b = rng.sample(cities, 2)
+            return 'GET', '/route?' + urlencode({'from': a, 'to': b, 'algo': rng.choice(list(route_service.ROUTE_KEYS))}), None
+        if kind < 0.6:
+            return 'GET', f"/graph/path?start={rng.randrange(nodes)}&goal={rng.randrange(nodes)}&algo=ucs", None
+        if kind < 0.8:
+            return 'GET', f"/maze/path?start=0,0&goal={rng.randrange(maze)},{rng.randrange(maze)}", None
+        return 'POST', '/distances', {'graph': 'road', 'sources': rng.sample(cities, 4), 'targets': rng.sample(cities, 8)}
+
+    hot = [fresh() for _ in range(5)]
+    return [rng.choice(hot) if rng.random() < popular else fresh() for _ in range(count)]
+
+
+async def run_load(port, jobs, clients):
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            while not queue.empty():
+                method, path, body = queue.get_nowait()
+                t = time.perf_counter()
+                status, _ = await request(reader, writer, method, path, body)
+                latencies.append(time.perf_counter() - t)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    t = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - t
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    _, metrics = await request(reader, writer, 'GET', '/metrics')
+    writer.close()
+    return elapsed, sorted(latencies), errors, metrics
+
+
+async def main_async(args):
+    service = None
+    port = args.port
+    if port is None:
+        config = {'graph_nodes': args.graph_nodes, 'graph_edges': 3 * args.graph_nodes, 'maze': args.maze}
+        service = route_service.SearchService(config, args.processes, args.batch_ms)
+        t = time.perf_counter()
+        port = await service.start(port=0)
+        print(f"service on port {port} ({service.processes} processes), loaded in {time.perf_counter() - t:.2f}s")
+    try:
+        jobs = workload(args.requests, args.graph_nodes, args.maze, args.seed)
+        elapsed, lat, errors, metrics = await run_load(port, jobs, args.clients)
+    finally:
+        if service is not None:
+            await service.close()
+    pct = lambda q: 1000 * lat[min(len(lat) - 1, int(q * len(lat)))]
+    print(f"{len(lat)} requests, {args.clients} clients: {len(lat) / elapsed:.1f} req/s, errors {errors}")
+    print(f"latency ms: p50 {pct(0.5):.2f}  p95 {pct(0.95):.2f}  p99 {pct(0.99):.2f}  max {1000 * lat[-1]:.2f}")
+    print(json.dumps(metrics, ensure_ascii=False, indent=2))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--port', type=int, default=None, help='port of a running service (default: start one)')
+    ap.add_argument('--requests', type=int, default=1000)
+    ap.add_argument('--clients', type=int, default=16)
+    ap.add_argument('--processes', type=int, default=None)
+    ap.add_argument('--batch-ms', type=float, default=5.0)
+    ap.add_argument('--graph-nodes', type=int, default=route_service.DEFAULT_CONFIG['graph_nodes'],
+                    help='must match the running service with --port')
+    ap.add_argument('--maze', type=int, default=route_service.DEFAULT_CONFIG['maze'])
+    ap.add_argument('--seed', type=int, default=1)
+    asyncio.run(main_async(ap.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
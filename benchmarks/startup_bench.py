@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for the three lab apps.
+
+Each app is launched in a fresh interpreter (so imports are really cold), and
+the time until the window is first idle and until its data is attached is
+reported. Results are appended to ``startup_history.jsonl`` next to this
+script so regressions can be tracked across commits. Needs a display.
+
+    python benchmarks/startup_bench.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = {
+    'graph_search': os.path.join(ROOT, 'lab_1_2', 'graph_search_lab1_2.py'),
+    'wave_search': os.path.join(ROOT, 'lab_3_4', 'wave_search_app.py'),
+    'road_map': os.path.join(ROOT, 'lab_5', 'main.py'),
+}
+
+
+def run_once(script, timeout):
+    env = dict(os.environ, APP_STARTUP_BENCH='1', APP_STARTUP_T0=repr(time.time()))
+    out = subprocess.run([sys.executable, script], cwd=os.path.dirname(script), env=env,
+                         capture_output=True, text=True, timeout=timeout)
+    for line in reversed(out.stdout.splitlines()):
+        if line.startswith('{'):
+            return json.loads(line)
+    raise RuntimeError(f'{script} did not report startup marks:\n{out.stderr}')
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--runs', type=int, default=5)
+    ap.add_argument('--apps', nargs='*', default=list(APPS), choices=list(APPS))
+    ap.add_argument('--timeout', type=float, default=60)
+    ap.add_argument('--history', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_history.jsonl'))
+    args = ap.parse_args()
+
+    rev = git_revision()
+    print(f"{'app':<14} {'window (s)':>12} {'ready (s)':>12}")
+    for app in args.apps:
+        marks = [run_once(APPS[app], args.timeout) for _ in range(args.runs)]
+        window = statistics.median(m['window'] for m in marks)
+        ready = statistics.median(m['ready'] for m in marks)
+        print(f"{app:<14} {window:>12.3f} {ready:>12.3f}")
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'rev': rev, 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'app': app,
+                                'runs': args.runs, 'window': window, 'ready': ready}) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Depth-limited DFS, iterative deepening DFS and IDA* with memory bounded by the search depth.
+
+Unlike dfs/bfs_generator these keep no global visited set: only the current
+path is stored (cycles are checked against it), so memory is O(depth *
+branching) and nodes may be expanded many times. SearchCounters records how
+much work that costs, for comparison with BFS in the experiments.
+
+Every search comes twice: a *_generator yielding the same snapshot dicts as
+dfs_generator (key 'stack', plus 'bound' and 'counters'; live=True gives
+search_core.LiveState views instead, for turbo mode), and a plain
+function returning the path (or None) as fast as possible.
+"""
+
+import math
+from search_core import LiveState, SearchRun, neighbor_orders, _snapshot
+
+BOUNDED_ACTIONS=('deepen','init','visit','push','skip','cutoff','pop','found','not_found')
+_END=object()
+
+class SearchCounters:
+    """Work counters of a bounded search; `reexpanded` needs track_distinct (that set is exactly the memory these searches avoid)."""
+    __slots__=('iterations','expanded','generated','max_depth','budget','exhausted','_distinct')
+    def __init__(self, track_distinct=False, budget=None):
+        self.iterations=0; self.expanded=0; self.generated=0; self.max_depth=0
+        self.budget=budget; self.exhausted=False; self._distinct=set() if track_distinct else None
+    def _expand(self, node, depth):
+        self.expanded+=1
+        if depth>self.max_depth: self.max_depth=depth
+        if self._distinct is not None: self._distinct.add(node)
+        if self.budget is not None and self.expanded>=self.budget: self.exhausted=True
+    @property
+    def reexpanded(self):
+        return None if self._distinct is None else self.expanded-len(self._distinct)
+    def as_dict(self):
+        return {'iterations':self.iterations,'expanded':self.expanded,'generated':self.generated,'reexpanded':self.reexpanded,'max_depth':self.max_depth}
+
+def hop_heuristic(G, pos, goal):
+    """Admissible edge-count bound for IDA* on a drawn graph: no edge is longer than the longest one."""
+    longest=max((math.dist(pos[u],pos[v]) for u,v in G.edges() if u in pos and v in pos),default=0.0)
+    if longest<=0 or goal not in pos: return lambda n: 0
+    gx,gy=pos[goal]
+    return lambda n: int(math.hypot(pos[n][0]-gx,pos[n][1]-gy)/longest) if n in pos else 0
+
+# --- event streams (for the editor and tracing) ---
+
+def _bounded_iteration(nbrs, start, goal, bound, h, run, c, tr):
+    # one depth-first pass with f = depth + h(node) <= bound; returns None when found, else the smallest f that was cut
+    visited=run.visited={start}; parent=run.parent={start:None}; stack=run.frontier=[]
+    f=h(start) if h else 0
+    yield 'init',start
+    if f>bound: yield 'cutoff',start; return f
+    c._expand(start,0); run.opened=c.expanded; stack.append((start,iter(nbrs(start))))
+    if tr: tr.expand(1)
+    yield 'visit',start
+    if start==goal: run.path=[start]; yield 'found',start; return None
+    next_bound=math.inf
+    while stack and not c.exhausted:
+        node,children=stack[-1]
+        nb=next(children,_END)
+        if nb is _END:
+            stack.pop(); visited.discard(node); parent.pop(node,None); yield 'pop',node; continue
+        c.generated+=1
+        if tr: tr.relax()
+        if nb in visited: yield 'skip',nb; continue
+        depth=len(stack); f=depth+(h(nb) if h else 0)
+        if f>bound:
+            if f<next_bound: next_bound=f
+            yield 'cutoff',nb; continue
+        visited.add(nb); parent[nb]=node; stack.append((nb,iter(nbrs(nb))))
+        yield 'push',nb
+        c._expand(nb,depth); run.opened=c.expanded
+        if tr: tr.expand(len(stack))
+        yield 'visit',nb
+        if nb==goal: run.path=[n for n,_ in stack]; yield 'found',nb; return None
+    return next_bound
+
+def deepening_events(G, start, goal, neighbor_order='given', h=None, limit=None, max_bound=None, once=False,
+                     tracer=None, run=None, counters=None, seed=None):
+    """(action, node) events of DLS (`once` with `limit`), IDDFS (h=None) or IDA* (heuristic h).
+
+    'deepen' events carry the new bound instead of a node. The neighbor order is
+    fixed for the run, so every iteration expands successors in the same order.
+    """
+    run=run if run is not None else SearchRun(); c=counters if counters is not None else SearchCounters()
+    nbrs=neighbor_orders(G,neighbor_order,seed)
+    bound=limit if limit is not None else (h(start) if h else 0)
+    while True:
+        c.iterations+=1
+        yield 'deepen',bound
+        nxt=yield from _bounded_iteration(nbrs,start,goal,bound,h,run,c,tracer)
+        if nxt is None: return
+        if once or nxt==math.inf or c.exhausted or (max_bound is not None and nxt>max_bound): break
+        bound=nxt
+    run.path=None; yield 'not_found',None
+
+def _bounded_generator(events, run, counters, live=False):
+    for act,node in events:
+        if live:
+            extra={'bound':node,'visited':set(),'stack':[],'parent':{}} if act=='deepen' else {}
+            extra['counters']=counters.as_dict; yield LiveState(run,act,None if act=='deepen' else node,'stack',extra); continue
+        if act=='deepen': state={'action':'deepen','bound':node,'current':None,'visited':set(),'stack':[],'parent':{},'opened':run.opened}
+        else: state=_snapshot(run,act,node,'stack')
+        state['counters']=counters.as_dict(); yield state
+
+def dls_generator(G, start, goal, limit, neighbor_order='given', tracer=None, counters=None, live=False, seed=None):
+    run=SearchRun(); c=counters or SearchCounters()
+    yield from _bounded_generator(deepening_events(G,start,goal,neighbor_order,limit=limit,once=True,tracer=tracer,run=run,counters=c,seed=seed),run,c,live)
+
+def iddfs_generator(G, start, goal, neighbor_order='given', max_depth=None, tracer=None, counters=None, live=False, seed=None):
+    run=SearchRun(); c=counters or SearchCounters()
+    yield from _bounded_generator(deepening_events(G,start,goal,neighbor_order,max_bound=max_depth,tracer=tracer,run=run,counters=c,seed=seed),run,c,live)
+
+def ida_star_generator(G, start, goal, h, neighbor_order='given', max_bound=None, tracer=None, counters=None, live=False, seed=None):
+    run=SearchRun(); c=counters or SearchCounters()
+    yield from _bounded_generator(deepening_events(G,start,goal,neighbor_order,h=h,max_bound=max_bound,tracer=tracer,run=run,counters=c,seed=seed),run,c,live)
+
+# --- fast paths ---
+
+def _bounded_pass(nbrs, start, goal, bound, h, c):
+    f=h(start) if h else 0
+    if f>bound: return None,f
+    c._expand(start,0)
+    if start==goal: return [start],None
+    path=[start]; on_path={start}; stack=[iter(nbrs(start))]; next_bound=math.inf
+    while stack and not c.exhausted:
+        nb=next(stack[-1],_END)
+        if nb is _END: stack.pop(); on_path.discard(path.pop()); continue
+        c.generated+=1
+        if nb in on_path: continue
+        depth=len(path); f=depth+h(nb) if h else depth
+        if f>bound:
+            if f<next_bound: next_bound=f
+            continue
+        c._expand(nb,depth); path.append(nb)
+        if nb==goal: return path,None
+        on_path.add(nb); stack.append(iter(nbrs(nb)))
+    return None,next_bound
+
+def _deepen(G, start, goal, order, h, bound, max_bound, once, counters, seed=None):
+    c=counters if counters is not None else SearchCounters(); nbrs=neighbor_orders(G,order,seed)
+    while True:
+        c.iterations+=1
+        path,nxt=_bounded_pass(nbrs,start,goal,bound,h,c)
+        if path is not None: return path
+        if once or nxt==math.inf or c.exhausted or (max_bound is not None and nxt>max_bound): return None
+        bound=nxt
+
+def depth_limited_search(G, start, goal, limit, neighbor_order='given', counters=None, seed=None):
+    return _deepen(G,start,goal,neighbor_order,None,limit,None,True,counters,seed)
+
+def iddfs(G, start, goal, neighbor_order='given', max_depth=None, counters=None, seed=None):
+    return _deepen(G,start,goal,neighbor_order,None,0,max_depth,False,counters,seed)
+
+def ida_star(G, start, goal, h, neighbor_order='given', max_bound=None, counters=None, seed=None):
+    return _deepen(G,start,goal,neighbor_order,h,h(start),max_bound,False,counters,seed)
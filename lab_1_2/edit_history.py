@@ -0,0 +1,84 @@
+"""Undo/redo history for the graph editor without whole-graph copies.
+
+An edit of a few nodes stores only their local state before the edit: whether
+the node existed, its attributes, its position and its incident edges. Undo
+rebuilds exactly those nodes. Generating, loading and re-laying out the graph
+replace self.G / self.pos with new objects, so those steps keep the old objects
+by reference and copy nothing. The history is capped both by entry count and by
+the number of nodes+edges it keeps alive, so a few 100k-node graphs cannot pile up.
+"""
+
+UNDO_LIMIT = 50            # entries per stack
+UNDO_BUDGET = 1_000_000    # nodes+edges kept alive per stack (the newest entry is always kept)
+
+def _incident(G, n):
+    out=[(n,v,dict(d)) for v,d in G.adj[n].items()]
+    return out+[(u,n,dict(d)) for u,d in G.pred[n].items() if u!=n] if G.is_directed() else out
+
+class _Local:
+    """State of a few nodes (and their edges) plus the position dict they lived in."""
+    def __init__(self, G, pos, nodes):
+        self.G=G; self.pos=pos; self.nodes=list(dict.fromkeys(nodes))
+        self.saved=[(n,dict(G.nodes[n]),_incident(G,n)) if n in G else (n,None,None) for n in self.nodes]
+        self.xy={n:pos[n] for n in self.nodes if n in pos}
+        self.cost=1+sum(len(e) for _,_,e in self.saved if e)
+
+    def inverse(self, G, pos): return _Local(G, pos, self.nodes)
+
+    def apply(self, G, pos):
+        # the edit mutated self.G in place; an automatic relayout may have swapped the position dict since
+        G=self.G
+        for n in self.nodes:
+            if n in G: G.remove_node(n)
+        for n,attrs,_ in self.saved:
+            if attrs is not None: G.add_node(n,**attrs)
+        for n,attrs,edges in self.saved:
+            for u,v,d in edges or (): G.add_edge(u,v,**d)
+        pos=self.pos
+        for n in self.nodes:
+            if n in self.xy: pos[n]=self.xy[n]
+            else: pos.pop(n,None)
+        return G, pos
+
+class _Whole:
+    """The previous graph and layout objects, kept by reference (the caller replaces them)."""
+    def __init__(self, G, pos):
+        self.G=G; self.pos=pos; self.cost=1+(G.number_of_nodes()+G.number_of_edges() if G is not None else 0)
+
+    def inverse(self, G, pos): return _Whole(G, pos)
+
+    def apply(self, G, pos): return self.G, self.pos
+
+class EditHistory:
+    def __init__(self, limit=UNDO_LIMIT, budget=UNDO_BUDGET):
+        self.limit=limit; self.budget=budget; self.undo_stack=[]; self.redo_stack=[]
+
+    def _push(self, stack, entry):
+        stack.append(entry); total=sum(e.cost for e in stack)
+        while len(stack)>1 and (len(stack)>self.limit or total>self.budget): total-=stack.pop(0).cost
+
+    def record_nodes(self, G, pos, nodes):
+        """Call before editing `nodes` in place (adding, deleting, rewiring or moving them)."""
+        self.commit(_Local(G, pos, nodes))
+
+    def record_graph(self, G, pos):
+        """Call before self.G and/or self.pos are replaced by new objects."""
+        self.commit(_Whole(G, pos))
+
+    def snapshot(self, G, pos, nodes):
+        # for edits that are recorded only once they finish (dragging a node)
+        return _Local(G, pos, nodes)
+
+    def commit(self, entry):
+        self._push(self.undo_stack, entry); self.redo_stack.clear()
+
+    def undo(self, G, pos):
+        """Returns the restored (G, pos), or None if there is nothing to undo."""
+        return self._swap(self.undo_stack, self.redo_stack, G, pos)
+
+    def redo(self, G, pos):
+        return self._swap(self.redo_stack, self.undo_stack, G, pos)
+
+    def _swap(self, src, dst, G, pos):
+        if not src: return None
+        entry=src.pop(); self._push(dst, entry.inverse(G, pos)); return entry.apply(G, pos)
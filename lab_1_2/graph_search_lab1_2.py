@@ -2,99 +2,46 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import networkx as nx
-import random, json, csv, copy, math
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from collections import deque
+import random, json, csv, math, os, sys
+from contextlib import nullcontext
 import time
-
-def ensure_connected_graph(n, m, directed=False, seed=None):
-    if seed is not None:
-        random.seed(seed)
-    nodes = list(range(n))
-    edges = []
-    remaining = nodes[:]
-    random.shuffle(remaining)
-    connected = [remaining.pop()]
-    while remaining:
-        a = random.choice(connected); b = remaining.pop(); edges.append((a,b)); connected.append(b)
-    attempts = 0
-    while len(edges) < m and attempts < m*10:
-        a,b = random.sample(nodes,2)
-        if a==b: attempts+=1; continue
-        if not directed:
-            a1,b1 = min(a,b), max(a,b)
-            if (a1,b1) not in [(min(x,y),max(x,y)) for x,y in edges]:
-                edges.append((a,b))
-        else:
-            if (a,b) not in edges:
-                if (b,a) in edges:
-                    attempts+=1
-                    continue
-                edges.append((a,b))
-        attempts+=1
-    while len(edges) < m:
-        a,b = random.sample(nodes,2); edges.append((a,b))
-    G = nx.DiGraph()
-    G.add_nodes_from(nodes)
-    if directed:
-        G.add_edges_from(edges)
-    else:
-        for a,b in edges:
-            G.add_edge(a,b, directed=False); G.add_edge(b,a, directed=False)
-    return G
-
-def neighbor_order_iter(G, node, order):
-    neigh = list(G.successors(node))
-    if order=='ascending': return sorted(neigh)
-    if order=='descending': return sorted(neigh, reverse=True)
-    if order=='random': 
-        n=list(neigh); random.shuffle(n); return n
-    return neigh
-
-def dfs_generator(G, start, goal, neighbor_order='given'):
-    visited=set(); stack=[(start, iter(neighbor_order_iter(G,start,neighbor_order)))]; parent={start:None}; opened=0
-    yield {'action':'init','current':start,'visited':set(),'stack':[start],'parent':parent.copy(),'opened':opened}
-    while stack:
-        node,children=stack[-1]
-        if node not in visited:
-            visited.add(node); opened+=1
-            yield {'action':'visit','current':node,'visited':visited.copy(),'stack':[n for n,_ in stack],'parent':parent.copy(),'opened':opened}
-            if node==goal:
-                path=[]; cur=node
-                while cur is not None: path.append(cur); cur=parent.get(cur)
-                path.reverse(); yield {'action':'found','path':path,'visited':visited.copy(),'opened':opened,'parent':parent.copy()}; return
-        try:
-            nb=next(children)
-            if nb not in visited:
-                parent[nb]=node; stack.append((nb, iter(neighbor_order_iter(G,nb,neighbor_order))))
-                yield {'action':'push','current':nb,'visited':visited.copy(),'stack':[n for n,_ in stack],'parent':parent.copy(),'opened':opened}
-            else:
-                yield {'action':'skip','current':nb,'visited':visited.copy(),'stack':[n for n,_ in stack],'parent':parent.copy(),'opened':opened}
-        except StopIteration:
-            stack.pop(); yield {'action':'pop','current':node,'visited':visited.copy(),'stack':[n for n,_ in stack],'parent':parent.copy(),'opened':opened}
-    yield {'action':'not_found','visited':visited.copy(),'opened':opened,'parent':parent.copy()}
-
-def bfs_generator(G, start, goal, neighbor_order='given'):
-    visited=set([start]); parent={start:None}; queue=deque([start]); opened=1
-    yield {'action':'init','current':start,'visited':visited.copy(),'queue':list(queue),'parent':parent.copy(),'opened':opened}
-    while queue:
-        node=queue.popleft()
-        yield {'action':'visit','current':node,'visited':visited.copy(),'queue':list(queue),'parent':parent.copy(),'opened':opened}
-        if node==goal:
-            path=[]; cur=node
-            while cur is not None: path.append(cur); cur=parent.get(cur)
-            path.reverse(); yield {'action':'found','path':path,'visited':visited.copy(),'opened':opened,'parent':parent.copy()}; return
-        for nb in neighbor_order_iter(G,node,neighbor_order):
-            if nb not in visited:
-                visited.add(nb); parent[nb]=node; queue.append(nb); opened+=1
-                yield {'action':'enqueue','current':nb,'visited':visited.copy(),'queue':list(queue),'parent':parent.copy(),'opened':opened}
-            else:
-                yield {'action':'skip','current':nb,'visited':visited.copy(),'queue':list(queue),'parent':parent.copy(),'opened':opened}
-    yield {'action':'not_found','visited':visited.copy(),'opened':opened,'parent':parent.copy()}
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from search_common.instrumentation import tracer_from_env
+from search_common.background import run_in_background
+from search_common.startup import StartupTimer
+from search_common.scheduler import TurboScheduler
+from search_common.result_cache import ResultCache
+from search_core import ensure_connected_graph, invalidate_neighbor_order, dfs_generator, bfs_generator, multi_bfs_generator, bfs_tree, batch_bfs
+from search_common.trace_format import SearchTrace
+from search_trace import record_graph_search, graph_player, replay_states
+from trace_export import export_graph_trace
+from weighted_search import ucs_generator
+from priority_queues import QUEUES
+from bounded_search import SearchCounters, hop_heuristic, dls_generator, iddfs_generator, ida_star_generator, iddfs, ida_star
+from layout import LAYOUT_METHODS, compute_layout, incremental_layout
+from edit_history import EditHistory
+from lod_render import LOD_FROM, LodRenderer, zoom_view
+from log_view import LogView
+
+# networkx/matplotlib are imported by _import_heavy() on a worker thread so the window shows immediately
+nx = plt = FigureCanvasTkAgg = None
+
+EXPERIMENT_BUDGET = 200000  # expansion cap for IDDFS/IDA* runs (path-checking DFS can blow up exponentially on dense graphs)
+EXPERIMENT_SEED = 42         # fixes the 'random' neighbor order, so random-order rows are repeatable
+
+def _import_heavy():
+    global nx, plt, FigureCanvasTkAgg
+    if nx is not None: return
+    import matplotlib
+    matplotlib.use('TkAgg')
+    import networkx, matplotlib.pyplot
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as canvas_cls
+    plt, FigureCanvasTkAgg, nx = matplotlib.pyplot, canvas_cls, networkx
+
+def _number(text):
+    # edge weights stay integers when written as such (the radix heap needs integer costs)
+    try: return int(text)
+    except ValueError: return float(text)
 
 class GraphSearchApp(ttk.Frame):
     def __init__(self, master):
@@ -102,63 +49,133 @@ class GraphSearchApp(ttk.Frame):
         self.G=None; self.pos={}; self.current_generator=None; self.auto_running=False; self.step_delay=300
         self.edit_mode=tk.BooleanVar(value=False); self.selected_source_for_edge=None; self.dragging_node=None; self.drag_offset=(0,0)
         self.node_hit_threshold=0.04; self.edge_hit_threshold=0.02
-        self.undo_stack=[]; self.redo_stack=[]
+        self.history=EditHistory(); self._drag_before=None
         self.node_count=tk.IntVar(value=30); self.edge_count=tk.IntVar(value=40)
         self.initial_directed=tk.BooleanVar(value=False); self.neighbor_order=tk.StringVar(value='given')
-        self.search_algo=tk.StringVar(value='DFS'); self.start_node=tk.IntVar(value=0); self.goal_node=tk.IntVar(value=1); self.speed_ms=tk.IntVar(value=500)
-        self._start_time = None
-        self._build_ui(); self._create_plot(); self.generate_graph()
+        self.search_algo=tk.StringVar(value='DFS'); self.start_node=tk.StringVar(value='0'); self.goal_node=tk.StringVar(value='1'); self.speed_ms=tk.IntVar(value=500)
+        self.depth_limit=tk.IntVar(value=10); self.max_weight=tk.IntVar(value=1); self.edge_weight=tk.IntVar(value=1); self.queue_kind=tk.StringVar(value='binary'); self.layout_method=tk.StringVar(value='auto'); self.auto_relayout=tk.BooleanVar(value=False)
+        self._start_time = None; self.tracer = tracer_from_env()
+        self.trace=None; self.trace_player=None; self.trace_pos=tk.DoubleVar(value=0); self._replaying=False
+        self.view=None; self.lod=None; self._lod_src=None; self._last_draw={}; self._pan=None; self._zoom_job=None
+        self.turbo=tk.BooleanVar(value=False); self.turbo_rate=tk.IntVar(value=0); self.scheduler=None; self._turbo_state=None
+        self.results=ResultCache(); self._query=None
+        self.ax=None; self._busy=False; self.startup=StartupTimer(master,'graph_search')
+        self._build_ui(); self._show_placeholder(); self.generate_graph()
 
     def _build_ui(self):
         ctrl=ttk.Frame(self); ctrl.pack(side='left',fill='y',padx=10,pady=10)
         btn_opts={'width':20,'padding':6}
         ttk.Label(ctrl,text="Graph parameters",font=('Segoe UI',11,'bold')).pack(anchor='w')
         frm=ttk.Frame(ctrl); frm.pack(fill='x',pady=4)
-        ttk.Label(frm,text="Nodes:").grid(row=0,column=0); ttk.Spinbox(frm,from_=5,to=300,textvariable=self.node_count,width=6).grid(row=0,column=1)
-        ttk.Label(frm,text="Edges:").grid(row=1,column=0); ttk.Spinbox(frm,from_=4,to=2000,textvariable=self.edge_count,width=6).grid(row=1,column=1)
+        ttk.Label(frm,text="Nodes:").grid(row=0,column=0); ttk.Spinbox(frm,from_=5,to=100000,textvariable=self.node_count,width=6).grid(row=0,column=1)
+        ttk.Label(frm,text="Edges:").grid(row=1,column=0); ttk.Spinbox(frm,from_=4,to=500000,textvariable=self.edge_count,width=6).grid(row=1,column=1)
+        ttk.Label(frm,text="Layout:").grid(row=2,column=0); ttk.OptionMenu(frm,self.layout_method,self.layout_method.get(),*LAYOUT_METHODS).grid(row=2,column=1,sticky='w')
+        ttk.Label(frm,text="Max weight:").grid(row=3,column=0); ttk.Spinbox(frm,from_=1,to=1000000,textvariable=self.max_weight,width=6).grid(row=3,column=1)
+        ttk.Label(frm,text="New edge weight:").grid(row=4,column=0); ttk.Spinbox(frm,from_=0,to=1000000,textvariable=self.edge_weight,width=6).grid(row=4,column=1)
         ttk.Checkbutton(ctrl,text="Initial Directed (new edges)",variable=self.initial_directed).pack(anchor='w',pady=2)
         ttk.Separator(ctrl,orient='horizontal').pack(fill='x',pady=6)
         ttk.Label(ctrl,text="Search & Order",font=('Segoe UI',11,'bold')).pack(anchor='w')
         ttk.Radiobutton(ctrl,text='DFS',variable=self.search_algo,value='DFS').pack(anchor='w')
         ttk.Radiobutton(ctrl,text='BFS',variable=self.search_algo,value='BFS').pack(anchor='w')
+        bounded_row=ttk.Frame(ctrl); bounded_row.pack(fill='x')
+        for name in ('DLS','IDDFS','IDA*'): ttk.Radiobutton(bounded_row,text=name,variable=self.search_algo,value=name).pack(side='left')
+        ucs_row=ttk.Frame(ctrl); ucs_row.pack(fill='x'); ttk.Radiobutton(ucs_row,text='UCS, queue:',variable=self.search_algo,value='UCS').pack(side='left'); ttk.OptionMenu(ucs_row,self.queue_kind,self.queue_kind.get(),*QUEUES).pack(side='left')
+        depth_row=ttk.Frame(ctrl); depth_row.pack(fill='x'); ttk.Label(depth_row,text="Depth limit:").pack(side='left'); ttk.Spinbox(depth_row,from_=0,to=100000,textvariable=self.depth_limit,width=6).pack(side='left')
         ttk.Label(ctrl,text="Neighbor order:").pack(anchor='w'); orders=['given','ascending','descending','random']; ttk.OptionMenu(ctrl,self.neighbor_order,self.neighbor_order.get(),*orders).pack(anchor='w',pady=2)
         ttk.Separator(ctrl,orient='horizontal').pack(fill='x',pady=6)
         ttk.Label(ctrl,text="Execution",font=('Segoe UI',11,'bold')).pack(anchor='w')
         ttk.Label(ctrl,text="Step delay (ms):").pack(anchor='w'); ttk.Spinbox(ctrl,from_=10,to=3000,textvariable=self.speed_ms,width=8).pack(anchor='w',pady=2)
+        turbo_row=ttk.Frame(ctrl); turbo_row.pack(fill='x'); ttk.Checkbutton(turbo_row,text="Turbo, steps/s (0=max):",variable=self.turbo).pack(side='left'); ttk.Spinbox(turbo_row,from_=0,to=10000000,increment=1000,textvariable=self.turbo_rate,width=8).pack(side='left')
         ttk.Button(ctrl,text="Generate Graph",command=self.generate_graph,**btn_opts).pack(fill='x',pady=4)
         ttk.Button(ctrl,text="Run (Auto)",command=self.run_auto,**btn_opts).pack(fill='x',pady=2)
         ttk.Button(ctrl,text="Step",command=self.run_step,**btn_opts).pack(fill='x',pady=2)
         ttk.Button(ctrl,text="Reset Search",command=self.reset_run,**btn_opts).pack(fill='x',pady=2)
+        trace_row=ttk.Frame(ctrl); trace_row.pack(fill='x',pady=2)
+        ttk.Button(trace_row,text="Record",command=self.record_trace,width=7).pack(side='left',expand=True,fill='x'); ttk.Button(trace_row,text="Save",command=self.save_trace,width=6).pack(side='left',expand=True,fill='x'); ttk.Button(trace_row,text="Load",command=self.load_trace,width=6).pack(side='left',expand=True,fill='x'); ttk.Button(trace_row,text="Export",command=self.export_animation,width=7).pack(side='left',expand=True,fill='x')
+        ttk.Button(ctrl,text="Replay Trace",command=self.replay_trace,**btn_opts).pack(fill='x',pady=2)
+        self.trace_scale=ttk.Scale(ctrl,from_=0,to=0,orient='horizontal',variable=self.trace_pos,command=self.on_trace_scrub); self.trace_scale.pack(fill='x',pady=2)
         ttk.Separator(ctrl,orient='horizontal').pack(fill='x',pady=6)
-        edit_row=ttk.Frame(ctrl); edit_row.pack(fill='x',pady=4); ttk.Checkbutton(edit_row,text="Edit Mode",variable=self.edit_mode).pack(side='left')
+        edit_row=ttk.Frame(ctrl); edit_row.pack(fill='x',pady=4); ttk.Checkbutton(edit_row,text="Edit Mode",variable=self.edit_mode).pack(side='left'); ttk.Checkbutton(edit_row,text="Auto relayout",variable=self.auto_relayout).pack(side='left')
+        ttk.Button(ctrl,text="Relayout",command=self.relayout,**btn_opts).pack(fill='x',pady=2)
+        ttk.Button(ctrl,text="Fit View",command=self.fit_view,**btn_opts).pack(fill='x',pady=2)
         ttk.Button(ctrl,text="Undo",command=self.undo,**btn_opts).pack(fill='x',pady=2); ttk.Button(ctrl,text="Redo",command=self.redo,**btn_opts).pack(fill='x',pady=2)
         ttk.Button(ctrl,text="Save Graph",command=self.save_graph,**btn_opts).pack(fill='x',pady=2); ttk.Button(ctrl,text="Load Graph",command=self.load_graph,**btn_opts).pack(fill='x',pady=2)
         ttk.Separator(ctrl,orient='horizontal').pack(fill='x',pady=6)
         ttk.Label(ctrl,text="Start/Goal",font=('Segoe UI',11,'bold')).pack(anchor='w')
-        frame_sg=ttk.Frame(ctrl); frame_sg.pack(fill='x',pady=4); ttk.Label(frame_sg,text="Start:").grid(row=0,column=0); self.start_combo=ttk.Combobox(frame_sg,values=[],textvariable=self.start_node,width=6); self.start_combo.grid(row=0,column=1)
-        ttk.Label(frame_sg,text="Goal:").grid(row=1,column=0); self.goal_combo=ttk.Combobox(frame_sg,values=[],textvariable=self.goal_node,width=6); self.goal_combo.grid(row=1,column=1)
+        frame_sg=ttk.Frame(ctrl); frame_sg.pack(fill='x',pady=4); ttk.Label(frame_sg,text="Start:").grid(row=0,column=0); self.start_combo=ttk.Combobox(frame_sg,values=[],textvariable=self.start_node,width=12); self.start_combo.grid(row=0,column=1)
+        ttk.Label(frame_sg,text="Goal:").grid(row=1,column=0); self.goal_combo=ttk.Combobox(frame_sg,values=[],textvariable=self.goal_node,width=12); self.goal_combo.grid(row=1,column=1)
+        ttk.Label(ctrl,text="(several nodes: 1, 5, 9)").pack(anchor='w')
+        ttk.Button(ctrl,text="BFS Tree (all targets)",command=self.run_bfs_tree,**btn_opts).pack(fill='x',pady=2)
+        ttk.Button(ctrl,text="Batch BFS (sources)",command=self.run_batch_bfs,**btn_opts).pack(fill='x',pady=2)
         ttk.Separator(ctrl,orient='horizontal').pack(fill='x',pady=6)
         ttk.Button(ctrl,text="Run Experiments",command=self.run_experiments,**btn_opts).pack(fill='x',pady=4)
         ttk.Button(ctrl,text="Export Experiments CSV",command=self.export_experiments_csv,**btn_opts).pack(fill='x',pady=2)
-        self.results_text=tk.Text(ctrl,width=36,height=18,state='disabled',wrap='word',font=('Segoe UI',10)); self.results_text.pack(pady=4)
+        ttk.Button(ctrl,text="Stream Log to File",command=self.toggle_log_stream,**btn_opts).pack(fill='x',pady=2)
+        log_frame=ttk.Frame(ctrl); log_frame.pack(pady=4); log_scroll=ttk.Scrollbar(log_frame,orient='vertical'); log_scroll.pack(side='right',fill='y')
+        self.results_text=tk.Text(log_frame,width=34,height=18,state='disabled',wrap='word',font=('Segoe UI',10)); self.results_text.pack(side='left')
+        self.log=LogView(self.results_text,log_scroll)
+
+    def _show_placeholder(self):
+        self.placeholder=ttk.Label(self,text="Loading graph...",anchor='center',font=('Segoe UI',12)); self.placeholder.pack(side='right',fill='both',expand=True)
 
     def _create_plot(self):
+        self.placeholder.destroy()
         self.fig, self.ax = plt.subplots(figsize=(7,7)); self.canvas = FigureCanvasTkAgg(self.fig, master=self); self.canvas.get_tk_widget().pack(side='right', fill='both', expand=True)
-        self.canvas.mpl_connect('button_press_event', self.on_click); self.canvas.mpl_connect('button_release_event', self.on_release); self.canvas.mpl_connect('motion_notify_event', self.on_motion); plt.tight_layout()
+        self.canvas.mpl_connect('button_press_event', self.on_click); self.canvas.mpl_connect('button_release_event', self.on_release); self.canvas.mpl_connect('motion_notify_event', self.on_motion); self.canvas.mpl_connect('scroll_event', self.on_scroll); plt.tight_layout()
 
     def generate_graph(self):
+        if self._busy: return
         n = max(5, int(self.node_count.get())); m = max(n-1, int(self.edge_count.get()))
-        self.push_undo(); self.G = ensure_connected_graph(n,m,directed=False); self.pos = nx.spring_layout(self.G, seed=42); self.update_node_comboboxes(); self.reset_run(); self.draw_graph()
+        method=self.layout_method.get(); w=max(1,int(self.max_weight.get())); self._busy=True; self.append_result(f"Generating graph ({n} nodes)...")
+        run_in_background(self, lambda: self._build_graph(n,m,method,w), self._attach_graph, self._background_failed)
+
+    def _build_graph(self, n, m, method='auto', max_weight=1):
+        # worker thread: no Tk calls here; max_weight 1 keeps the graph unweighted
+        _import_heavy(); G = ensure_connected_graph(n,m,directed=False,max_weight=max_weight); return G, compute_layout(G, method, seed=42)
+
+    def relayout(self):
+        if self.G is None or self._busy: return
+        G=self.G.copy(); method=self.layout_method.get(); self._busy=True; self.append_result(f"Layout: {method}...")
+        run_in_background(self, lambda: compute_layout(G, method, seed=42), self._attach_layout, self._background_failed)
+
+    def _attach_layout(self, pos):
+        self._busy=False; self.push_undo(); self.pos=pos; self.view=None; self.draw_graph()
+
+    def _relayout_around(self, changed):
+        # moves only the neighbourhood of an edit so the rest of the drawing stays where the user left it
+        if self.auto_relayout.get() and self.G is not None: self.pos=incremental_layout(self.G, self.pos, changed)
+
+    def _attach_graph(self, result):
+        self._busy=False
+        if self.ax is None: self._create_plot()
+        self.push_undo(); self.G, self.pos = result; self.view=None; self.update_node_comboboxes(); self.reset_run(); self.draw_graph(); self.startup.ready()
+
+    def _background_failed(self, exc):
+        self._busy=False; messagebox.showerror("Error", str(exc))
 
     def update_node_comboboxes(self):
         nodes = sorted(self.G.nodes()); vals=[str(x) for x in nodes]; self.start_combo['values']=vals; self.goal_combo['values']=vals
         if vals:
-            if str(self.start_node.get()) not in vals: self.start_node.set(nodes[0])
-            if str(self.goal_node.get()) not in vals: self.goal_node.set(nodes[min(1,len(nodes)-1)])
+            if not self._valid_nodes(self.start_node): self.start_node.set(nodes[0])
+            if not self._valid_nodes(self.goal_node): self.goal_node.set(nodes[min(1,len(nodes)-1)])
+
+    @staticmethod
+    def _node_list(var):
+        # "3" or "3, 7 12" -> [3, 7, 12]; raises ValueError on junk
+        nodes=[int(x) for x in var.get().replace(',',' ').split()]
+        if not nodes: raise ValueError("no nodes")
+        return nodes
+
+    def _valid_nodes(self, var):
+        try: return all(n in self.G for n in self._node_list(var))
+        except ValueError: return False
 
     def draw_graph(self, highlight_nodes=None, highlight_edges=None, visited=None, frontier=None, path=None):
+        if self.ax is None: return
+        self._last_draw=dict(visited=visited, frontier=frontier, path=path)
         self.ax.clear()
         if self.G is None: self.canvas.draw_idle(); return
+        if self.G.number_of_nodes()>=LOD_FROM: self._draw_lod(visited, frontier, path); return
         undirected_lines=[]; undirected_edges=set(); directed_arrows=[]
         for u,v,data in list(self.G.edges(data=True)):
             if data.get('directed') is False:
@@ -176,77 +193,138 @@ class GraphSearchApp(ttk.Frame):
         nx.draw_networkx_nodes(self.G, pos=self.pos, ax=self.ax, node_color=node_colors, node_size=node_sizes)
         nx.draw_networkx_edges(self.G, pos=self.pos, edgelist=undirected_lines, ax=self.ax, edge_color='#888888', arrows=False)
         nx.draw_networkx_edges(self.G, pos=self.pos, edgelist=directed_arrows, ax=self.ax, edge_color='#ff6666', arrows=True, connectionstyle='arc3,rad=0.1')
-        nx.draw_networkx_labels(self.G, pos=self.pos, labels={n:str(n) for n in self.G.nodes()}, font_size=8)
+        nx.draw_networkx_labels(self.G, pos=self.pos, labels={n:str(n) for n in self.G.nodes()}, font_size=8, ax=self.ax)
+        weights={(u,v):self.G[u][v].get('weight',1) for u,v in undirected_lines+directed_arrows}
+        if weights and any(w!=1 for w in weights.values()): nx.draw_networkx_edge_labels(self.G, pos=self.pos, edge_labels=weights, font_size=7, ax=self.ax)
         try:
-            s=int(self.start_node.get()); g=int(self.goal_node.get())
-            if s in self.G.nodes(): nx.draw_networkx_nodes(self.G, pos=self.pos, nodelist=[s], node_color='#ff9999', node_size=400, ax=self.ax)
-            if g in self.G.nodes(): nx.draw_networkx_nodes(self.G, pos=self.pos, nodelist=[g], node_color='#9999ff', node_size=400, ax=self.ax)
+            s=[n for n in self._node_list(self.start_node) if n in self.G]; g=[n for n in self._node_list(self.goal_node) if n in self.G]
+            if s: nx.draw_networkx_nodes(self.G, pos=self.pos, nodelist=s, node_color='#ff9999', node_size=400, ax=self.ax)
+            if g: nx.draw_networkx_nodes(self.G, pos=self.pos, nodelist=g, node_color='#9999ff', node_size=400, ax=self.ax)
         except Exception: pass
         if self.selected_source_for_edge is not None and self.selected_source_for_edge in self.G.nodes():
             nx.draw_networkx_nodes(self.G, pos=self.pos, nodelist=[self.selected_source_for_edge], node_color='#ffd27f', node_size=420, ax=self.ax)
         self.ax.set_title(f"Nodes={self.G.number_of_nodes()}  Edges(displayed)={(len(undirected_lines)+len(directed_arrows))}")
+        if self.view: self.ax.set_xlim(*self.view[:2]); self.ax.set_ylim(*self.view[2:])
         self.ax.axis('off'); self.canvas.draw_idle()
 
-    def push_undo(self):
+    def _lod_renderer(self):
+        # array snapshot of the graph; rebuilt when the graph or layout object changes or after an edit (push_undo)
+        if self.lod is None or self._lod_src is not self.G or len(self.lod)!=self.G.number_of_nodes():
+            self.lod=LodRenderer(self.G, self.pos); self._lod_src=self.G
+        return self.lod
+
+    def _draw_lod(self, visited, frontier, path):
+        lod=self._lod_renderer(); marks=[]
+        try: marks=[(n,'#ff9999') for n in self._node_list(self.start_node)]+[(n,'#9999ff') for n in self._node_list(self.goal_node)]
+        except Exception: pass
+        if self.selected_source_for_edge is not None: marks.append((self.selected_source_for_edge,'#ffd27f'))
+        summary=lod.draw(self.ax, self.view or lod.bounds(), visited=visited, frontier=frontier, path=path, marks=marks)
+        self.ax.set_title(f"Nodes={self.G.number_of_nodes()}  Edges={lod.edge_count}\n{summary}", fontsize=9)
+        self.ax.axis('off'); self.canvas.draw_idle()
+
+    def redraw(self):
+        self.draw_graph(**self._last_draw)
+
+    def _current_view(self):
+        return (*self.ax.get_xlim(), *self.ax.get_ylim())
+
+    def fit_view(self):
+        self.view=None; self.redraw()
+
+    def on_scroll(self, event):
+        if event.inaxes!=self.ax or self.G is None: return
+        self.view=zoom_view(self._current_view(), event.xdata, event.ydata, 0.8 if event.button=='up' else 1.25)
+        self.ax.set_xlim(*self.view[:2]); self.ax.set_ylim(*self.view[2:]); self.canvas.draw_idle()
+        # scaling the current artists is instant; the culled re-render waits until the wheel stops
+        if self._zoom_job is not None: self.after_cancel(self._zoom_job)
+        self._zoom_job=self.after(150, self._finish_zoom)
+
+    def _finish_zoom(self):
+        self._zoom_job=None; self.redraw()
+
+    def push_undo(self, nodes=None):
         if self.G is None: return
-        self.undo_stack.append((copy.deepcopy(self.G), copy.deepcopy(self.pos)))
-        if len(self.undo_stack)>50: self.undo_stack.pop(0)
-        self.redo_stack.clear()
+        # every edit goes through here first: with `nodes` it is an in-place edit of those nodes (only their
+        # neighbourhood is saved), without them self.G/self.pos are about to be replaced and are kept by reference
+        if nodes is None: self.history.record_graph(self.G, self.pos)
+        else: self.history.record_nodes(self.G, self.pos, nodes)
+        self._structure_changed()
+
+    def _structure_changed(self):
+        # drops everything derived from the graph or layout: LOD snapshot, neighbor orders, cached results (IDA* also depends on pos)
+        self.lod=None; invalidate_neighbor_order(self.G); self.results.bump()
+
+    def undo(self): self._step_history(self.history.undo, "Undo")
 
-    def undo(self):
-        if not self.undo_stack: self.append_result("Undo empty"); return
-        self.redo_stack.append((copy.deepcopy(self.G), copy.deepcopy(self.pos))); G,pos=self.undo_stack.pop(); self.G=G; self.pos=pos; self.update_node_comboboxes(); self.draw_graph(); self.append_result("Undo")
+    def redo(self): self._step_history(self.history.redo, "Redo")
 
-    def redo(self):
-        if not self.redo_stack: self.append_result("Redo empty"); return
-        self.push_undo(); G,pos=self.redo_stack.pop(); self.G=G; self.pos=pos; self.update_node_comboboxes(); self.draw_graph(); self.append_result("Redo")
+    def _step_history(self, step, name):
+        if self._busy: return
+        state=step(self.G, self.pos)
+        if state is None: self.append_result(f"{name} empty"); return
+        self.G,self.pos=state; self._structure_changed(); self.update_node_comboboxes(); self.draw_graph(); self.append_result(name)
 
     def on_click(self, event):
         if event.inaxes!=self.ax: return
+        if event.button==2 or (event.button==1 and not self.edit_mode.get() and not event.dblclick):
+            self._pan=(event.x, event.y, self._current_view()); return
         x,y = event.xdata, event.ydata; node=self._find_node_at_coords((x,y)); edge=self._find_edge_at_coords((x,y))
         if not self.edit_mode.get(): return
         if event.button==3 and node is not None:
-            self.push_undo(); self._delete_node(node); self.update_node_comboboxes(); self.draw_graph(); self.append_result(f"Deleted node {node}"); return
+            self.push_undo([node]); self._delete_node(node); self.update_node_comboboxes(); self.draw_graph(); self.append_result(f"Deleted node {node}"); return
         if event.dblclick and node is None:
-            self.push_undo(); new_node = max(self.G.nodes())+1 if self.G.nodes() else 0; self.G.add_node(new_node); self.pos[new_node]=(x,y); self.update_node_comboboxes(); self.draw_graph(); self.append_result(f"Added node {new_node}"); return
+            new_node = max(self.G.nodes())+1 if self.G.nodes() else 0; self.push_undo([new_node]); self.G.add_node(new_node); self.pos[new_node]=(x,y); self.update_node_comboboxes(); self.draw_graph(); self.append_result(f"Added node {new_node}"); return
         if event.dblclick and node is not None:
             self.selected_source_for_edge = node; self.append_result(f"Selected source node {node}"); self.draw_graph(); return
         if event.button==1 and self.selected_source_for_edge is not None and node is not None and node!=self.selected_source_for_edge:
-            self.push_undo(); src=self.selected_source_for_edge; tgt=node; self._add_edge_between(src,tgt,directed=self.initial_directed.get()); self.append_result(f"Added edge {src}->{tgt} directed={self.initial_directed.get()}"); self.selected_source_for_edge=None; self.update_node_comboboxes(); self.draw_graph(); return
+            src=self.selected_source_for_edge; tgt=node; self.push_undo([src,tgt]); w=max(0,int(self.edge_weight.get())); self._add_edge_between(src,tgt,directed=self.initial_directed.get(),weight=w); self.append_result(f"Added edge {src}->{tgt} directed={self.initial_directed.get()} weight={w}"); self.selected_source_for_edge=None; self.update_node_comboboxes(); self.draw_graph(); return
         if event.button==1 and node is not None and not event.dblclick:
-            self.dragging_node=node; self.drag_offset=(self.pos[node][0]-x, self.pos[node][1]-y); return
+            self.dragging_node=node; self._drag_before=self.history.snapshot(self.G,self.pos,[node]); self.drag_offset=(self.pos[node][0]-x, self.pos[node][1]-y); return
         if event.button==1 and edge is not None and node is None:
             u,v = edge; data_uv = self.G.get_edge_data(u,v) if self.G.has_edge(u,v) else None; data_vu = self.G.get_edge_data(v,u) if self.G.has_edge(v,u) else None
-            self.push_undo()
+            self.push_undo([u,v]); w=(data_uv or data_vu or {}).get('weight',1)  # flips keep the edge weight
             if data_uv and data_vu and data_uv.get('directed') is False and data_vu.get('directed') is False:
                 self.G.remove_edge(v,u); self.G[u][v]['directed']=True; self.append_result(f"Undirected -> directed {u}->{v}"); self.draw_graph(); return
             if data_uv and data_uv.get('directed') is True and not (data_vu and data_vu.get('directed') is True):
-                self.G.remove_edge(u,v); self.G.add_edge(v,u, directed=True); self.append_result(f"Reversed {u}->{v} to {v}->{u}"); self.draw_graph(); return
+                self.G.remove_edge(u,v); self.G.add_edge(v,u, directed=True, weight=w); self.append_result(f"Reversed {u}->{v} to {v}->{u}"); self.draw_graph(); return
             if data_vu and data_vu.get('directed') is True and not (data_uv and data_uv.get('directed') is True):
-                self.G.remove_edge(v,u); self.G.add_edge(u,v, directed=True); self.append_result(f"Reversed {v}->{u} to {u}->{v}"); self.draw_graph(); return
+                self.G.remove_edge(v,u); self.G.add_edge(u,v, directed=True, weight=w); self.append_result(f"Reversed {v}->{u} to {u}->{v}"); self.draw_graph(); return
             if (data_uv and data_uv.get('directed') is True) and not (data_vu):
-                self.G.remove_edge(u,v); self.G.add_edge(u,v, directed=False); self.G.add_edge(v,u, directed=False); self.append_result(f"Directed -> undirected ({u},{v})"); self.draw_graph(); return
+                self.G.remove_edge(u,v); self.G.add_edge(u,v, directed=False, weight=w); self.G.add_edge(v,u, directed=False, weight=w); self.append_result(f"Directed -> undirected ({u},{v})"); self.draw_graph(); return
             if (data_uv or data_vu):
-                if not data_uv: self.G.add_edge(u,v, directed=False)
+                if not data_uv: self.G.add_edge(u,v, directed=False, weight=w)
                 else: self.G[u][v]['directed']=False
-                if not data_vu: self.G.add_edge(v,u, directed=False)
+                if not data_vu: self.G.add_edge(v,u, directed=False, weight=w)
                 else: self.G[v][u]['directed']=False
                 self.append_result(f"Toggled to undirected ({u},{v})"); self.draw_graph(); return
 
     def on_release(self, event):
+        if self._pan is not None:
+            self._pan=None; self.redraw(); return
         if self.dragging_node is not None:
-            self.push_undo(); self.dragging_node=None; self.draw_graph(); return
+            # recorded with the position from before the drag (on_motion already moved the node)
+            if self._drag_before is not None and self.pos.get(self.dragging_node)!=self._drag_before.xy.get(self.dragging_node): self.history.commit(self._drag_before); self._structure_changed()
+            self._drag_before=None; self.dragging_node=None; self.draw_graph(); return
 
     def on_motion(self, event):
+        if self._pan is not None:
+            # pan in pixels (data coordinates shift under the cursor while the limits move)
+            px,py,(x0,x1,y0,y1)=self._pan; bb=self.ax.bbox
+            dx=(event.x-px)*(x1-x0)/bb.width; dy=(event.y-py)*(y1-y0)/bb.height
+            self.view=(x0-dx,x1-dx,y0-dy,y1-dy); self.ax.set_xlim(*self.view[:2]); self.ax.set_ylim(*self.view[2:]); self.canvas.draw_idle(); return
         if self.dragging_node is None or event.inaxes!=self.ax: return
-        x,y=event.xdata,event.ydata; n=self.dragging_node; self.pos[n]=(x + self.drag_offset[0], y + self.drag_offset[1]); self.draw_graph()
+        x,y=event.xdata,event.ydata; n=self.dragging_node; self.pos[n]=(x + self.drag_offset[0], y + self.drag_offset[1])
+        if self.lod is not None: self.lod.move(n, self.pos[n])
+        self.draw_graph()
 
     def _find_node_at_coords(self, point):
         if not self.pos: return None
         x,y = point; min_dist=None; min_node=None
-        for n,(nxp,nyp) in self.pos.items():
-            d=math.hypot(nxp-x, nyp-y)
-            if min_dist is None or d<min_dist: min_dist=d; min_node=n
+        if self.G is not None and self.G.number_of_nodes()>=LOD_FROM: min_node,min_dist=self._lod_renderer().nearest_node(x,y)
+        else:
+            for n,(nxp,nyp) in self.pos.items():
+                d=math.hypot(nxp-x, nyp-y)
+                if min_dist is None or d<min_dist: min_dist=d; min_node=n
         xlim=self.ax.get_xlim(); ylim=self.ax.get_ylim(); x_scale=abs(xlim[1]-xlim[0]); y_scale=abs(ylim[1]-ylim[0]); th=self.node_hit_threshold * math.hypot(x_scale,y_scale)
         if min_dist is not None and min_dist<=th: return min_node
         return None
@@ -254,6 +332,10 @@ class GraphSearchApp(ttk.Frame):
     def _find_edge_at_coords(self, point):
         if self.G is None or not self.pos: return None
         x,y=point; tested=set(); best=None; best_dist=None; best_edge=None
+        if self.G.number_of_nodes()>=LOD_FROM:
+            best_edge,best_dist=self._lod_renderer().nearest_edge(x,y)
+            xlim=self.ax.get_xlim(); ylim=self.ax.get_ylim(); th=self.edge_hit_threshold * math.hypot(abs(xlim[1]-xlim[0]), abs(ylim[1]-ylim[0]))
+            return best_edge if best_dist is not None and best_dist<=th else None
         for u,v,data in self.G.edges(data=True):
             key=(u,v)
             if data.get('directed') is False:
@@ -268,27 +350,128 @@ class GraphSearchApp(ttk.Frame):
             if d<=th and (best_dist is None or d<best_dist): best_dist=d; best_edge=(u,v)
         return best_edge
 
-    def _add_edge_between(self,u,v,directed=False):
-        if directed: self.G.add_edge(u,v, directed=True)
-        else: self.G.add_edge(u,v, directed=False); self.G.add_edge(v,u, directed=False)
+    def _add_edge_between(self,u,v,directed=False,weight=1):
+        if directed: self.G.add_edge(u,v, directed=True, weight=weight)
+        else: self.G.add_edge(u,v, directed=False, weight=weight); self.G.add_edge(v,u, directed=False, weight=weight)
+        self._structure_changed(); self._relayout_around([u,v])
 
     def _delete_node(self,n):
+        nbrs=list(nx.all_neighbors(self.G,n)) if n in self.G else []
         if n in self.G: self.G.remove_node(n)
         if n in self.pos: del self.pos[n]
+        self._structure_changed()
+        self._relayout_around(nbrs)
 
     def reset_run(self):
-        self.current_generator=None; self.auto_running=False; self.append_result("Reset run"); self.draw_graph()
+        self._stop_turbo(); self.current_generator=None; self.auto_running=False; self._replaying=False; self._query=None; self.append_result("Reset run"); self.draw_graph()
+
+    def _ensure_generator(self, live=False):
+        # live: states read the running search instead of copying it (turbo mode draws one per frame)
+        if self.current_generator is not None: return True
+        try: starts=self._node_list(self.start_node); goals=self._node_list(self.goal_node)
+        except ValueError: messagebox.showwarning("Bad nodes","Start/Goal invalid"); return False
+        order=self.neighbor_order.get(); algo=self.search_algo.get(); self._replaying=False
+        self._start_time = time.time()
+        if self._cached_run(starts,goals,algo,order): return True
+        if len(starts)>1 or len(goals)>1:
+            # several starts/goals: one BFS wave from all starts, stopping at the nearest goal
+            if algo!='BFS': self.append_result("Several starts/goals: using multi-source BFS")
+            if self.tracer: self.tracer.begin('multi-BFS', starts=starts, goals=goals, order=order, nodes=self.G.number_of_nodes(), edges=self.G.number_of_edges())
+            self.current_generator = multi_bfs_generator(self.G,starts,goals,neighbor_order=order,tracer=self.tracer,live=live)
+            return True
+        start,goal=starts[0],goals[0]
+        if algo=='UCS' and not self._weights_ok(): return False
+        if self.tracer: self.tracer.begin(algo, start=start, goal=goal, order=order, nodes=self.G.number_of_nodes(), edges=self.G.number_of_edges())
+        if algo=='UCS':
+            self.current_generator=ucs_generator(self.G,start,goal,order,queue=self.queue_kind.get(),tracer=self.tracer,live=live)
+            return True
+        if algo in ('DLS','IDDFS','IDA*'):
+            # bounded-memory searches: the depth limit is the DLS limit and the IDDFS/IDA* give-up bound
+            limit=max(0,int(self.depth_limit.get()))
+            if algo=='DLS': self.current_generator=dls_generator(self.G,start,goal,limit,order,tracer=self.tracer,live=live)
+            elif algo=='IDDFS': self.current_generator=iddfs_generator(self.G,start,goal,order,max_depth=limit,tracer=self.tracer,live=live)
+            else: self.current_generator=ida_star_generator(self.G,start,goal,hop_heuristic(self.G,self.pos,goal),order,max_bound=limit,tracer=self.tracer,live=live)
+            return True
+        gen = dfs_generator if algo=='DFS' else bfs_generator
+        self.current_generator = gen(self.G,start,goal,neighbor_order=order,tracer=self.tracer,live=live)
+        return True
+
+    def _weights_ok(self):
+        ws=[d.get('weight',1) for _,_,d in self.G.edges(data=True)]
+        if any(w<0 for w in ws): messagebox.showwarning("Weights","Uniform-cost search needs non-negative weights"); return False
+        if self.queue_kind.get()=='radix' and not all(isinstance(w,int) for w in ws): messagebox.showwarning("Weights","The radix heap needs integer weights"); return False
+        return True
+
+    def _cached_run(self, starts, goals, algo, order):
+        # a repeated query on the unchanged graph replays its final state at once; unseeded random order is never cached
+        self._query=None
+        if order=='random': return False
+        multi=len(starts)>1 or len(goals)>1
+        key=self.results.key('multi-BFS' if multi else algo,tuple(starts),tuple(goals),order,None if multi or algo in ('DFS','BFS') else self.queue_kind.get() if algo=='UCS' else int(self.depth_limit.get()))
+        final=self.results.get(key)
+        if final is None: self._query=key; return False
+        self.append_result(f"Cached result ({self.results.describe()})"); self.current_generator=iter([final])
+        return True
+
+    def _remember_result(self, state):
+        # a replayed trace is not the result of the last cached query
+        if self._query is None or self._replaying: return
+        self.results.put(self._query,{k:state.get(k) for k in ('action','path','visited','opened','counters','cost') if state.get(k) is not None}); self._query=None
+
+    def run_bfs_tree(self):
+        # one linear pass from all starts; goals (if any) are only reported, the tree covers every reachable node
+        if self.G is None: messagebox.showwarning("No graph","Generate or load graph"); return
+        try: starts=self._node_list(self.start_node); goals=[g for g in self._node_list(self.goal_node) if g in self.G]
+        except ValueError: messagebox.showwarning("Bad nodes","Start/Goal invalid"); return
+        if not all(s in self.G for s in starts): messagebox.showwarning("Bad nodes","Start node not in graph"); return
+        t=time.perf_counter(); tree=bfs_tree(self.G,starts,neighbor_order=self.neighbor_order.get()); dt=time.perf_counter()-t
+        reached=tree.reached_nodes(); depth=max(tree.dist)
+        self.append_result(f"BFS tree from {len(starts)} start(s): reached {len(reached)}/{len(tree.nodes)}, depth {depth}, {dt:.4f}s")
+        far=[n for n,d in zip(tree.nodes,tree.dist) if d==depth][:5]; self.append_result(f"Farthest: {', '.join(map(str,far))}")
+        dists=sorted((tree.distance(g),g) for g in goals if tree.distance(g) is not None)
+        for d,g in dists[:10]: self.append_result(f"  goal {g}: distance {d}")
+        if len(dists)<len(goals): self.append_result(f"  unreachable goals: {len(goals)-len(dists)}")
+        self.draw_graph(visited=set(reached), path=tree.path(dists[0][1]) if dists else None)
+
+    def run_batch_bfs(self):
+        # distances from every start (or a sample of nodes) in worker processes; summary only
+        if self.G is None or self._busy: return
+        try: sources=[s for s in self._node_list(self.start_node) if s in self.G]
+        except ValueError: sources=[]
+        if len(sources)<2:
+            nodes=list(self.G.nodes()); sources=nodes if len(nodes)<=256 else random.Random(42).sample(nodes,256)
+        G=self.G.copy(); order=self.neighbor_order.get(); self._busy=True
+        self.append_result(f"Batch BFS from {len(sources)} sources...")
+        def job():
+            t=time.perf_counter(); nodes,rows=batch_bfs(G,sources,neighbor_order=order); return nodes,rows,time.perf_counter()-t
+        run_in_background(self, job, self._batch_done, self._background_failed)
+
+    def _batch_done(self, result):
+        self._busy=False; nodes,rows,dt=result; total=0; pairs=0; unreachable=0; diameter=0
+        for row in rows:
+            for d in row:
+                if d>0: total+=d; pairs+=1; diameter=max(diameter,d)
+                elif d<0: unreachable+=1
+        self.append_result(f"Batch BFS: {len(rows)} sources in {dt:.3f}s, mean distance {total/max(pairs,1):.2f}, max {diameter}, unreachable pairs {unreachable}")
+
+    def _next_state(self):
+        tr=self.tracer
+        if not tr: state=next(self.current_generator); self._handle_state(state); self._sync_trace_pos(); return
+        with tr.phase('search'): state=next(self.current_generator)
+        with tr.phase('render'): self._handle_state(state)
+        self._sync_trace_pos(); self._end_trace(state)
+
+    def _end_trace(self, state):
+        tr=self.tracer
+        if tr and self.current_generator is None and tr.run is not None:
+            run=tr.end(action=state.get('action'), opened=state.get('opened'), path_len=len(state.get('path') or []))
+            phases=", ".join(f"{k} {v:.4f}s" for k,v in run['phases'].items())
+            self.append_result(f"Trace: expanded {run['expanded']}, relaxed {run['relaxed']}, max frontier {run['max_frontier']}, {phases}")
 
     def run_step(self):
         if self.G is None: messagebox.showwarning("No graph","Generate or load graph"); return
-        if self.current_generator is None:
-            try: start=int(self.start_node.get()); goal=int(self.goal_node.get())
-            except: messagebox.showwarning("Bad nodes","Start/Goal invalid"); return
-            order=self.neighbor_order.get()
-            self._start_time = time.time()
-            self.current_generator = dfs_generator(self.G,start,goal,neighbor_order=order) if self.search_algo.get()=='DFS' else bfs_generator(self.G,start,goal,neighbor_order=order)
-        try:
-            state=next(self.current_generator); self._handle_state(state)
+        if not self._ensure_generator(): return
+        try: self._next_state()
         except StopIteration:
             self.append_result("Generator finished"); self.current_generator=None
 
@@ -298,32 +481,121 @@ class GraphSearchApp(ttk.Frame):
         elif act=='visit': cur=state.get('current'); self.append_result(f"Visit: {cur} (opened {state.get('opened')})"); self.draw_graph(visited=state.get('visited'), frontier=state.get('stack') if 'stack' in state else state.get('queue'))
         elif act in ('push','enqueue'): self.append_result(f"{act.title()}: {state.get('current')} (opened {state.get('opened')})"); self.draw_graph(visited=state.get('visited'), frontier=state.get('stack') if 'stack' in state else state.get('queue'))
         elif act=='skip': self.append_result(f"Skip {state.get('current')}")
+        elif act=='deepen': self.append_result(f"Iteration {state['counters']['iterations']}: bound {state.get('bound')}"); self.draw_graph()
+        elif act=='cutoff': self.append_result(f"Cutoff {state.get('current')}")
         elif act=='pop': self.append_result(f"Pop {state.get('current')}"); self.draw_graph(visited=state.get('visited'), frontier=state.get('stack'))
         elif act=='found':
             duration = time.time() - self._start_time
-            path=state.get('path'); self.append_result(f"Found! length {len(path)}, opened {state.get('opened')}, time: {duration:.4f}s"); self.append_result("Path: "+ " -> ".join(map(str,path))); self.draw_graph(path=path, visited=state.get('visited')); self.current_generator=None
+            path=state.get('path'); cost=f", cost {state.get('cost')}" if 'cost' in state else ''; self.append_result(f"Found! length {len(path)}{cost}, opened {state.get('opened')}, time: {duration:.4f}s"); self.append_result("Path: "+ " -> ".join(map(str,path))); self._report_counters(state); self.draw_graph(path=path, visited=state.get('visited')); self.current_generator=None; self._remember_result(state)
         elif act=='not_found':
             duration = time.time() - self._start_time
-            self.append_result(f"Not found, opened {state.get('opened')}, time: {duration:.4f}s"); self.draw_graph(visited=state.get('visited')); self.current_generator=None
+            self.append_result(f"Not found, opened {state.get('opened')}, time: {duration:.4f}s"); self._report_counters(state); self.draw_graph(visited=state.get('visited')); self.current_generator=None; self._remember_result(state)
         else: self.append_result(str(state)); self.draw_graph()
 
+    def _report_counters(self, state):
+        c=state.get('counters')
+        if c: self.append_result(f"Iterations {c['iterations']}, expanded {c['expanded']}, generated {c['generated']}, max depth {c['max_depth']}")
+
     def run_auto(self):
         if self.G is None: messagebox.showwarning("No graph","Generate or load graph"); return
-        if self.current_generator is None:
-            try: start=int(self.start_node.get()); goal=int(self.goal_node.get())
-            except: messagebox.showwarning("Bad nodes","Start/Goal invalid"); return
-            order=self.neighbor_order.get()
-            self._start_time = time.time()
-            self.current_generator = dfs_generator(self.G,start,goal,neighbor_order=order) if self.search_algo.get()=='DFS' else bfs_generator(self.G,start,goal,neighbor_order=order)
-        if self.auto_running: self.auto_running=False; self.append_result("Auto stopped"); return
-        self.auto_running=True; self.step_delay=max(10,int(self.speed_ms.get())); self.append_result("Auto started"); self._auto_step()
+        if not self._ensure_generator(live=self.turbo.get()): return
+        if self.auto_running: self.auto_running=False; self._stop_turbo(); self.append_result("Auto stopped"); return
+        self.auto_running=True
+        if self.turbo.get(): self._run_turbo(); return
+        self.step_delay=max(10,int(self.speed_ms.get())); self.append_result("Auto started"); self._auto_step()
 
     def _auto_step(self):
         if not self.auto_running or self.current_generator is None: self.auto_running=False; return
-        try: state=next(self.current_generator); self._handle_state(state)
+        try: self._next_state()
         except StopIteration: self.append_result("Auto finished"); self.current_generator=None; self.auto_running=False; return
         self.master.after(self.step_delay, self._auto_step)
 
+    # --- turbo: steps fill a per-frame time budget, one redraw per frame ---
+
+    def _run_turbo(self):
+        self._turbo_state=None; self.append_result("Turbo started")
+        self.scheduler=TurboScheduler(self.master,self._turbo_step,self._turbo_render,steps_per_sec=max(0,int(self.turbo_rate.get())),on_done=self._turbo_done)
+        self.scheduler.start()
+
+    def _stop_turbo(self):
+        if self.scheduler is not None and self.scheduler.running: self.scheduler.stop(); self._turbo_done()
+
+    def _turbo_step(self):
+        if not self.auto_running or self.current_generator is None: return False
+        tr=self.tracer
+        try:
+            if tr:
+                with tr.phase('search'): state=next(self.current_generator)
+            else: state=next(self.current_generator)
+        except StopIteration: self.current_generator=None; return False
+        if state.get('action') in ('found','not_found'):
+            # final states keep their full handling (result text, path drawing)
+            self._turbo_state=None; self._handle_state(state); self._sync_trace_pos(); self._end_trace(state); return False
+        self._turbo_state=state; return True
+
+    def _turbo_render(self, steps, finished):
+        st=self._turbo_state
+        if st is None or finished: return
+        tr=self.tracer
+        with tr.phase('render') if tr else nullcontext():
+            self.draw_graph(visited=st.get('visited'), frontier=st.get('stack') if 'stack' in st else st.get('queue'))
+        self._sync_trace_pos()
+
+    def _turbo_done(self):
+        s=self.scheduler; self.auto_running=False; self._turbo_state=None
+        self.append_result(f"Turbo: {s.steps} steps in {s.frames} frames ({s.rate:.0f} steps/s)")
+
+    def record_trace(self):
+        if self.G is None: messagebox.showwarning("No graph","Generate or load graph"); return
+        if self.search_algo.get() not in ('DFS','BFS'): messagebox.showwarning("Trace","Traces record DFS or BFS runs"); return
+        try: start=int(self.start_node.get()); goal=int(self.goal_node.get())
+        except ValueError: messagebox.showwarning("Bad nodes","Traces record a single start and goal"); return
+        self.trace=record_graph_search(self.G,start,goal,self.search_algo.get(),self.neighbor_order.get()); self._attach_trace()
+        self.append_result(f"Recorded {len(self.trace)} events in {self.trace.meta['record_seconds']:.4f}s ({self.trace.nbytes} bytes)")
+
+    def _attach_trace(self):
+        self.trace_player=graph_player(self.trace); self.trace_scale.configure(to=max(0,len(self.trace)-1)); self.trace_pos.set(0)
+
+    def save_trace(self):
+        if self.trace is None: messagebox.showwarning("No trace","Record a run first"); return
+        path = filedialog.asksaveasfilename(defaultextension='.srtr', filetypes=[('Search trace','*.srtr')])
+        if not path: return
+        self.trace.save(path); self.append_result(f"Saved trace {path}")
+
+    def load_trace(self):
+        path = filedialog.askopenfilename(filetypes=[('Search trace','*.srtr')])
+        if not path: return
+        try: self.trace=SearchTrace.load(path)
+        except Exception as e: messagebox.showerror("Load error", str(e)); return
+        self._attach_trace(); m=self.trace.meta
+        self.append_result(f"Loaded trace {path}: {m.get('algo')} {m.get('start')}->{m.get('goal')}, {len(self.trace)} events")
+        if self.G is None or m.get('nodes')!=self.G.number_of_nodes(): self.append_result("Warning: trace was recorded on a different graph")
+
+    def export_animation(self):
+        if self.trace is None: messagebox.showwarning("No trace","Record or load a trace"); return
+        if self.G is None or self._busy: return
+        if self.trace.meta.get('nodes')!=self.G.number_of_nodes(): messagebox.showwarning("Export","Trace was recorded on a different graph"); return
+        path=filedialog.asksaveasfilename(defaultextension='.gif', filetypes=[('GIF animation','*.gif'),('MP4 video','*.mp4')])
+        if not path: return
+        # rendered offscreen (Agg) in worker processes; the window stays responsive
+        trace=self.trace; G=self.G.copy(); pos=dict(self.pos); self._busy=True; t=time.perf_counter(); self.append_result(f"Exporting {len(trace)} events to {path}...")
+        def done(frames): self._busy=False; self.append_result(f"Exported {frames} frames in {time.perf_counter()-t:.1f}s: {path}")
+        run_in_background(self, lambda: export_graph_trace(trace,G,pos,path), done, self._background_failed)
+
+    def replay_trace(self):
+        if self.trace_player is None: messagebox.showwarning("No trace","Record or load a trace"); return
+        self.reset_run(); pos=int(self.trace_pos.get()); self._start_time=time.time()
+        self.trace_player.seek(pos-1); self.current_generator=replay_states(self.trace_player); self._replaying=True; self._query=None
+        self.append_result(f"Replaying {self.trace.meta.get('algo')} trace from event {pos} (Step / Run to animate)")
+
+    def on_trace_scrub(self, value):
+        if self.trace_player is None or not len(self.trace_player): return
+        state=self.trace_player.seek(int(float(value))).snapshot()
+        self.draw_graph(visited=state.get('visited'), frontier=state.get('stack') if 'stack' in state else state.get('queue'), path=state.get('path'))
+
+    def _sync_trace_pos(self):
+        if self._replaying: self.trace_pos.set(max(0,self.trace_player.position))
+
     def save_graph(self):
         if self.G is None: messagebox.showwarning("No graph","Nothing to save"); return
         path = filedialog.asksaveasfilename(defaultextension='.json', filetypes=[('JSON','*.json'),('Edge list','*.edgelist')])
@@ -331,37 +603,41 @@ class GraphSearchApp(ttk.Frame):
         if path.endswith('.json'):
             data={'nodes':[],'edges':[]}
             for n in self.G.nodes(): data['nodes'].append({'id':n,'pos':list(self.pos.get(n,(0,0)))})
-            for u,v,d in self.G.edges(data=True): data['edges'].append({'u':u,'v':v,'directed': d.get('directed',True)})
+            for u,v,d in self.G.edges(data=True): data['edges'].append({'u':u,'v':v,'directed': d.get('directed',True),'weight': d.get('weight',1)})
             with open(path,'w',encoding='utf-8') as f: json.dump(data,f,indent=2)
             self.append_result(f"Saved {path}")
         else:
             with open(path,'w',encoding='utf-8') as f:
-                for u,v,d in self.G.edges(data=True): f.write(f"{u} {v} {int(d.get('directed',1))}\n")
+                for u,v,d in self.G.edges(data=True): f.write(f"{u} {v} {int(d.get('directed',1))} {d.get('weight',1)}\n")
             self.append_result(f"Saved edgelist {path}")
 
     def load_graph(self):
+        if self._busy: messagebox.showinfo("Busy","Graph is still loading"); return
         path = filedialog.askopenfilename(filetypes=[('JSON','*.json'),('Edge list','*.edgelist')])
         if not path: return
+        _import_heavy()
+        if self.ax is None: self._create_plot()
         try:
             if path.endswith('.json'):
                 with open(path,'r',encoding='utf-8') as f: data=json.load(f)
                 self.push_undo(); G=nx.DiGraph(); pos={}
                 for n in data.get('nodes',[]): G.add_node(n['id']); pos[n['id']]=tuple(n.get('pos',(0,0)))
                 for e in data.get('edges',[]):
-                    u=e['u']; v=e['v']; directed=e.get('directed',True)
-                    if directed: G.add_edge(u,v,directed=True)
-                    else: G.add_edge(u,v,directed=False); G.add_edge(v,u,directed=False)
-                self.G=G; self.pos=pos; self.update_node_comboboxes(); self.draw_graph(); self.append_result(f"Loaded {path}\n")
+                    u=e['u']; v=e['v']; directed=e.get('directed',True); w=e.get('weight',1)
+                    if directed: G.add_edge(u,v,directed=True,weight=w)
+                    else: G.add_edge(u,v,directed=False,weight=w); G.add_edge(v,u,directed=False,weight=w)
+                self.G=G; self.pos=pos; self.view=None; self.update_node_comboboxes(); self.draw_graph(); self.append_result(f"Loaded {path}\n")
             else:
                 with open(path,'r',encoding='utf-8') as f: lines=[l.strip() for l in f if l.strip()]
                 self.push_undo(); G=nx.DiGraph(); nodes=set()
                 for line in lines:
-                    parts=line.split(); u=int(parts[0]); v=int(parts[1]); d=int(parts[2]) if len(parts)>2 else 1
+                    # "u v [directed] [weight]"; older files have no weight column
+                    parts=line.split(); u=int(parts[0]); v=int(parts[1]); d=int(parts[2]) if len(parts)>2 else 1; w=_number(parts[3]) if len(parts)>3 else 1
                     nodes.add(u); nodes.add(v)
-                    if d==1: G.add_edge(u,v,directed=True)
-                    else: G.add_edge(u,v,directed=False); G.add_edge(v,u,directed=False)
+                    if d==1: G.add_edge(u,v,directed=True,weight=w)
+                    else: G.add_edge(u,v,directed=False,weight=w); G.add_edge(v,u,directed=False,weight=w)
                 for n in nodes: G.add_node(n)
-                self.G=G; self.pos={n:(random.random(),random.random()) for n in self.G.nodes()}; self.update_node_comboboxes(); self.draw_graph(); self.append_result(f"Loaded edgelist {path}\n")
+                self.G=G; self.pos=compute_layout(G, self.layout_method.get(), seed=42); self.view=None; self.update_node_comboboxes(); self.draw_graph(); self.append_result(f"Loaded edgelist {path}\n")
         except Exception as e:
             messagebox.showerror("Load error\n", str(e))
 
@@ -376,32 +652,42 @@ class GraphSearchApp(ttk.Frame):
         self.append_result("Running experiments...\n")
         
         for name,g in variants:
-            for algo in ('DFS','BFS'):
+            h=hop_heuristic(g,compute_layout(g,seed=42),n-1)
+            for algo in ('DFS','BFS','IDDFS','IDA*'):
                 for order in orders:
                     start=0; goal=n-1
                     
-                    gen = dfs_generator(g,start,goal,neighbor_order=order) if algo=='DFS' else bfs_generator(g,start,goal,neighbor_order=order)
-                    
-                    found=False; pathlen=0; opened=0
-                    for state in gen:
-                        if state.get('action')=='found':
-                            found=True; pathlen=len(state.get('path',[])); opened=state.get('opened',0); break
-                        if state.get('action')=='not_found':
-                            found=False; opened=state.get('opened',0); break
+                    tr=self.tracer
+                    if tr: tr.begin(algo, variant=name, start=start, goal=goal, order=order, nodes=n)
+                    if algo in ('IDDFS','IDA*'):
+                        # stored = deepest path held at once; re-expansions are the price of not keeping visited
+                        c=SearchCounters(track_distinct=True, budget=EXPERIMENT_BUDGET)
+                        path=iddfs(g,start,goal,order,counters=c,seed=EXPERIMENT_SEED) if algo=='IDDFS' else ida_star(g,start,goal,h,order,counters=c,seed=EXPERIMENT_SEED)
+                        found=path is not None; pathlen=len(path) if found else 0; opened=c.expanded; reexpanded=c.reexpanded; stored=c.max_depth+1
+                    else:
+                        gen = dfs_generator(g,start,goal,neighbor_order=order,tracer=tr,seed=EXPERIMENT_SEED) if algo=='DFS' else bfs_generator(g,start,goal,neighbor_order=order,tracer=tr,seed=EXPERIMENT_SEED)
+                        
+                        found=False; pathlen=0; opened=0; reexpanded=0; stored=0
+                        for state in gen:
+                            if state.get('action')=='found':
+                                found=True; pathlen=len(state.get('path',[])); opened=state.get('opened',0); stored=len(state['parent']); break
+                            if state.get('action')=='not_found':
+                                found=False; opened=state.get('opened',0); stored=len(state['parent']); break
+                    if tr: tr.end(found=found, pathlen=pathlen, opened=opened)
                     
-                    results.append({'variant':name,'algo':algo,'order':order,'found':found,'pathlen':pathlen,'opened':opened})
+                    results.append({'variant':name,'algo':algo,'order':order,'found':found,'pathlen':pathlen,'opened':opened,'reexpanded':reexpanded,'stored':stored})
         
         self.experiments=results; 
         self.append_result("\nExperiments results:\n")
-        self.append_result(f"{'Variant':<10} | {'Algo':<4} | {'Order':<10} | {'Found':<5} | {'PathLen':<7} | {'Opened':<6}")
+        self.append_result(f"{'Variant':<10} | {'Algo':<5} | {'Order':<10} | {'Found':<5} | {'PathLen':<7} | {'Opened':<6} | {'Reexp':<6} | {'Stored':<6}")
         for r in results: 
-            self.append_result(f"{r['variant']:10s} | {r['algo']:4s} | {r['order']:<10} | {str(r['found']):<5s} | {r['pathlen']:<7} | {r['opened']:<6}")
+            self.append_result(f"{r['variant']:10s} | {r['algo']:5s} | {r['order']:<10} | {str(r['found']):<5s} | {r['pathlen']:<7} | {r['opened']:<6} | {r['reexpanded']:<6} | {r['stored']:<6}")
 
     def export_experiments_csv(self):
         if not hasattr(self,'experiments') or not self.experiments: messagebox.showwarning('No data','Run experiments'); return
         path = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[('CSV','*.csv')])
         if not path: return
-        keys=['variant','algo','order','found','pathlen','opened']
+        keys=['variant','algo','order','found','pathlen','opened','reexpanded','stored']
         try:
             with open(path,'w',newline='',encoding='utf-8') as f: 
                 writer=csv.DictWriter(f, fieldnames=keys, delimiter=';'); writer.writeheader(); writer.writerows(self.experiments)
@@ -409,10 +695,19 @@ class GraphSearchApp(ttk.Frame):
         except Exception as e: messagebox.showerror('Save error', str(e))
 
     def append_result(self,text):
-        self.results_text.configure(state='normal'); self.results_text.insert('end', text+'\n'); self.results_text.see('end'); self.results_text.configure(state='disabled')
+        # ring buffer + one widget update per frame (see log_view)
+        self.log.append(text)
+
+    def toggle_log_stream(self):
+        if self.log.sink is not None: path=self.log.sink.path; self.log.stream_to(None); self.append_result(f"Log stream closed: {path}"); return
+        path=filedialog.asksaveasfilename(defaultextension='.log', filetypes=[('Log','*.log'),('Text','*.txt')])
+        if path: self.log.stream_to(path); self.append_result(f"Streaming log to {path}")
+
+    def on_close(self):
+        self.log.stream_to(None); self.master.destroy()
 
 def main():
-    root=tk.Tk(); root.geometry('1200x780'); app=GraphSearchApp(root); root.mainloop()
+    root=tk.Tk(); root.geometry('1200x780'); app=GraphSearchApp(root); root.protocol('WM_DELETE_WINDOW',app.on_close); root.mainloop()
 
 if __name__=='__main__':
     main()
\ No newline at end of file
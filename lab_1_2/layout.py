@@ -0,0 +1,287 @@
+"""Graph layouts for the editor that scale past a few thousand nodes.
+
+Force-directed layout is Fruchterman-Reingold with two approximations:
+repulsion is computed particle-mesh style (node masses binned on a grid and
+convolved with the 1/r kernel by FFT, plus an in-cell correction), and large
+graphs are laid out multilevel (coarsened by edge matching, solved at the
+coarsest level, then prolonged and refined). Each iteration is
+O(n + m + G^2 log G) for a G x G grid instead of O(n^2).
+
+Layouts ignore edge direction and are cached by a structural graph hash.
+"""
+
+import hashlib, math
+from itertools import chain
+from collections import OrderedDict, deque
+import numpy as np
+
+EXACT_BELOW = 400       # below this many nodes repulsion is computed exactly (O(n^2))
+COARSEST = 150          # stop coarsening at this size
+SPRING_BELOW = 500      # 'auto' keeps networkx spring_layout for small graphs (same look as before)
+
+def _edge_index(G, index):
+    # (m, 2) int array of node indices for every edge of G, built without a Python set of tuples
+    m=G.number_of_edges(); flat=np.fromiter(map(index.__getitem__,chain.from_iterable(G.edges())),dtype=np.int64,count=2*m)
+    return flat.reshape(-1,2)
+
+def _unique_pairs(pairs, n):
+    # undirected (lo, hi) pairs of nodes 0..n-1, deduplicated and sorted (one int64 key per pair)
+    lo=np.minimum(pairs[:,0],pairs[:,1]); hi=np.maximum(pairs[:,0],pairs[:,1]); key=np.unique(lo*n+hi)
+    return np.column_stack([key//n,key%n]).astype(np.int64).reshape(-1,2)
+
+def graph_arrays(G):
+    """Returns (nodes, index, edges) with edges as a unique undirected (m, 2) int array."""
+    nodes=list(G.nodes()); index={n:i for i,n in enumerate(nodes)}
+    edges=_edge_index(G,index); edges=_unique_pairs(edges[edges[:,0]!=edges[:,1]],len(nodes))
+    return nodes,index,edges
+
+def graph_hash(G, arrays=None):
+    """Structural hash (nodes + undirected edges, self-loops ignored) used as the layout cache key."""
+    nodes,_,edges=arrays or graph_arrays(G)
+    order=sorted(range(len(nodes)), key=lambda i: repr(nodes[i])); rank=np.empty(len(nodes),dtype=np.int64); rank[order]=np.arange(len(nodes))
+    h=hashlib.sha1(repr([nodes[i] for i in order]).encode('utf-8')); h.update(_unique_pairs(rank[edges],len(nodes)).tobytes())
+    return h.hexdigest()
+
+def _normalize(pos):
+    # same convention as networkx rescale_layout: centred at 0, max |coordinate| = 1
+    if len(pos)==0: return pos
+    pos=pos-pos.mean(0); lim=np.abs(pos).max()
+    return pos/lim if lim>0 else pos
+
+def _adjacency(n, edges):
+    src=np.concatenate([edges[:,0],edges[:,1]]); dst=np.concatenate([edges[:,1],edges[:,0]])
+    order=np.argsort(src,kind='stable'); indptr=np.zeros(n+1,dtype=np.int64); np.cumsum(np.bincount(src,minlength=n),out=indptr[1:])
+    return indptr, dst[order]
+
+# --- fast initial layouts ---
+
+def grid_layout(n, edges=None):
+    """Nodes on a square grid; with edges, in BFS order so neighbours land close together."""
+    order=np.arange(n) if edges is None or len(edges)==0 else _bfs_order(n,edges)
+    side=max(1,math.ceil(math.sqrt(n))); pos=np.zeros((n,2)); pos[order,0]=np.arange(n)%side; pos[order,1]=np.arange(n)//side
+    return _normalize(pos)
+
+def _bfs_order(n, edges, root=None):
+    indptr,adj=_adjacency(n,edges); seen=np.zeros(n,dtype=bool); order=[]
+    roots=[root] if root is not None else []
+    roots+=list(np.argsort(-np.diff(indptr),kind='stable'))
+    for r in roots:
+        if seen[r]: continue
+        seen[r]=True; q=deque([r])
+        while q:
+            u=q.popleft(); order.append(u)
+            for v in adj[indptr[u]:indptr[u+1]]:
+                if not seen[v]: seen[v]=True; q.append(v)
+    return np.array(order,dtype=np.int64)
+
+def tree_layout(n, edges, root=None):
+    """Radial BFS-tree layout: depth is the radius, children fan out around their parent's angle."""
+    if n==0: return np.zeros((0,2))
+    indptr,adj=_adjacency(n,edges); depth=np.full(n,-1); parent=np.full(n,-1); layers=[]
+    roots=[root] if root is not None else []
+    roots+=list(np.argsort(-np.diff(indptr),kind='stable'))
+    offset=0
+    for r in roots:
+        if depth[r]>=0: continue
+        depth[r]=offset; frontier=[r]
+        while frontier:
+            d=depth[frontier[0]]
+            while len(layers)<=d: layers.append([])
+            layers[d].extend(frontier); nxt=[]
+            for u in frontier:
+                for v in adj[indptr[u]:indptr[u+1]]:
+                    if depth[v]<0: depth[v]=d+1; parent[v]=u; nxt.append(v)
+            frontier=nxt
+        offset=len(layers)  # further components continue on outer rings
+    angle=np.zeros(n); pos=np.zeros((n,2))
+    for d,layer in enumerate(layers):
+        layer=np.array(layer); keys=np.where(parent[layer]>=0, angle[np.maximum(parent[layer],0)], 0.0)
+        layer=layer[np.argsort(keys,kind='stable')]
+        angle[layer]=2*math.pi*(np.arange(len(layer))+0.5)/len(layer)
+        pos[layer,0]=d*np.cos(angle[layer]); pos[layer,1]=d*np.sin(angle[layer])
+    return _normalize(pos)
+
+def spectral_layout(n, edges, iterations=200, seed=42):
+    """Two smallest non-trivial generalized Laplacian eigenvectors by power iteration (Koren's method)."""
+    if n<3 or len(edges)==0: return grid_layout(n, edges)
+    rng=np.random.default_rng(seed); src,dst=edges[:,0],edges[:,1]
+    deg=np.bincount(src,minlength=n)+np.bincount(dst,minlength=n)+1e-9
+    def walk(x):  # 0.5 * (I + D^-1 A) x
+        ax=np.bincount(src,weights=x[dst],minlength=n)+np.bincount(dst,weights=x[src],minlength=n)
+        return 0.5*(x+ax/deg)
+    basis=[np.ones(n)/math.sqrt(deg.sum())]
+    for _ in range(2):
+        x=rng.standard_normal(n)
+        for _ in range(iterations):
+            for b in basis: x-=(x*deg@b)*b
+            x=walk(x); x/=math.sqrt(x*deg@x) or 1.0
+        basis.append(x)
+    return _normalize(np.column_stack(basis[1:]))
+
+# --- force-directed layout ---
+
+def _attraction(pos, edges, k, disp):
+    if len(edges)==0: return
+    d=pos[edges[:,1]]-pos[edges[:,0]]; f=d*(np.sqrt((d*d).sum(1))/k)[:,None]; n=len(pos)
+    for c in (0,1):
+        disp[:,c]+=np.bincount(edges[:,0],weights=f[:,c],minlength=n)-np.bincount(edges[:,1],weights=f[:,c],minlength=n)
+
+def _repulsion_exact(pos, k, disp):
+    dx=pos[:,0,None]-pos[None,:,0]; dy=pos[:,1,None]-pos[None,:,1]; d2=dx*dx+dy*dy; np.fill_diagonal(d2,1.0)
+    w=k*k/np.maximum(d2,1e-12); disp[:,0]+=(dx*w).sum(1); disp[:,1]+=(dy*w).sum(1)
+
+_kernel_cache={}
+def _kernel_fft(M):
+    # FFT of the base kernel a/(a^2+b^2), b/(a^2+b^2) on a 2M x 2M periodic grid
+    if M not in _kernel_cache:
+        P=2*M; a=np.arange(P); a=np.where(a<M,a,a-P).astype(float); A,B=np.meshgrid(a,a,indexing='ij')
+        r2=A*A+B*B; r2[0,0]=np.inf
+        _kernel_cache[M]=(np.fft.rfft2(A/r2),np.fft.rfft2(B/r2))
+    return _kernel_cache[M]
+
+def _repulsion_mesh(pos, k, disp, M=None):
+    n=len(pos); M=M or int(min(256,max(32,2**math.ceil(math.log2(math.sqrt(n)*1.5)))))
+    lo=pos.min(0); ext=max(float((pos.max(0)-lo).max()),1e-9)*1.0001; h=ext/M
+    ij=np.minimum(((pos-lo)/h).astype(np.int64),M-1); cell=ij[:,0]*M+ij[:,1]
+    mass=np.zeros((2*M,2*M)); mass[:M,:M]=np.bincount(cell,minlength=M*M).reshape(M,M)
+    KX,KY=_kernel_fft(M); fm=np.fft.rfft2(mass); scale=k*k/h
+    fx=np.fft.irfft2(fm*KX,s=mass.shape)[:M,:M].ravel()*scale; fy=np.fft.irfft2(fm*KY,s=mass.shape)[:M,:M].ravel()*scale
+    disp[:,0]+=fx[cell]; disp[:,1]+=fy[cell]
+    # near field: nodes sharing a cell repel from the cell centroid
+    cnt=np.bincount(cell,minlength=M*M); cx=np.bincount(cell,weights=pos[:,0],minlength=M*M)/np.maximum(cnt,1); cy=np.bincount(cell,weights=pos[:,1],minlength=M*M)/np.maximum(cnt,1)
+    d=np.column_stack([pos[:,0]-cx[cell],pos[:,1]-cy[cell]]); d2=np.maximum((d*d).sum(1),(0.01*k)**2)
+    disp+=d*(k*k*(cnt[cell]-1)/d2)[:,None]
+
+def force_layout(pos, edges, iterations=50, k=None, temperature=0.1, fixed=None, gravity=0.05, seed=42):
+    """Fruchterman-Reingold from the given start positions; `fixed` is a boolean mask of pinned nodes."""
+    pos=np.array(pos,dtype=float); n=len(pos)
+    if n<2: return pos
+    k=k or math.sqrt(1.0/n); rng=np.random.default_rng(seed)
+    pos+=rng.standard_normal(pos.shape)*1e-6  # break exact overlaps
+    t=temperature*max(float(np.ptp(pos,0).max()),k); dt=t/(iterations+1)
+    for _ in range(iterations):
+        disp=np.zeros_like(pos)
+        if n<EXACT_BELOW: _repulsion_exact(pos,k,disp)
+        else: _repulsion_mesh(pos,k,disp)
+        _attraction(pos,edges,k,disp)
+        if gravity: disp-=gravity*math.sqrt(n)*k*(pos-pos.mean(0))
+        if fixed is not None: disp[fixed]=0
+        length=np.maximum(np.sqrt((disp*disp).sum(1)),1e-12)
+        pos+=disp*(np.minimum(length,t)/length)[:,None]; t-=dt
+    return pos
+
+def _coarsen(n, edges, rng, rounds=8):
+    """Matching by locally dominant edges: every edge gets a random weight, each unmatched node points
+    at its heaviest edge to an unmatched neighbour, and edges chosen from both ends are matched.
+    A few rounds give a near-maximal matching (one round of random mutual picks merges only ~10%
+    of a sparse graph's nodes, which stopped coarsening at the first level)."""
+    if len(edges)==0: return n,edges,np.arange(n)
+    w=rng.random(len(edges)); src=np.concatenate([edges[:,0],edges[:,1]]); dst=np.concatenate([edges[:,1],edges[:,0]]); w=np.concatenate([w,w])
+    order=np.lexsort((w,src)); src,dst=src[order],dst[order]   # by node, heaviest edge last
+    ids=np.arange(n); mate=np.full(n,-1)
+    for _ in range(rounds):
+        live=(mate[src]<0)&(mate[dst]<0)
+        if not live.any(): break
+        s,d=src[live],dst[live]; last=np.append(s[1:]!=s[:-1],True)
+        best=np.full(n,-1); best[s[last]]=d[last]
+        has=np.nonzero(best>=0)[0]; mutual=has[best[best[has]]==has]
+        mate[mutual]=best[mutual]
+    rep=np.where(mate>=0,np.minimum(ids,mate),ids)
+    _,cluster=np.unique(rep,return_inverse=True); nc=int(cluster.max())+1
+    ce=_unique_pairs(np.column_stack([cluster[edges[:,0]],cluster[edges[:,1]]]),nc); ce=ce[ce[:,0]!=ce[:,1]]
+    return nc,ce,cluster
+
+def multilevel_layout(n, edges, iterations=50, seed=42):
+    rng=np.random.default_rng(seed); levels=[(n,edges)]; maps=[]
+    while levels[-1][0]>COARSEST:
+        nc,ec,cluster=_coarsen(*levels[-1],rng)
+        if nc>0.9*levels[-1][0]: break
+        maps.append(cluster); levels.append((nc,ec))
+    n0,e0=levels[-1]; pos=force_layout(spectral_layout(n0,e0,seed=seed),e0,iterations=iterations*2,seed=seed)
+    for lvl in range(len(maps)-1,-1,-1):
+        nf,ef=levels[lvl]; kf=math.sqrt(1.0/nf)
+        # prolong: children start at their cluster's position, then refine (the area stays 1, so k just shrinks)
+        pos=pos[maps[lvl]]+rng.standard_normal((nf,2))*kf*0.1
+        pos=force_layout(pos,ef,iterations=max(10,iterations//5) if lvl else iterations,k=kf,temperature=0.05,seed=seed)
+    return pos
+
+def incremental_layout(G, pos, changed, hops=2, iterations=40, seed=42):
+    """Re-lays out only the nodes within `hops` of the changed nodes; everything else stays put.
+
+    Nodes without a position (new ones) start at the centre of their placed neighbours.
+    Only the edited neighbourhood is walked in Python; the rest of the drawing is touched
+    by one vectorised pass that bins it into a grid to find the nodes nearby.
+    Returns a new position dict.
+    """
+    pos=dict(pos); U=G.to_undirected(as_view=True) if G.is_directed() else G
+    region=set(n for n in changed if n in G); frontier=set(region)
+    for _ in range(hops):
+        frontier={v for u in frontier for v in U[u]}-region; region|=frontier
+    if not region: return pos
+    rng=np.random.default_rng(seed); new=[n for n in region if n not in pos]
+    # spring length comes from the existing edges around the edit, so the edited area matches its surroundings
+    ex=[(pos[u],pos[v]) for u in region if u in pos for v in U[u] if v in pos and v!=u]
+    k=float(np.median(np.linalg.norm(np.subtract(*np.array(ex).transpose(1,0,2)),axis=1))) if ex else 0.1
+    if new:
+        placed=[pos[n] for n in region if n in pos]
+        center=np.mean(placed,axis=0) if placed else np.mean(list(pos.values()),axis=0) if pos else np.zeros(2)
+        for n in new:
+            nb=[pos[v] for v in U[n] if v in pos]; pos[n]=tuple((np.mean(nb,axis=0) if nb else center)+rng.standard_normal(2)*0.01)
+    # local problem: the region plus its neighbours (pinned), plus nodes in grid cells next to the region (pinned)
+    local=set(region)|{v for u in region for v in U[u]}
+    local.update(_nearby(pos,[pos[n] for n in region],2*k))
+    nodes=list(local); idx={n:i for i,n in enumerate(nodes)}
+    edges=np.array([(idx[u],idx[v]) for u in nodes for v in U[u] if v in idx and idx[u]<idx[v]],dtype=np.int64).reshape(-1,2)
+    fixed=np.array([n not in region for n in nodes])
+    xy=force_layout(np.array([pos[n] for n in nodes]),edges,iterations=iterations,k=k,temperature=0.05,fixed=fixed,gravity=0,seed=seed)
+    for n in region: pos[n]=tuple(xy[idx[n]])
+    return pos
+
+def _nearby(pos, points, cell):
+    # nodes whose grid cell (side `cell`) touches a cell holding one of `points`
+    keys=list(pos); xy=np.fromiter(chain.from_iterable(pos.values()),dtype=float,count=2*len(keys)).reshape(-1,2)
+    ij=np.floor(xy/cell).astype(np.int64); pij=np.floor(np.asarray(points,dtype=float)/cell).astype(np.int64)
+    around=(pij[:,None,:]+np.array([(dx,dy) for dx in (-1,0,1) for dy in (-1,0,1)])[None]).reshape(-1,2)
+    span=int(max(ij[:,1].max(),around[:,1].max())-min(ij[:,1].min(),around[:,1].min()))+1
+    hit=np.isin(ij[:,0]*span+ij[:,1],np.unique(around[:,0]*span+around[:,1]))
+    return [keys[i] for i in np.nonzero(hit)[0]]
+
+# --- entry point + cache ---
+
+class LayoutCache:
+    """Small LRU of layouts keyed by (graph hash, method, seed)."""
+    def __init__(self, max_entries=16): self.max_entries=max_entries; self._data=OrderedDict(); self.hits=0; self.misses=0
+    def get(self, key):
+        if key in self._data: self._data.move_to_end(key); self.hits+=1; return self._data[key]
+        self.misses+=1; return None
+    def put(self, key, value):
+        self._data[key]=value; self._data.move_to_end(key)
+        while len(self._data)>self.max_entries: self._data.popitem(last=False)
+
+LAYOUT_CACHE=LayoutCache()
+LAYOUT_METHODS=('auto','spring','multilevel','spectral','grid','tree')
+
+def compute_layout(G, method='auto', seed=42, iterations=50, cache=LAYOUT_CACHE):
+    """Returns {node: (x, y)} scaled to [-1, 1]."""
+    if method=='auto': method='spring' if G.number_of_nodes()<SPRING_BELOW else 'multilevel'
+    arrays=graph_arrays(G); key=(graph_hash(G,arrays),method,seed)
+    if cache is not None:
+        hit=cache.get(key)
+        if hit is not None: return dict(hit)
+    if method=='spring' and G.number_of_nodes()<SPRING_BELOW:
+        import networkx as nx
+        pos=nx.spring_layout(G, seed=seed)
+    else:
+        nodes,_,edges=arrays; n=len(nodes)
+        if method=='spring':
+            # networkx switches to a scipy sparse solver above 500 nodes; the single-level FR here needs only numpy
+            start=np.random.default_rng(seed).random((n,2))
+            xy=_normalize(force_layout(start,edges,iterations=iterations,seed=seed))
+        elif method=='grid': xy=grid_layout(n,edges)
+        elif method=='tree': xy=tree_layout(n,edges)
+        elif method=='spectral': xy=spectral_layout(n,edges,seed=seed)
+        elif method=='multilevel': xy=_normalize(multilevel_layout(n,edges,iterations=iterations,seed=seed))
+        else: raise ValueError(f"unknown layout method {method!r}")
+        pos={nd:(float(x),float(y)) for nd,(x,y) in zip(nodes,xy)}
+    if cache is not None: cache.put(key,pos)
+    return dict(pos)
@@ -0,0 +1,127 @@
+"""Level-of-detail drawing of large graphs for the editor canvas.
+
+Positions and edges are kept as NumPy arrays, so each redraw only culls to
+the current view rectangle and issues a handful of artists: one scatter (or
+a density heatmap when too many nodes are visible), one LineCollection per
+edge kind, and labels only when few nodes are on screen.
+"""
+
+import math
+import numpy as np
+
+LOD_FROM = 2000          # the editor keeps the detailed networkx drawing below this many nodes
+MAX_NODES = 20000        # more visible nodes than this are drawn as a heatmap
+MAX_EDGES = 15000        # visible edge budget; short edges are dropped first, then a stride sample
+MAX_ARROWS = 300         # arrowheads only when this few directed edges are visible
+LABEL_BELOW = 300        # node labels only when this few nodes are visible
+HEAT_BINS = 160          # heatmap resolution along the longer side of the view
+
+_STATE_COLORS = np.array(['#dddddd', '#fff79a', '#bbbbbb', '#7be57b'])  # default, frontier, visited, path
+
+class LodRenderer:
+    """Array snapshot of (G, pos) with view culling, drawing and vectorized hit tests."""
+    def __init__(self, G, pos):
+        self.nodes=list(G.nodes()); self.index={n:i for i,n in enumerate(self.nodes)}
+        self.xy=np.array([pos.get(n,(0.0,0.0)) for n in self.nodes],dtype=float).reshape(-1,2)
+        seen=set(); und=[]; dirs=[]
+        for u,v,data in G.edges(data=True):
+            if data.get('directed') is False:
+                key=(u,v) if u<=v else (v,u)
+                if key in seen: continue
+                seen.add(key); und.append((self.index[u],self.index[v]))
+            else: dirs.append((self.index[u],self.index[v]))
+        self.undirected=np.array(und,dtype=np.int64).reshape(-1,2); self.directed=np.array(dirs,dtype=np.int64).reshape(-1,2)
+
+    def __len__(self): return len(self.nodes)
+
+    @property
+    def edge_count(self): return len(self.undirected)+len(self.directed)
+
+    def bounds(self, margin=0.05):
+        if not len(self.xy): return (-1.0,1.0,-1.0,1.0)
+        lo=self.xy.min(0); hi=self.xy.max(0); pad=max(float((hi-lo).max())*margin,1e-3)
+        return (lo[0]-pad,hi[0]+pad,lo[1]-pad,hi[1]+pad)
+
+    def move(self, node, xy):
+        i=self.index.get(node)
+        if i is not None: self.xy[i]=xy
+
+    def _indices(self, nodes):
+        idx=self.index
+        return np.fromiter((idx[n] for n in nodes if n in idx),dtype=np.int64) if nodes else np.zeros(0,dtype=np.int64)
+
+    def visible(self, view):
+        x0,x1,y0,y1=view; x=self.xy[:,0]; y=self.xy[:,1]
+        return (x>=x0)&(x<=x1)&(y>=y0)&(y<=y1)
+
+    def nearest_node(self, x, y):
+        if not len(self.xy): return None,None
+        d2=(self.xy[:,0]-x)**2+(self.xy[:,1]-y)**2; i=int(np.argmin(d2))
+        return self.nodes[i],math.sqrt(float(d2[i]))
+
+    def nearest_edge(self, x, y):
+        best=(None,None)
+        for edges in (self.undirected,self.directed):
+            if not len(edges): continue
+            a=self.xy[edges[:,0]]; b=self.xy[edges[:,1]]; ab=b-a; L2=(ab*ab).sum(1); ok=L2>0
+            t=np.clip(((x-a[:,0])*ab[:,0]+(y-a[:,1])*ab[:,1])/np.where(ok,L2,1.0),0,1)
+            d=np.hypot(a[:,0]+t*ab[:,0]-x,a[:,1]+t*ab[:,1]-y); d[~ok]=np.inf; i=int(np.argmin(d))
+            if ok[i] and (best[1] is None or d[i]<best[1]): best=((self.nodes[edges[i,0]],self.nodes[edges[i,1]]),float(d[i]))
+        return best
+
+    def _edge_budget(self, edges, vis, cell):
+        sel=edges[vis[edges[:,0]]|vis[edges[:,1]]] if len(edges) else edges
+        if len(sel)>MAX_EDGES:
+            seg=self.xy[sel[:,1]]-self.xy[sel[:,0]]; sel=sel[(seg*seg).sum(1)>=cell*cell]  # sub-cell edges are covered by the node layer
+        if len(sel)>MAX_EDGES: sel=sel[::math.ceil(len(sel)/MAX_EDGES)]
+        return sel
+
+    def _heatmap(self, ax, idx, view, cmap, alpha, zorder):
+        x0,x1,y0,y1=view; w=x1-x0; h=y1-y0; s=HEAT_BINS/max(w,h)
+        bins=(max(1,int(round(w*s))),max(1,int(round(h*s))))
+        H,_,_=np.histogram2d(self.xy[idx,0],self.xy[idx,1],bins=bins,range=[[x0,x1],[y0,y1]])
+        ax.imshow(np.ma.masked_equal(np.log1p(H.T),0),extent=(x0,x1,y0,y1),origin='lower',cmap=cmap,alpha=alpha,
+                  aspect='auto',interpolation='nearest',zorder=zorder)
+
+    def draw(self, ax, view, visited=None, frontier=None, path=None, marks=()):
+        """Draws the part of the graph inside ``view`` = (x0, x1, y0, y1); returns a short LOD summary.
+
+        ``marks`` is a sequence of (node, color) drawn on top (start, goal, selected node).
+        """
+        from matplotlib.collections import LineCollection
+        x0,x1,y0,y1=view; span=max(x1-x0,y1-y0); vis=self.visible(view); nvis=int(vis.sum())
+        dense=nvis>MAX_NODES; cell=span/HEAT_BINS
+        und=self._edge_budget(self.undirected,vis,cell); dirs=self._edge_budget(self.directed,vis,cell)
+        lw=0.3 if dense else 0.8
+        if len(und): ax.add_collection(LineCollection(self.xy[und],colors='#888888',linewidths=lw,alpha=0.5 if dense else 1.0,zorder=1))
+        if len(dirs):
+            ax.add_collection(LineCollection(self.xy[dirs],colors='#ff6666',linewidths=lw,zorder=1))
+            if len(dirs)<=MAX_ARROWS and not dense:
+                a=self.xy[dirs[:,0]]; d=self.xy[dirs[:,1]]-a
+                ax.quiver(a[:,0]+0.6*d[:,0],a[:,1]+0.6*d[:,1],d[:,0]*0.05,d[:,1]*0.05,color='#ff6666',angles='xy',scale_units='xy',scale=1,width=0.002,headwidth=6,zorder=1)
+        v_idx=self._indices(visited); f_idx=self._indices(frontier); p_idx=self._indices(path)
+        if dense:
+            self._heatmap(ax,np.flatnonzero(vis),view,'Greys',0.8,2)
+            if len(v_idx): self._heatmap(ax,v_idx[vis[v_idx]],view,'Oranges',0.6,3)
+            f_idx=f_idx[vis[f_idx]][:MAX_NODES] if len(f_idx) else f_idx
+            if len(f_idx): ax.scatter(self.xy[f_idx,0],self.xy[f_idx,1],s=4,c=_STATE_COLORS[1],edgecolors='none',zorder=4)
+        else:
+            state=np.zeros(len(self.xy),dtype=np.int8); state[f_idx]=1; state[v_idx]=2; state[p_idx]=3
+            idx=np.flatnonzero(vis); size=max(4.0,min(180.0,40000.0/max(nvis,1)))
+            ax.scatter(self.xy[idx,0],self.xy[idx,1],s=np.where(state[idx]==3,size*1.8,size),c=_STATE_COLORS[state[idx]],
+                       edgecolors='#555555' if nvis<=LABEL_BELOW else 'none',linewidths=0.5,zorder=2)
+            if nvis<=LABEL_BELOW:
+                for i in idx: ax.text(self.xy[i,0],self.xy[i,1],str(self.nodes[i]),fontsize=8,ha='center',va='center',zorder=5,clip_on=True)
+        if len(p_idx):
+            ax.plot(self.xy[p_idx,0],self.xy[p_idx,1],color='#2ca02c',linewidth=2,zorder=4)
+            ax.scatter(self.xy[p_idx,0],self.xy[p_idx,1],s=12,c=_STATE_COLORS[3],edgecolors='none',zorder=4)
+        for node,color in marks:
+            i=self.index.get(node)
+            if i is not None: ax.scatter([self.xy[i,0]],[self.xy[i,1]],s=120,c=color,edgecolors='#333333',linewidths=0.8,zorder=6)
+        ax.set_xlim(x0,x1); ax.set_ylim(y0,y1)
+        return f"LOD: {nvis} nodes in view{' (heatmap)' if dense else ''}, {len(und)+len(dirs)} edges drawn"
+
+def zoom_view(view, x, y, factor):
+    """Scales the view rectangle about (x, y); factor < 1 zooms in."""
+    x0,x1,y0,y1=view
+    return (x+(x0-x)*factor,x+(x1-x)*factor,y+(y0-y)*factor,y+(y1-y)*factor)
@@ -0,0 +1,90 @@
+"""Bounded, batched result log for the editor's text panel.
+
+append() only stores the line in a ring buffer (the last `capacity` entries)
+and schedules a flush; at most once per frame the widget is rewritten with
+the few lines that fit in it. Scrolling is virtual: the scrollbar and the
+mouse wheel move a window over the buffer, so inserts never accumulate in
+the tk.Text and UI cost does not grow with the run length. The Text does not
+wrap, so one entry is one display row and the window always fits the widget. The full log can
+additionally be streamed to a file by a background writer thread.
+"""
+
+import queue, threading
+from collections import deque
+
+LOG_CAPACITY = 10000     # entries kept in memory (older ones are only in the file stream, if any)
+FLUSH_MS = 16            # at most one widget update per frame
+
+class FileSink:
+    """Appends lines to a file from a daemon thread; the Tk thread only enqueues."""
+    def __init__(self, path):
+        self.path=path; self.lines=queue.SimpleQueue(); self.thread=threading.Thread(target=self._run,daemon=True); self.thread.start()
+
+    def _run(self):
+        with open(self.path,'a',encoding='utf-8') as f:
+            while True:
+                line=self.lines.get()
+                if line is None: return
+                batch=[line]
+                try:
+                    while len(batch)<4096:
+                        line=self.lines.get_nowait()
+                        if line is None: f.write('\n'.join(batch)+'\n'); return
+                        batch.append(line)
+                except queue.Empty: pass
+                f.write('\n'.join(batch)+'\n'); f.flush()
+
+    def write(self, line): self.lines.put(line)
+
+    def close(self): self.lines.put(None); self.thread.join()
+
+class LogView:
+    """Ring buffer of log lines shown through a virtual window on a tk.Text (+ optional scrollbar)."""
+    def __init__(self, text, scrollbar=None, capacity=LOG_CAPACITY):
+        self.text=text; self.scrollbar=scrollbar; self.lines=deque(maxlen=capacity); self.total=0
+        self.top=0; self.follow=True; self._job=None; self.sink=None
+        text.configure(wrap='none')  # a wrapped entry would take several rows and push the last ones out of view
+        if scrollbar is not None: scrollbar.configure(command=self.on_scroll)
+        for seq in ('<MouseWheel>','<Button-4>','<Button-5>'): text.bind(seq,self.on_wheel)
+
+    def append(self, line):
+        # when scrolled back, a full buffer evicts the oldest entry: shift the window so the same lines stay in view
+        if not self.follow and len(self.lines)==self.lines.maxlen: self.top=max(0,self.top-1)
+        self.lines.append(line); self.total+=1
+        if self.sink is not None: self.sink.write(line)
+        if self._job is None: self._job=self.text.after(FLUSH_MS,self.flush)
+
+    def clear(self):
+        self.lines.clear(); self.top=0; self.follow=True; self.flush()
+
+    def rows(self):
+        return max(1,int(self.text.cget('height')))
+
+    def flush(self):
+        self._job=None; rows=self.rows(); n=len(self.lines)
+        if self.follow: self.top=max(0,n-rows)
+        self.top=min(self.top,max(0,n-rows))
+        visible=[self.lines[i] for i in range(self.top,min(n,self.top+rows))]
+        self.text.configure(state='normal'); self.text.delete('1.0','end'); self.text.insert('end','\n'.join(visible))
+        if self.follow: self.text.see('end')
+        self.text.configure(state='disabled')
+        if self.scrollbar is not None:
+            self.scrollbar.set(*((self.top/n, min(1.0,(self.top+rows)/n)) if n else (0.0,1.0)))
+
+    def _scroll_to(self, top):
+        rows=self.rows(); last=max(0,len(self.lines)-rows)
+        self.top=max(0,min(int(top),last)); self.follow=self.top>=last; self.flush()
+
+    def on_scroll(self, *args):
+        # scrollbar protocol: ('moveto', fraction) or ('scroll', n, 'units'|'pages')
+        if args[0]=='moveto': self._scroll_to(float(args[1])*len(self.lines))
+        elif args[0]=='scroll': step=int(args[1])*(self.rows() if args[2]=='pages' else 1); self._scroll_to(self.top+step)
+
+    def on_wheel(self, event):
+        up=getattr(event,'num',0)==4 or getattr(event,'delta',0)>0
+        self._scroll_to(self.top+(-3 if up else 3)); return 'break'
+
+    def stream_to(self, path):
+        """Starts (path) or stops (None) streaming every appended line to a file."""
+        if self.sink is not None: self.sink.close(); self.sink=None
+        if path: self.sink=FileSink(path)
@@ -0,0 +1,81 @@
+"""Min-priority queues for uniform-cost search: binary heap, pairing heap, radix heap.
+
+All three share push(key, item), pop() -> (key, item), len() and iteration
+over the queued items (for drawing the frontier). Decrease-key is done by the
+caller pushing the item again and skipping stale pops (lazy deletion), which
+keeps the three interchangeable.
+
+* BinaryHeap  - heapq; O(log n) push and pop
+* PairingHeap - O(1) push, amortized O(log n) pop; cheap when many pushes are never popped
+* RadixHeap   - monotone integer keys only (every key >= the last popped one, as in
+  Dijkstra with non-negative integer weights); keys are bucketed by the highest bit
+  where they differ from the last popped key, O(log C) amortized per item for keys up to C
+"""
+
+import heapq
+from itertools import count
+
+class BinaryHeap:
+    __slots__=('heap','seq')
+    def __init__(self): self.heap=[]; self.seq=count()
+    def push(self, key, item): heapq.heappush(self.heap,(key,next(self.seq),item))
+    def pop(self): key,_,item=heapq.heappop(self.heap); return key,item
+    def __len__(self): return len(self.heap)
+    def __iter__(self): return (item for _,_,item in self.heap)
+
+class PairingHeap:
+    # a node is [key, seq, item, children]; seq keeps ties in insertion order like BinaryHeap
+    __slots__=('root','size','seq')
+    def __init__(self): self.root=None; self.size=0; self.seq=count()
+
+    @staticmethod
+    def _meld(a, b):
+        if (b[0],b[1])<(a[0],a[1]): a,b=b,a
+        a[3].append(b); return a
+
+    def push(self, key, item):
+        node=[key,next(self.seq),item,[]]; self.size+=1
+        self.root=node if self.root is None else self._meld(self.root,node)
+
+    def pop(self):
+        root=self.root
+        if root is None: raise IndexError('pop from empty PairingHeap')
+        kids=root[3]; meld=self._meld
+        # two-pass merge: pair up left to right, then fold the pairs right to left
+        pairs=[meld(kids[i],kids[i+1]) if i+1<len(kids) else kids[i] for i in range(0,len(kids),2)]
+        node=pairs.pop() if pairs else None
+        while pairs: node=meld(pairs.pop(),node)
+        self.root=node; self.size-=1
+        return root[0],root[2]
+
+    def __len__(self): return self.size
+
+    def __iter__(self):
+        stack=[self.root] if self.root is not None else []
+        while stack: node=stack.pop(); yield node[2]; stack.extend(node[3])
+
+class RadixHeap:
+    __slots__=('buckets','last','size')
+    def __init__(self): self.buckets=[[] for _ in range(65)]; self.last=0; self.size=0
+
+    def push(self, key, item):
+        if type(key) is not int or key<self.last:
+            raise ValueError(f"radix heap needs monotone integer keys (got {key!r} after {self.last})")
+        self.buckets[(key^self.last).bit_length()].append((key,item)); self.size+=1
+
+    def pop(self):
+        buckets=self.buckets
+        if not buckets[0]:
+            i=1
+            while i<len(buckets) and not buckets[i]: i+=1
+            if i==len(buckets): raise IndexError('pop from empty RadixHeap')
+            # the smallest key of the first non-empty bucket becomes `last`; the rest move to lower buckets
+            moved=buckets[i]; buckets[i]=[]; last=self.last=min(k for k,_ in moved)
+            for entry in moved: buckets[(entry[0]^last).bit_length()].append(entry)
+        self.size-=1
+        return buckets[0].pop()
+
+    def __len__(self): return self.size
+    def __iter__(self): return (item for bucket in self.buckets for _,item in bucket)
+
+QUEUES={'binary':BinaryHeap,'pairing':PairingHeap,'radix':RadixHeap}
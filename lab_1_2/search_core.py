@@ -0,0 +1,343 @@
+"""Search algorithms of the graph editor, importable without Tk or matplotlib."""
+
+import os, random, sys, weakref
+from array import array
+from collections import deque, namedtuple
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from search_common.stores import new_store
+
+def ensure_connected_graph(n, m, directed=False, seed=None, max_weight=1):
+    import networkx as nx  # deferred: the editor imports this module before networkx is needed
+    if seed is not None:
+        random.seed(seed)
+    nodes = list(range(n))
+    edges = []
+    remaining = nodes[:]
+    random.shuffle(remaining)
+    connected = [remaining.pop()]
+    while remaining:
+        a = random.choice(connected); b = remaining.pop(); edges.append((a,b)); connected.append(b)
+    # membership sets keep the random draws (and so the generated graph) identical, but make each check O(1)
+    seen = set(edges); seen_undirected = {(min(x,y),max(x,y)) for x,y in edges}
+    attempts = 0
+    while len(edges) < m and attempts < m*10:
+        a,b = random.sample(nodes,2)
+        if a==b: attempts+=1; continue
+        if not directed:
+            a1,b1 = min(a,b), max(a,b)
+            if (a1,b1) not in seen_undirected:
+                edges.append((a,b)); seen_undirected.add((a1,b1))
+        else:
+            if (a,b) not in seen:
+                if (b,a) in seen:
+                    attempts+=1
+                    continue
+                edges.append((a,b)); seen.add((a,b))
+        attempts+=1
+    while len(edges) < m:
+        a,b = random.sample(nodes,2); edges.append((a,b))
+    # weights are drawn after the structure, so a seed gives the same edges weighted or not
+    weights = [random.randint(1,max_weight) for _ in edges] if max_weight>1 else None
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes)
+    if directed:
+        G.add_edges_from(edges)
+    else:
+        for a,b in edges:
+            G.add_edge(a,b, directed=False); G.add_edge(b,a, directed=False)
+    if weights:
+        for (a,b),w in zip(edges,weights):
+            G[a][b]['weight']=w
+            if not directed: G[b][a]['weight']=w
+    return G
+
+def neighbor_order_iter(G, node, order):
+    # G is anything with successors(node): an nx.DiGraph or an implicit graph (search_common.implicit)
+    neigh = list(G.successors(node))
+    if order=='ascending': return sorted(neigh)
+    if order=='descending': return sorted(neigh, reverse=True)
+    if order=='random': 
+        n=list(neigh); random.shuffle(n); return n
+    return neigh
+
+class NeighborOrderCache:
+    """Successor lists of one graph in each fixed order, as CSR (indptr + flat successor ids), built once per order.
+
+    The graph must not change while the cache is in use: the editor drops it on every edit (invalidate_neighbor_order).
+    """
+    def __init__(self, G):
+        self.G=G; self.index={n:i for i,n in enumerate(G.nodes())}; self.orders={}
+
+    def csr(self, order):
+        if order not in self.orders:
+            indptr=array('i',[0]); flat=[]
+            for n in self.index:
+                nbrs=list(self.G.successors(n))
+                if order=='ascending': nbrs.sort()
+                elif order=='descending': nbrs.sort(reverse=True)
+                flat.extend(nbrs); indptr.append(len(flat))
+            self.orders[order]=(indptr,flat)
+        return self.orders[order]
+
+    def lookup(self, order, seed=None):
+        """node -> successors in `order`; 'random' is one seeded permutation per node for the whole run."""
+        index=self.index; indptr,flat=self.csr('given' if order=='random' else order)
+        def successors(n):
+            i=index[n]; return flat[indptr[i]:indptr[i+1]]
+        if order!='random': return successors
+        return _permuted(successors,seed)
+
+def _permuted(successors, seed):
+    # each node's successors are shuffled on first expansion and kept, so re-expansions (IDDFS) see the same order
+    rng=random.Random(seed); perm={}
+    def shuffled(n):
+        nbrs=perm.get(n)
+        if nbrs is None: nbrs=perm[n]=list(successors(n)); rng.shuffle(nbrs)
+        return nbrs
+    return shuffled
+
+_neighbor_caches=weakref.WeakKeyDictionary()
+
+def neighbor_cache(G):
+    cache=_neighbor_caches.get(G)
+    if cache is None: cache=_neighbor_caches[G]=NeighborOrderCache(G)
+    return cache
+
+def invalidate_neighbor_order(G):
+    """Drops the cached neighbor orders of G; call after (or right before) editing the graph."""
+    if G is not None: _neighbor_caches.pop(G,None)
+
+def neighbor_orders(G, order='given', seed=None):
+    """Per-run successor lookup: node -> successors of node in `order`.
+
+    nx graphs are served from their NeighborOrderCache (a slice per expansion);
+    implicit graphs (only successors()) are ordered per call. 'random' is
+    reproducible with a `seed`.
+    """
+    if hasattr(G,'nodes'): return neighbor_cache(G).lookup(order,seed)
+    if order=='random': return _permuted(G.successors,seed)
+    return lambda n: neighbor_order_iter(G,n,order)
+
+class SearchRun:
+    """Live state of a running search, shared between an event stream and its consumer."""
+    __slots__=('visited','frontier','parent','opened','path','store')
+    def __init__(self): self.visited=set(); self.frontier=[]; self.parent={}; self.opened=0; self.path=None; self.store=None
+    def use_store(self, store):
+        # visited/parent come from a fresh store (search_common.stores); close() releases it
+        self.store=new_store(store); self.visited=self.store.visited; self.parent=self.store.parent; return self.visited,self.parent
+    def close(self):
+        if self.store is not None: self.store.close(); self.store=None
+
+class LiveState:
+    """A snapshot that reads the live SearchRun instead of copying it (turbo mode renders one state per frame).
+
+    Valid only until the generator advances; supports the reads the GUIs do (get, [], in).
+    """
+    __slots__=('run','action','current','key','extra')
+    def __init__(self, run, act, node, key, extra=None): self.run=run; self.action=act; self.current=node; self.key=key; self.extra=extra
+    def get(self, k, default=None):
+        if self.extra and k in self.extra: v=self.extra[k]; return v() if callable(v) else v
+        if k=='action': return self.action
+        if k=='current': return None if self.action in ('found','not_found') else self.current
+        if k=='visited': return self.run.visited
+        if k=='parent': return self.run.parent
+        if k=='opened': return self.run.opened
+        if k=='path': return self.run.path
+        if k==self.key and self.action not in ('found','not_found'):
+            return [n for n,_ in self.run.frontier] if k=='stack' else self.run.frontier
+        return default
+    def __getitem__(self, k):
+        v=self.get(k)
+        if v is None: raise KeyError(k)
+        return v
+    def __contains__(self, k): return self.get(k) is not None
+
+def _snapshot(run, act, node, key, live=False):
+    # the generator closes the run's store once the search ends, so the final state is always a copy
+    if live and act not in ('found','not_found'): return LiveState(run,act,node,key)
+    if act=='found': return {'action':'found','path':run.path,'visited':run.visited.copy(),'opened':run.opened,'parent':run.parent.copy()}
+    if act=='not_found': return {'action':'not_found','visited':run.visited.copy(),'opened':run.opened,'parent':run.parent.copy()}
+    frontier=[n for n,_ in run.frontier] if key=='stack' else list(run.frontier)
+    return {'action':act,'current':node,'visited':run.visited.copy(),key:frontier,'parent':run.parent.copy(),'opened':run.opened}
+
+def _path_to(parent, node):
+    path=[]; cur=node
+    while cur is not None: path.append(cur); cur=parent.get(cur)
+    path.reverse(); return path
+
+DFS_ACTIONS=('init','visit','push','skip','pop','found','not_found')
+BFS_ACTIONS=('init','visit','enqueue','skip','found','not_found')
+
+def dfs_events(G, start, goal, neighbor_order='given', tracer=None, run=None, store=None, seed=None):
+    """Yields (action, node) pairs of a DFS run; the live state is kept in `run`.
+
+    `store` is an optional factory of compact visited/parent storage (search_common.stores), owned
+    by `run` (run.close() releases it; the generators below do so when the search ends);
+    `seed` fixes the 'random' neighbor order (see neighbor_orders).
+    """
+    tr=tracer; run=run if run is not None else SearchRun(); nbrs=neighbor_orders(G,neighbor_order,seed)
+    visited,parent=run.use_store(store); parent[start]=None
+    stack=run.frontier=[(start, iter(nbrs(start)))]; run.opened=0
+    yield 'init',start
+    while stack:
+        node,children=stack[-1]
+        if node not in visited:
+            visited.add(node); run.opened+=1
+            if tr: tr.expand(len(stack))
+            yield 'visit',node
+            if node==goal: run.path=_path_to(parent,node); yield 'found',node; return
+        try:
+            nb=next(children)
+        except StopIteration:
+            stack.pop(); yield 'pop',node; continue
+        if tr: tr.relax()
+        if nb not in visited:
+            parent[nb]=node; stack.append((nb, iter(nbrs(nb)))); yield 'push',nb
+        else: yield 'skip',nb
+    yield 'not_found',None
+
+def bfs_events(G, start, goal, neighbor_order='given', tracer=None, run=None, store=None, seed=None):
+    """Yields (action, node) pairs of a BFS run; the live state is kept in `run` (see dfs_events for `store`, `seed`)."""
+    tr=tracer; run=run if run is not None else SearchRun(); nbrs=neighbor_orders(G,neighbor_order,seed)
+    visited,parent=run.use_store(store); visited.add(start); parent[start]=None
+    queue=run.frontier=deque([start]); run.opened=1
+    yield 'init',start
+    while queue:
+        node=queue.popleft()
+        if tr: tr.expand(len(queue))
+        yield 'visit',node
+        if node==goal: run.path=_path_to(parent,node); yield 'found',node; return
+        for nb in nbrs(node):
+            if tr: tr.relax()
+            if nb not in visited:
+                visited.add(nb); parent[nb]=node; queue.append(nb); run.opened+=1; yield 'enqueue',nb
+            else: yield 'skip',nb
+    yield 'not_found',None
+
+def dfs_generator(G, start, goal, neighbor_order='given', tracer=None, store=None, live=False, seed=None):
+    run=SearchRun()
+    try:
+        for act,node in dfs_events(G,start,goal,neighbor_order,tracer,run,store,seed):
+            yield _snapshot(run,act,node,'stack',live)
+    finally: run.close()
+
+def bfs_generator(G, start, goal, neighbor_order='given', tracer=None, store=None, live=False, seed=None):
+    run=SearchRun()
+    try:
+        for act,node in bfs_events(G,start,goal,neighbor_order,tracer,run,store,seed):
+            yield _snapshot(run,act,node,'queue',live)
+    finally: run.close()
+
+# --- multi-source / multi-goal traversal ---
+
+def multi_bfs_events(G, starts, goals=(), neighbor_order='given', tracer=None, run=None, store=None, seed=None):
+    """BFS from several starts at once (BFS_ACTIONS events); stops at the first goal reached, i.e. the nearest one."""
+    tr=tracer; run=run if run is not None else SearchRun(); goals=set(goals); nbrs=neighbor_orders(G,neighbor_order,seed)
+    starts=list(dict.fromkeys(starts)); visited,parent=run.use_store(store)
+    for s in starts: visited.add(s); parent[s]=None
+    queue=run.frontier=deque(starts); run.opened=len(starts)
+    for s in starts: yield 'init',s
+    while queue:
+        node=queue.popleft()
+        if tr: tr.expand(len(queue))
+        yield 'visit',node
+        if node in goals: run.path=_path_to(parent,node); yield 'found',node; return
+        for nb in nbrs(node):
+            if tr: tr.relax()
+            if nb not in visited:
+                visited.add(nb); parent[nb]=node; queue.append(nb); run.opened+=1; yield 'enqueue',nb
+            else: yield 'skip',nb
+    yield 'not_found',None
+
+def multi_bfs_generator(G, starts, goals=(), neighbor_order='given', tracer=None, store=None, live=False, seed=None):
+    run=SearchRun()
+    try:
+        for act,node in multi_bfs_events(G,starts,goals,neighbor_order,tracer,run,store,seed):
+            yield _snapshot(run,act,node,'queue',live)
+    finally: run.close()
+
+def graph_csr(G, neighbor_order='given', seed=None):
+    """Successor lists as flat arrays: (nodes, index, indptr, indices) with node ids replaced by positions.
+
+    'random' order is shuffled once per node here (with `seed`), as in the step-by-step generators.
+    """
+    nodes=list(G.nodes()); index={n:i for i,n in enumerate(nodes)}; indptr=array('i',[0]); indices=array('i')
+    rng=random.Random(seed)
+    for n in nodes:
+        nbrs=list(G.successors(n))
+        if neighbor_order=='ascending': nbrs.sort()
+        elif neighbor_order=='descending': nbrs.sort(reverse=True)
+        elif neighbor_order=='random': rng.shuffle(nbrs)
+        indices.extend(index[v] for v in nbrs); indptr.append(len(indices))
+    return nodes,index,indptr,indices
+
+def bfs_arrays(indptr, indices, sources, goals=None, first_goal=False):
+    """One linear BFS pass over CSR arrays from all `sources` (positions) together.
+
+    Returns (dist, parent, origin, reached): per-position int arrays with -1 for
+    unreached/none, where origin is the source each node was reached from, and
+    the goal positions in the order they were reached. With `first_goal` the
+    pass stops at the nearest goal.
+    """
+    n=len(indptr)-1; dist=array('i',[-1])*n; parent=array('i',[-1])*n; origin=array('i',[-1])*n
+    goal_set=set(goals) if goals else None; reached=[]; queue=deque()
+    for s in sources:
+        if dist[s]<0: dist[s]=0; origin[s]=s; queue.append(s)
+    while queue:
+        u=queue.popleft()
+        if goal_set is not None and u in goal_set:
+            reached.append(u)
+            if first_goal or len(reached)==len(goal_set): break
+        du=dist[u]+1; ou=origin[u]
+        for i in range(indptr[u],indptr[u+1]):
+            v=indices[i]
+            if dist[v]<0: dist[v]=du; parent[v]=u; origin[v]=ou; queue.append(v)
+    return dist,parent,origin,reached
+
+class BFSTree(namedtuple('BFSTree','nodes index dist parent origin reached')):
+    """Result of bfs_tree; arrays are indexed by position in `nodes`, goals in `reached` are node ids."""
+    __slots__=()
+    def distance(self, node):
+        d=self.dist[self.index[node]]; return None if d<0 else d
+    def path(self, node):
+        i=self.index[node]
+        if self.dist[i]<0: return None
+        path=[]
+        while i>=0: path.append(self.nodes[i]); i=self.parent[i]
+        path.reverse(); return path
+    def reached_nodes(self):
+        return [n for n,d in zip(self.nodes,self.dist) if d>=0]
+
+def bfs_tree(G, sources, goals=None, first_goal=False, neighbor_order='given', csr=None):
+    """Distances/parents from the nearest of `sources` to every node (or until the first/all `goals`)."""
+    nodes,index,indptr,indices=csr or graph_csr(G,neighbor_order)
+    dist,parent,origin,reached=bfs_arrays(indptr,indices,[index[s] for s in sources],[index[g] for g in goals] if goals else None,first_goal)
+    return BFSTree(nodes,index,dist,parent,origin,[nodes[i] for i in reached])
+
+_worker_csr=None
+
+def _init_bfs_worker(indptr, indices):
+    global _worker_csr
+    _worker_csr=(indptr,indices)
+
+def _bfs_rows(sources):
+    indptr,indices=_worker_csr
+    return [bfs_arrays(indptr,indices,[s])[0].tobytes() for s in sources]
+
+def batch_bfs(G, sources, processes=None, neighbor_order='given', chunk=16):
+    """Single-source BFS distances from each of `sources`, spread over worker processes.
+
+    Returns (nodes, rows) where rows[k] is an array('i') of distances (-1 =
+    unreachable) from sources[k], indexed by position in `nodes`. The CSR
+    arrays are sent to each worker once; tasks carry only source positions.
+    """
+    nodes,index,indptr,indices=graph_csr(G,neighbor_order)
+    pos=[index[s] for s in sources]; workers=processes or os.cpu_count() or 1
+    if workers<=1 or len(pos)<=chunk:
+        return nodes,[bfs_arrays(indptr,indices,[s])[0] for s in pos]
+    from concurrent.futures import ProcessPoolExecutor
+    parts=[pos[i:i+chunk] for i in range(0,len(pos),chunk)]; rows=[]
+    with ProcessPoolExecutor(workers,initializer=_init_bfs_worker,initargs=(indptr,indices)) as pool:
+        for part in pool.map(_bfs_rows,parts):
+            rows.extend(array('i',raw) for raw in part)
+    return nodes,rows
@@ -0,0 +1,53 @@
+"""Headless recording and replay of DFS/BFS runs as binary traces."""
+
+import copy, os, sys, time
+from collections import deque
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from search_common.trace_format import SearchTrace, TracePlayer
+from search_core import SearchRun, DFS_ACTIONS, BFS_ACTIONS, dfs_events, bfs_events, _snapshot, _path_to
+
+def record_graph_search(G, start, goal, algo='DFS', neighbor_order='given', tracer=None):
+    """Runs the search without any UI and returns its SearchTrace."""
+    events, actions = (dfs_events, DFS_ACTIONS) if algo=='DFS' else (bfs_events, BFS_ACTIONS)
+    trace=SearchTrace(actions, {'algo':algo,'start':start,'goal':goal,'order':neighbor_order,'nodes':G.number_of_nodes(),'edges':G.number_of_edges()})
+    ops=trace.ops; nodes=trace.nodes; codes=trace.codes; t=time.perf_counter()
+    for act,node in events(G,start,goal,neighbor_order,tracer):
+        ops.append(codes[act]); nodes.append(-1 if node is None else node)
+    trace.meta['record_seconds']=round(time.perf_counter()-t,6)
+    return trace
+
+class GraphReplayState:
+    """Rebuilds the generator state (visited, frontier, parent, opened) from trace events."""
+    def __init__(self, algo):
+        self.algo=algo; self.key='stack' if algo=='DFS' else 'queue'; self.run=SearchRun(); self.expanding=None; self.last=(None,None)
+    def apply(self, act, node):
+        run=self.run; self.last=(act,node)
+        if act=='init':
+            run.parent={node:None}; run.path=None
+            if self.algo=='DFS': run.visited=set(); run.frontier=[(node,None)]; run.opened=0
+            else: run.visited={node}; run.frontier=deque([node]); run.opened=1
+        elif act=='visit':
+            if self.algo=='DFS': run.visited.add(node); run.opened+=1
+            else: run.frontier.popleft(); self.expanding=node
+        elif act=='push': run.parent[node]=run.frontier[-1][0]; run.frontier.append((node,None))
+        elif act=='enqueue': run.visited.add(node); run.parent[node]=self.expanding; run.frontier.append(node); run.opened+=1
+        elif act=='pop': run.frontier.pop()
+        elif act=='found': run.path=_path_to(run.parent,node)
+    def clone(self):
+        c=GraphReplayState(self.algo); c.run=copy.deepcopy(self.run); c.expanding=self.expanding; c.last=self.last; return c
+    def snapshot(self):
+        act,node=self.last
+        return _snapshot(self.run,act,node,self.key)
+
+def graph_player(trace, checkpoint_every=1024):
+    algo=trace.meta.get('algo','DFS')
+    return TracePlayer(trace, lambda: GraphReplayState(algo), checkpoint_every)
+
+def replay_states(player):
+    """Generator-compatible view of a trace: yields the same dicts as dfs/bfs_generator.
+
+    Playback continues from the player's current position, so seeking the
+    player while replaying makes the stream jump there.
+    """
+    while not player.finished:
+        yield player.step().snapshot()
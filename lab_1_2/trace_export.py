@@ -0,0 +1,73 @@
+"""Offscreen GIF/MP4 export of DFS/BFS traces (Agg backend, no Tk).
+
+Frames use the editor's colours (path, visited, frontier, start/goal marks);
+rendering is split across processes by search_common.animation_export.
+"""
+
+import os, sys
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from search_common.animation_export import export_trace
+from search_trace import graph_player
+
+def _rgb(hex_color): return np.array([int(hex_color[i:i+2],16) for i in (1,3,5)],dtype=np.float64)/255
+
+IDLE, FRONTIER, VISITED, PATH = _rgb('#dddddd'), _rgb('#fff79a'), _rgb('#bbbbbb'), _rgb('#7be57b')
+START, GOAL = _rgb('#ff9999'), _rgb('#9999ff')
+
+def _disc(radius):
+    r=max(0,int(round(radius))); dy,dx=np.mgrid[-r:r+1,-r:r+1]; inside=dx*dx+dy*dy<=r*r+r
+    return dy[inside],dx[inside]
+
+class GraphFrames:
+    """Renders trace events of a graph search into RGB frames without Tk.
+
+    Edges and axes are drawn once with Agg; per frame only the caption is drawn
+    and the nodes are stamped into the pixel buffer as discs (a scatter of
+    thousands of markers costs ~0.1 s per Agg draw).
+    """
+    def __init__(self, trace, pos, edges, size=(800,800), dpi=100):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import LineCollection
+        # frames only move forward, so the player needs no checkpoints for seeking back
+        self.player=graph_player(trace,checkpoint_every=len(trace)+1); self.key='stack' if trace.meta.get('algo','DFS')=='DFS' else 'queue'
+        self.nodes=list(pos); self.index={n:i for i,n in enumerate(self.nodes)}; n=len(self.nodes)
+        xy=np.array([pos[v] for v in self.nodes],dtype=float).reshape(-1,2)
+        fig=Figure(figsize=(size[0]/dpi,size[1]/dpi),dpi=dpi); self.canvas=FigureCanvasAgg(fig); self.fig=fig
+        ax=fig.add_axes([0,0.04,1,0.96]); ax.set_axis_off()
+        ax.add_collection(LineCollection([(pos[u],pos[v]) for u,v in edges if u in pos and v in pos],colors='#888888',linewidths=0.6 if n>200 else 1.0,alpha=1.0 if len(edges)<=500 else 0.3,zorder=1))
+        if n: lo=xy.min(0); hi=xy.max(0); pad=(hi-lo).max()*0.05 or 1.0; ax.set_xlim(lo[0]-pad,hi[0]+pad); ax.set_ylim(lo[1]-pad,hi[1]+pad)
+        self.caption=fig.text(0.01,0.01,'',fontsize=9); self.algo=trace.meta.get('algo','DFS'); self.events=len(trace)
+        self.canvas.draw(); self.background=self.canvas.copy_from_bbox(fig.bbox)
+        h,w=self.canvas.get_width_height()[::-1]; self.shape=(h,w)
+        px=ax.transData.transform(xy) if n else np.zeros((0,2)); self.cols=np.round(px[:,0]).astype(np.intp); self.rows=np.round(h-1-px[:,1]).astype(np.intp)
+        # node radius in pixels: the editor's 180 pt^2 markers, shrinking with the node count so large graphs stay readable
+        base=np.sqrt(180 if n<=200 else max(2.0,180*200/n))*dpi/72/2
+        self.discs={k:_disc(base*f) for k,f in (('node',1.0),('path',1.35),('mark',1.5))}
+        self.marks=[(self.index.get(trace.meta.get('start')),START),(self.index.get(trace.meta.get('goal')),GOAL)]
+    def _stamp(self, frame, idx, color, disc):
+        if len(idx)==0: return
+        dy,dx=self.discs[disc]; h,w=self.shape
+        r=np.clip(self.rows[idx][:,None]+dy,0,h-1); c=np.clip(self.cols[idx][:,None]+dx,0,w-1)
+        frame[r,c]=np.asarray(color)[...,None,:] if np.ndim(color)==2 else color
+    def render(self, i):
+        st=self.player.seek(i); run=st.run; act,_=st.last; index=self.index
+        colors=np.tile(np.round(IDLE*255).astype(np.uint8),(len(self.nodes),1))
+        def paint(nodes, color):
+            idx=[index[v] for v in nodes if v in index]
+            if idx: colors[idx]=np.round(color*255)
+        if act not in ('found','not_found'): paint([v for v,_ in run.frontier] if self.key=='stack' else run.frontier,FRONTIER)
+        paint(run.visited,VISITED)
+        self.caption.set_text(f"{self.algo}  event {i+1}/{self.events}  {act}  visited={len(run.visited)}")
+        self.canvas.restore_region(self.background); self.fig.draw_artist(self.caption)
+        frame=np.asarray(self.canvas.buffer_rgba())[...,:3].copy()
+        self._stamp(frame,np.arange(len(self.nodes)),colors,'node')
+        if run.path: self._stamp(frame,np.array([index[v] for v in run.path if v in index],dtype=np.intp),np.round(PATH*255).astype(np.uint8),'path')
+        for k,color in self.marks:
+            if k is not None: self._stamp(frame,np.array([k]),np.round(color*255).astype(np.uint8),'mark')
+        return frame
+
+def export_graph_trace(trace, G, pos, path, max_frames=300, fps=20, size=(800,800), processes=None):
+    """Writes the trace as a GIF/MP4 animation; returns the number of frames."""
+    return export_trace(trace, GraphFrames, path, {'pos':{n:tuple(pos[n]) for n in G.nodes()},'edges':list(G.edges()),'size':size}, max_frames, fps, processes=processes, colors=[np.round(c*255) for c in (FRONTIER,VISITED,PATH,START,GOAL)])
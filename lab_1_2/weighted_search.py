@@ -0,0 +1,94 @@
+"""Uniform-cost search (Dijkstra) over edge weights, with a choice of priority queue.
+
+Edges carry a 'weight' attribute (missing = 1, so unweighted graphs behave
+like BFS by cost); graphs without an adjacency (implicit graphs) have unit
+weights. Weights must be non-negative; the radix heap also needs integers.
+
+As in bounded_search there is a step generator yielding the same snapshot
+dicts as bfs_generator (key 'queue', plus 'cost' in the final state) and a
+plain function that only returns the result.
+"""
+
+from search_core import LiveState, SearchRun, neighbor_orders, _path_to, _snapshot
+from priority_queues import QUEUES
+
+def edge_weights(G):
+    """(u, v) -> weight of the edge u->v."""
+    adj=getattr(G,'adj',None)
+    if adj is None: return lambda u,v: 1
+    return lambda u,v: adj[u][v].get('weight',1)
+
+def _new_queue(queue):
+    if queue not in QUEUES: raise ValueError(f"unknown queue {queue!r} (one of {', '.join(QUEUES)})")
+    return QUEUES[queue]()
+
+# --- event stream (for the editor and tracing) ---
+
+def ucs_events(G, start, goal, neighbor_order='given', queue='binary', tracer=None, run=None, dist=None, seed=None):
+    """(action, node) events of uniform-cost search: a node is 'visit'ed when settled at its final cost.
+
+    'enqueue' means a cheaper way to the node was found, 'skip' a relaxation that
+    did not improve it. Costs are written into `dist` (node -> best known cost).
+    """
+    tr=tracer; run=run if run is not None else SearchRun(); dist=dist if dist is not None else {}
+    nbrs=neighbor_orders(G,neighbor_order,seed); weight=edge_weights(G); pq=_new_queue(queue)
+    visited=run.visited=set(); parent=run.parent={start:None}; run.frontier=pq
+    dist[start]=0; pq.push(0,start); run.opened=1
+    yield 'init',start
+    while pq:
+        d,node=pq.pop()
+        if node in visited or d>dist[node]: continue
+        visited.add(node)
+        if tr: tr.expand(len(pq))
+        yield 'visit',node
+        if node==goal: run.path=_path_to(parent,node); yield 'found',node; return
+        for nb in nbrs(node):
+            if tr: tr.relax()
+            nd=d+weight(node,nb)
+            if nb not in visited and nd<dist.get(nb,nd+1):
+                if nb not in dist: run.opened+=1
+                dist[nb]=nd; parent[nb]=node; pq.push(nd,nb); yield 'enqueue',nb
+            else: yield 'skip',nb
+    run.path=None; yield 'not_found',None
+
+def ucs_generator(G, start, goal, neighbor_order='given', queue='binary', tracer=None, live=False, seed=None):
+    run=SearchRun(); dist={}
+    for act,node in ucs_events(G,start,goal,neighbor_order,queue,tracer,run,dist,seed):
+        if act not in ('found','not_found'): yield _snapshot(run,act,node,'queue',live); continue
+        cost=dist.get(goal) if act=='found' else None
+        if live: yield LiveState(run,act,node,'queue',{'cost':cost}); continue
+        state=_snapshot(run,act,node,'queue'); state['cost']=cost; yield state
+
+# --- fast paths ---
+
+def _dijkstra(G, sources, goals, queue):
+    # settles nodes in cost order until every node of `goals` is settled (None: all reachable); returns dist, parent, settled count
+    adj=G.adj; pq=_new_queue(queue); push=pq.push; pop=pq.pop
+    dist={}; parent={}; done=set(); left=set(goals) if goals is not None else None
+    for s in sources: dist[s]=0; parent[s]=None; push(0,s)
+    while pq:
+        d,u=pop()
+        if u in done or d>dist[u]: continue
+        done.add(u)
+        if left is not None and u in left:
+            left.discard(u)
+            if not left: break
+        for v,data in adj[u].items():
+            nd=d+data.get('weight',1)
+            if nd<dist.get(v,nd+1): dist[v]=nd; parent[v]=u; push(nd,v)
+    return dist,parent,len(done)
+
+def uniform_cost_search(G, start, goal, queue='binary'):
+    """Cheapest path from start to goal: (path or None, cost or None, settled nodes)."""
+    dist,parent,settled=_dijkstra(G,[start],(goal,),queue)
+    if goal not in dist: return None,None,settled
+    return _path_to(parent,goal),dist[goal],settled
+
+def ucs_distances(G, sources, queue='binary', targets=None):
+    """Cost from the nearest of `sources` to every reachable node.
+
+    With `targets` only their costs are returned (unreachable ones are left
+    out) and the search stops as soon as all of them are settled.
+    """
+    dist=_dijkstra(G,list(sources),targets,queue)[0]
+    return dist if targets is None else {t:dist[t] for t in targets if t in dist}
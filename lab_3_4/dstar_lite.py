@@ -0,0 +1,103 @@
+import heapq
+
+from maze_search import DEFAULT_OPERATOR, OPERATORS, as_space
+
+INF = float('inf')
+
+# D* Lite (Koenig & Likhachev): пошук іде від цілі до старту й зберігає стан (g, rhs, черга)
+# між запитами. Після зміни клітинки перераховуються лише вершини, чия відстань до цілі
+# справді змінилась, тож перепланування після одного редагування зазвичай займає мало кроків.
+# Старт може рухатися (km), зміна цілі — це новий планувальник.
+
+
+class DStarLite:
+    def __init__(self, grid, start_node, goal_node, operator=DEFAULT_OPERATOR):
+        self.space = as_space(grid, operator)
+        self.operator = operator
+        self.directions = OPERATORS.get(operator, OPERATORS[DEFAULT_OPERATOR])
+        self._cardinal = all(dr == 0 or dc == 0 for dr, dc in self.directions)
+        self.start, self.goal = start_node, goal_node
+        self.g, self.rhs = {}, {goal_node: 0}
+        self.km = 0
+        self._queued = {}       # вершина -> поточний ключ (записи в купі з іншим ключем застарілі)
+        self._heap = []
+        self._push(goal_node)
+        self.expanded = 0       # розкриття під час останнього plan()
+
+    def _h(self, cell):
+        dr, dc = abs(cell[0] - self.start[0]), abs(cell[1] - self.start[1])
+        return dr + dc if self._cardinal else max(dr, dc)
+
+    def _key(self, cell):
+        m = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return (m + self._h(cell) + self.km, m)
+
+    def _push(self, cell):
+        key = self._key(cell)
+        self._queued[cell] = key
+        heapq.heappush(self._heap, (key, cell))
+
+    def _update_vertex(self, cell):
+        if cell != self.goal:
+            g = self.g
+            if self.space.is_open(cell):
+                self.rhs[cell] = min((g.get(n, INF) + 1 for n in self.space.successors(cell)), default=INF)
+            else:
+                self.rhs[cell] = INF
+        self._queued.pop(cell, None)
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            self._push(cell)
+
+    def _top_key(self):
+        heap, queued = self._heap, self._queued
+        while heap and queued.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else (INF, INF)
+
+    def plan(self):
+        """Доводить стан до узгодженого для поточного старту; повертає (шлях або None, розкриття)."""
+        self.expanded = 0
+        g, rhs, start = self.g, self.rhs, self.start
+        successors = self.space.successors
+        while self._top_key() < self._key(start) or rhs.get(start, INF) != g.get(start, INF):
+            k_old, u = heapq.heappop(self._heap)
+            del self._queued[u]
+            self.expanded += 1
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u)
+            elif g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+                for n in successors(u):
+                    self._update_vertex(n)
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+                for n in successors(u):
+                    self._update_vertex(n)
+        return self.path(), self.expanded
+
+    def path(self):
+        if self.g.get(self.start, INF) == INF:
+            return None
+        g = self.g
+        path, cell = [self.start], self.start
+        while cell != self.goal:
+            cell = min(self.space.successors(cell), key=lambda n: g.get(n, INF))
+            path.append(cell)
+        return path
+
+    def move_start(self, start_node):
+        # Старт змістився: km зберігає узгодженість ключів без перебудови черги
+        self.km += self._h(start_node)
+        self.start = start_node
+
+    def update_cell(self, cell):
+        """Клітинку зробили стіною чи проходом: змінились ребра між нею та її сусідами."""
+        r, c = cell
+        rows, cols = self.space.rows, self.space.cols
+        self._update_vertex(cell)
+        for dr, dc in self.directions:
+            n = (r + dr, c + dc)
+            if 0 <= n[0] < rows and 0 <= n[1] < cols and self.space.is_open(n):
+                self._update_vertex(n)
@@ -0,0 +1,186 @@
+"""Пакетні експерименти хвильового пошуку без GUI.
+
+Перебирає розмір лабіринту, щільність стін, оператор та алгоритм на багатьох
+лабіринтах із зерном, виконує прогони у пулі процесів і зводить статистику:
+частка розв'язних, частка знайдених шляхів, середні цикли, відношення довжини
+шляху до найкоротшої (BFS) і пропускна здатність. Сирі прогони й зведення
+пишуться у CSV (роздільник ';'), за наявності pyarrow — також у Parquet.
+
+    python lab_3_4/maze_experiments.py --sizes 20 50 100 --densities 0.2 0.3 0.4 --seeds 50 --out runs.csv
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import maze_search
+from maze_search import OPERATORS, WALL
+from maze_index import MazeIndex
+from dstar_lite import DStarLite
+
+RUN_FIELDS = ['rows', 'cols', 'density', 'operator', 'algorithm', 'seed', 'solvable', 'found',
+              'cycles', 'path_len', 'optimal_len', 'ratio', 'seconds']
+SUMMARY_FIELDS = ['rows', 'cols', 'density', 'operator', 'algorithm', 'runs', 'solvable_rate', 'found_rate',
+                  'mean_cycles', 'mean_ratio', 'mean_ms', 'runs_per_sec']
+
+
+def _wave(grid, start, goal, operator):
+    path, cycles, _, _ = maze_search.bidirectional_wave_search(grid, start, goal, operator)
+    return path, cycles
+
+
+def _index(grid, start, goal, operator):
+    # Разом із побудовою індексу: окремий лабіринт на кожен прогін
+    return MazeIndex(grid, operator).shortest_path(start, goal)
+
+
+def _dstar(grid, start, goal, operator):
+    return DStarLite(grid, start, goal, operator).plan()
+
+
+ALGORITHMS = {'wave': _wave, 'index': _index, 'dstar': _dstar}
+
+
+def shortest_length(grid, start, goal, operator):
+    # Еталон для відношення довжини шляху: звичайний BFS
+    if grid[start[0]][start[1]] == WALL:
+        return None
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell == goal:
+            return dist[cell]
+        for n in maze_search.grid_neighbors(grid, cell[0], cell[1], operator):
+            if n not in dist:
+                dist[n] = dist[cell] + 1
+                queue.append(n)
+    return None
+
+
+def run_case(case):
+    # Один лабіринт (rows, cols, density, seed) і всі оператори та алгоритми на ньому
+    rows, cols, density, seed, operators, algorithms = case
+    grid = maze_search.generate_grid(rows, cols, density, random.Random(seed))
+    start, goal = (0, 0), (rows - 1, cols - 1)
+    records = []
+    for operator in operators:
+        optimal = shortest_length(grid, start, goal, operator)
+        for name in algorithms:
+            t = time.perf_counter()
+            path, cycles = ALGORITHMS[name](grid, start, goal, operator)
+            seconds = time.perf_counter() - t
+            path_len = len(path) - 1 if path else None
+            records.append({'rows': rows, 'cols': cols, 'density': density, 'operator': operator,
+                            'algorithm': name, 'seed': seed, 'solvable': optimal is not None,
+                            'found': path is not None, 'cycles': cycles, 'path_len': path_len,
+                            'optimal_len': optimal,
+                            'ratio': path_len / optimal if path and optimal else (1.0 if path else None),
+                            'seconds': seconds})
+    return records
+
+
+def run_sweep(sizes, densities, operators, algorithms, seeds, processes=None, base_seed=0):
+    """Усі прогони перебору; лабіринти розподіляються по пулу процесів (на одному ядрі — послідовно)."""
+    cases = [(rows, cols, density, base_seed + k, operators, algorithms)
+             for rows, cols in sizes for density in densities for k in range(seeds)]
+    workers = processes or os.cpu_count() or 1
+    records = []
+    if workers <= 1:
+        for case in cases:
+            records.extend(run_case(case))
+        return records
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as pool:
+        for part in pool.map(run_case, cases, chunksize=max(1, len(cases) // (4 * workers))):
+            records.extend(part)
+    return records
+
+
+def summarize(records):
+    groups = {}
+    for rec in records:
+        key = (rec['rows'], rec['cols'], rec['density'], rec['operator'], rec['algorithm'])
+        groups.setdefault(key, []).append(rec)
+    summary = []
+    for (rows, cols, density, operator, algorithm), recs in groups.items():
+        n = len(recs)
+        ratios = [r['ratio'] for r in recs if r['ratio'] is not None]
+        total = sum(r['seconds'] for r in recs)
+        summary.append({'rows': rows, 'cols': cols, 'density': density, 'operator': operator,
+                        'algorithm': algorithm, 'runs': n,
+                        'solvable_rate': sum(r['solvable'] for r in recs) / n,
+                        'found_rate': sum(r['found'] for r in recs) / n,
+                        'mean_cycles': sum(r['cycles'] for r in recs) / n,
+                        'mean_ratio': sum(ratios) / len(ratios) if ratios else None,
+                        'mean_ms': 1000 * total / n,
+                        'runs_per_sec': n / total if total else None})
+    return summary
+
+
+def write_csv(path, records, fields):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields, delimiter=';')
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def write_parquet(path, records, fields):
+    # Колонковий формат для pandas/polars/duckdb; pyarrow — необов'язкова залежність
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Для Parquet потрібен pyarrow (pip install pyarrow); CSV записано.")
+    table = pa.table({name: [rec[name] for rec in records] for name in fields})
+    pq.write_table(table, path)
+
+
+def print_summary(summary):
+    print(f"{'size':>9} {'dens':>5} {'operator':<24} {'algo':<6} {'runs':>5} {'solv':>5} {'found':>6} "
+          f"{'cycles':>10} {'ratio':>6} {'ms':>9} {'runs/s':>8}")
+    for s in summary:
+        ratio = f"{s['mean_ratio']:.3f}" if s['mean_ratio'] is not None else '-'
+        rate = f"{s['runs_per_sec']:.1f}" if s['runs_per_sec'] else '-'
+        print(f"{s['rows']:>4}x{s['cols']:<4} {s['density']:>5.2f} {s['operator']:<24} {s['algorithm']:<6} "
+              f"{s['runs']:>5} {s['solvable_rate']:>5.2f} {s['found_rate']:>6.2f} {s['mean_cycles']:>10.1f} "
+              f"{ratio:>6} {s['mean_ms']:>9.2f} {rate:>8}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--sizes', type=int, nargs='+', default=[20, 50], help='сторони квадратних лабіринтів')
+    ap.add_argument('--densities', type=float, nargs='+', default=[0.2, 0.3, 0.4])
+    ap.add_argument('--operators', nargs='+', default=list(OPERATORS), choices=list(OPERATORS))
+    ap.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    ap.add_argument('--seeds', type=int, default=20, help='лабіринтів на кожну комбінацію розміру та щільності')
+    ap.add_argument('--base-seed', type=int, default=0)
+    ap.add_argument('--processes', type=int, default=None)
+    ap.add_argument('--out', default='maze_runs.csv', help='сирі прогони (CSV)')
+    ap.add_argument('--summary', default=None, help='зведення (CSV), за замовчуванням <out>_summary.csv')
+    ap.add_argument('--parquet', action='store_true', help='також записати .parquet поруч із CSV')
+    args = ap.parse_args()
+
+    t = time.perf_counter()
+    records = run_sweep([(n, n) for n in args.sizes], args.densities, args.operators, args.algorithms,
+                        args.seeds, args.processes, args.base_seed)
+    elapsed = time.perf_counter() - t
+    summary = summarize(records)
+    print_summary(summary)
+    print(f"\n{len(records)} прогонів за {elapsed:.2f} сек ({len(records) / elapsed:.1f} прогонів/сек)")
+
+    summary_path = args.summary or os.path.splitext(args.out)[0] + '_summary.csv'
+    write_csv(args.out, records, RUN_FIELDS)
+    write_csv(summary_path, summary, SUMMARY_FIELDS)
+    if args.parquet:
+        write_parquet(os.path.splitext(args.out)[0] + '.parquet', records, RUN_FIELDS)
+        write_parquet(os.path.splitext(summary_path)[0] + '.parquet', summary, SUMMARY_FIELDS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Експорт траси хвильового пошуку в GIF/MP4 без Tk.
+
+Кадр — масив NumPy «клітинка = піксель» у кольорах застосунку, який
+оновлюється подіями траси інкрементно: між двома кадрами перефарбовуються
+лише щойно відкриті клітинки. Кадри рендеряться паралельно в процесах
+(search_common.animation_export) і збільшуються до ``scale`` пікселів на клітинку.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from search_common.animation_export import export_trace
+from maze_search import WALL
+from maze_trace import WaveReplayState
+
+MAX_EXPORT_CELLS = 4_000_000   # більші лабіринти дають кадри, які не має сенсу кодувати в GIF
+FRAME_SIDE = 800               # бажаний розмір кадру в пікселях (для вибору масштабу)
+
+# Кольори як у draw_labyrinth
+COLORS = {name: np.array(rgb, dtype=np.uint8) for name, rgb in {
+    'wall': (190, 190, 190), 'passage': (255, 255, 255), 'start': (0, 128, 0), 'goal': (255, 0, 0),
+    'path': (0, 0, 255), 'visited_start': (173, 216, 230), 'visited_goal': (144, 238, 144),
+    'meet': (128, 0, 128), 'highlight': (255, 255, 0)}.items()}
+
+
+def wall_mask(grid):
+    # Матриця або TiledMaze -> булевий масив стін
+    if isinstance(grid, (list, np.ndarray)):
+        return np.asarray(grid) == WALL
+    return np.array([[v == WALL for v in (row[c] for c in range(len(row)))] for row in grid], dtype=bool)
+
+
+class MazeFrames:
+    def __init__(self, trace, walls):
+        meta = trace.meta
+        self.trace = trace
+        self.start, self.goal, self.cols = tuple(meta["start"]), tuple(meta["goal"]), meta["cols"]
+        self.state = WaveReplayState(self.start, self.goal, self.cols)
+        self.position = -1
+        self.frame = np.where(walls[..., None], COLORS['wall'], COLORS['passage']).astype(np.uint8)
+
+    def _advance(self, index):
+        # Застосовує події до index включно й одразу фарбує відкриті клітинки
+        frame, state, trace = self.frame, self.state, self.trace
+        for i in range(self.position + 1, index + 1):
+            action, node = trace[i]
+            state.apply(action, node)
+            if action == 'discover_s' or action == 'discover_g':
+                cell = divmod(node, self.cols)
+                other = state.wave.visited_goal if action == 'discover_s' else state.wave.visited_start
+                frame[cell] = COLORS['meet'] if cell in other else COLORS[
+                    'visited_start' if action == 'discover_s' else 'visited_goal']
+        self.position = index
+
+    def render(self, index):
+        self._advance(index)
+        out = self.frame.copy()
+        path = self.state.wave.path()
+        if path:
+            rows, cols = zip(*path)
+            out[list(rows), list(cols)] = COLORS['path']
+        elif self.state.highlight is not None:
+            out[self.state.highlight] = COLORS['highlight']
+        out[self.start] = COLORS['start']
+        out[self.goal] = COLORS['goal']
+        return out
+
+
+def export_maze_trace(trace, grid, path, max_frames=300, fps=20, scale=None, processes=None):
+    """Записує трасу в GIF/MP4; повертає кількість кадрів."""
+    rows, cols = trace.meta["rows"], trace.meta["cols"]
+    if rows * cols > MAX_EXPORT_CELLS:
+        raise ValueError(f"Лабіринт {rows}x{cols} завеликий для анімації (до {MAX_EXPORT_CELLS} клітинок)")
+    if scale is None:
+        scale = max(1, FRAME_SIDE // max(rows, cols))
+    return export_trace(trace, MazeFrames, path, {'walls': wall_mask(grid)}, max_frames, fps, scale, processes,
+                        list(COLORS.values()))
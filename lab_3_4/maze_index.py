@@ -0,0 +1,309 @@
+import heapq
+from collections import deque
+
+from maze_search import DEFAULT_OPERATOR, OPERATORS, as_space
+
+# Попередня обробка лабіринту для одного оператора переходу:
+#   * мітки зв'язних компонент — запит між різними компонентами відхиляється за O(1);
+#   * стиснення коридорів: клітинки зі степенем 2 зливаються у зважені ребра між
+#     "точками рішення" (тупики, розгалуження), і пошук іде по значно меншому графу.
+# Обидві структури оновлюються локально при зміні однієї клітинки (update), без перебудови.
+# Ходи всіх операторів оборотні, тому граф неорієнтований.
+
+
+class MazeIndex:
+    def __init__(self, grid, operator=DEFAULT_OPERATOR):
+        self.grid, self.operator = grid, operator
+        self.space = as_space(grid, operator)
+        self.directions = OPERATORS.get(operator, OPERATORS[DEFAULT_OPERATOR])
+        # нижня межа кількості ходів для A*: Манхеттен для ходів по осях, інакше Чебишев
+        self._cardinal = all(dr == 0 or dc == 0 for dr, dc in self.directions)
+        # компоненти: клітинка -> мітка, мітки зливаються через систему неперетинних множин
+        self.label = {}
+        self._alias = []
+        # коридори: id -> (a, b, внутрішні клітинки від a до b); вага ребра = len(cells) + 1
+        self.corridors = {}
+        self.on_corridor = {}   # внутрішня клітинка -> id коридору
+        self.incident = {}      # точка рішення -> {id коридорів}
+        self.ends = {}          # (точка рішення, перший крок) -> id
+        self.nodes = set()
+        self.anchors = set()    # штучні точки рішення на замкнених коридорах без розгалужень
+        self._next_id = 0
+        self._build()
+
+    # --- побудова ---
+
+    def _open_cells(self):
+        space = self.space
+        return [(r, c) for r in range(space.rows) for c in range(space.cols) if space.is_open((r, c))]
+
+    def _build(self):
+        cells = self._open_cells()
+        for cell in cells:
+            if cell not in self.label:
+                self._flood(cell, self._new_label())
+        for cell in cells:
+            if self._is_node(cell):
+                self.nodes.add(cell)
+        for node in list(self.nodes):
+            self._trace_from(node)
+        self._anchor_cycles(cells)
+
+    def _new_label(self):
+        self._alias.append(len(self._alias))
+        return len(self._alias) - 1
+
+    def _flood(self, cell, label):
+        successors = self.space.successors
+        self.label[cell] = label
+        queue = deque([cell])
+        while queue:
+            for n in successors(queue.popleft()):
+                if self.label.get(n) != label:
+                    self.label[n] = label
+                    queue.append(n)
+
+    def _find(self, label):
+        alias = self._alias
+        while alias[label] != label:
+            alias[label] = alias[alias[label]]
+            label = alias[label]
+        return label
+
+    def _is_node(self, cell):
+        return len(self.space.successors(cell)) != 2 or cell in self.anchors
+
+    def _trace_from(self, node):
+        for first in self.space.successors(node):
+            if (node, first) not in self.ends:
+                self._trace(node, first)
+
+    def _trace(self, a, first):
+        # Йде коридором від точки рішення a через клітинки зі степенем 2 до наступної точки
+        successors = self.space.successors
+        prev, cur, cells = a, first, []
+        while cur not in self.nodes:
+            cells.append(cur)
+            n1, n2 = successors(cur)
+            prev, cur = cur, (n2 if n1 == prev else n1)
+        cid = self._next_id
+        self._next_id += 1
+        self.corridors[cid] = (a, cur, tuple(cells))
+        for cell in cells:
+            self.on_corridor[cell] = cid
+        self.ends[(a, first)] = cid
+        self.ends[(cur, cells[-1] if cells else a)] = cid
+        self.incident.setdefault(a, set()).add(cid)
+        self.incident.setdefault(cur, set()).add(cid)
+
+    def _anchor_cycles(self, cells):
+        # Кільце з клітинок степеня 2 не має точок рішення: одну з них робимо штучною
+        for cell in cells:
+            if cell not in self.nodes and cell not in self.on_corridor and self.space.is_open(cell):
+                self.anchors.add(cell)
+                self.nodes.add(cell)
+                self._trace_from(cell)
+
+    def _drop(self, cid):
+        a, b, cells = self.corridors.pop(cid)
+        for cell in cells:
+            del self.on_corridor[cell]
+        for end, first in ((a, cells[0] if cells else b), (b, cells[-1] if cells else a)):
+            self.ends.pop((end, first), None)
+            self.incident[end].discard(cid)
+        return a, b, cells
+
+    # --- інкрементне оновлення ---
+
+    def update(self, cell):
+        """Перераховує структури після того, як клітинку ``cell`` зробили стіною чи проходом."""
+        r, c = cell
+        around = [(r + dr, c + dc) for dr, dc in self.directions]
+        around = [n for n in around if 0 <= n[0] < self.space.rows and 0 <= n[1] < self.space.cols]
+        affected = [cell] + [n for n in around if self.space.is_open(n)]
+        self._update_components(cell, affected[1:])
+        self._update_corridors(affected)
+
+    def _update_components(self, cell, neighbors):
+        if self.space.is_open(cell):
+            roots = {self._find(self.label[n]) for n in neighbors}
+            root = roots.pop() if roots else self._new_label()
+            for other in roots:
+                self._alias[other] = root
+            self.label[cell] = root
+            return
+        if self.label.pop(cell, None) is None or len(neighbors) < 2:
+            return
+        self._split(neighbors)
+
+    def _split(self, seeds):
+        # Чергові BFS з кожного сусіда стертої клітинки: пошуки, що зустрілися, зливаються в групу;
+        # група, що вичерпалась, — відокремлена компонента і отримує нову мітку. Робота пропорційна
+        # меншій частині, а без розриву — відстані, на якій пошуки зустрічаються.
+        successors = self.space.successors
+        k = len(seeds)
+        group = list(range(k))
+        done = [False] * k
+
+        def find(i):
+            while group[i] != i:
+                group[i] = group[group[i]]
+                i = group[i]
+            return i
+
+        owner = {s: i for i, s in enumerate(seeds)}
+        queues = [deque([s]) for s in seeds]
+        reached = [[s] for s in seeds]
+        while True:
+            live = {}
+            for i in range(k):
+                if not done[i]:
+                    live.setdefault(find(i), []).append(i)
+            if len(live) <= 1:
+                return
+            finished = [g for g, members in live.items() if not any(queues[i] for i in members)]
+            if len(finished) == len(live):
+                finished = finished[1:]    # одна з груп зберігає стару мітку
+            for g in finished:
+                label = self._new_label()
+                for i in live[g]:
+                    done[i] = True
+                    for cell in reached[i]:
+                        self.label[cell] = label
+            if finished:
+                continue
+            for i in range(k):
+                if queues[i]:
+                    for n in successors(queues[i].popleft()):
+                        j = owner.get(n)
+                        if j is None:
+                            owner[n] = i
+                            queues[i].append(n)
+                            reached[i].append(n)
+                        elif find(j) != find(i):
+                            group[find(j)] = find(i)
+
+    def _update_corridors(self, affected):
+        seeds = set()
+        for cell in affected:
+            cids = set(self.incident.get(cell, ()))
+            if cell in self.on_corridor:
+                cids.add(self.on_corridor[cell])
+            for cid in cids:
+                if cid in self.corridors:
+                    a, b, cells = self._drop(cid)
+                    seeds.update((a, b))
+                    seeds.update(cells)
+        for cell in affected:
+            if not self.space.is_open(cell):
+                self.anchors.discard(cell)
+            if self.space.is_open(cell) and self._is_node(cell):
+                self.nodes.add(cell)
+            else:
+                self.nodes.discard(cell)
+                self.incident.pop(cell, None)
+        for cell in list(seeds) + affected:
+            if cell in self.nodes:
+                self._trace_from(cell)
+        self._anchor_cycles([cell for cell in list(seeds) + affected if self.space.is_open(cell)])
+
+    # --- запити ---
+
+    def connected(self, start_node, goal_node):
+        # O(1) (з точністю до стиснення шляхів): чи в одній компоненті S і G
+        ls, lg = self.label.get(start_node), self.label.get(goal_node)
+        return ls is not None and lg is not None and self._find(ls) == self._find(lg)
+
+    def _attach(self, cell):
+        # Відстані від клітинки до точок рішення, з яких її досяжно напряму
+        if cell in self.nodes:
+            return {cell: 0}
+        a, b, cells = self.corridors[self.on_corridor[cell]]
+        i = cells.index(cell)
+        ends = {a: i + 1}
+        ends[b] = min(ends.get(b, len(cells) - i), len(cells) - i)
+        return ends
+
+    def _bound(self, cell, goal_node):
+        dr, dc = abs(cell[0] - goal_node[0]), abs(cell[1] - goal_node[1])
+        return dr + dc if self._cardinal else max(dr, dc)
+
+    def shortest_path(self, start_node, goal_node):
+        """Найкоротший шлях (у ходах) через стиснений граф: (шлях або None, кількість розкритих точок).
+
+        A* по точках рішення; кожен хід змінює оцінку щонайбільше на 1, тож вона
+        узгоджена і для ребер-коридорів довжини len(cells) + 1.
+        """
+        if not self.connected(start_node, goal_node):
+            return None, 0
+        if start_node == goal_node:
+            return [start_node], 0
+        best, best_via = float('inf'), None
+        same = self.on_corridor.get(start_node)
+        if same is not None and same == self.on_corridor.get(goal_node):
+            cells = self.corridors[same][2]
+            best = abs(cells.index(start_node) - cells.index(goal_node))
+        targets = self._attach(goal_node)
+        dist, parent = {}, {}
+        heap = []
+        for node, d in self._attach(start_node).items():
+            if d < dist.get(node, float('inf')):
+                dist[node] = d
+                parent[node] = None
+                heapq.heappush(heap, (d + self._bound(node, goal_node), d, node))
+        settled = 0
+        done = set()
+        while heap:
+            f, d, u = heapq.heappop(heap)
+            if f >= best:
+                break
+            if u in done or d > dist[u]:
+                continue
+            done.add(u)
+            settled += 1
+            if u in targets and d + targets[u] < best:
+                best, best_via = d + targets[u], u
+            for cid in self.incident.get(u, ()):
+                a, b, cells = self.corridors[cid]
+                v = b if u == a else a
+                nd = d + len(cells) + 1
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    parent[v] = (u, cid)
+                    heapq.heappush(heap, (nd + self._bound(v, goal_node), nd, v))
+        if best_via is None:
+            return self._corridor_path(start_node, goal_node), settled
+        path = self._expand(start_node, best_via, parent)
+        return path + self._walk(best_via, goal_node)[1:], settled
+
+    def _walk(self, node, cell):
+        # Клітинки від точки рішення node до клітинки cell уздовж її коридору (найкоротшим боком)
+        if node == cell:
+            return [node]
+        a, b, cells = self.corridors[self.on_corridor[cell]]
+        i = cells.index(cell)
+        if node == a and (node != b or i + 1 <= len(cells) - i):
+            return [a] + list(cells[:i + 1])
+        return [b] + list(reversed(cells[i:]))
+
+    def _corridor_path(self, start_node, goal_node):
+        cells = self.corridors[self.on_corridor[start_node]][2]
+        i, j = cells.index(start_node), cells.index(goal_node)
+        return list(cells[i:j + 1]) if i <= j else list(reversed(cells[j:i + 1]))
+
+    def _expand(self, start_node, node, parent):
+        # Розгортає ланцюжок точок рішення у повний шлях клітинками
+        hops = []
+        while parent[node] is not None:
+            u, cid = parent[node]
+            a, b, cells = self.corridors[cid]
+            hops.append(list(cells) + [b] if u == a else list(reversed(cells)) + [a])
+            node = u
+        path = list(reversed(self._walk(node, start_node)))
+        for hop in reversed(hops):
+            path.extend(hop)
+        return path
+
+    def stats(self):
+        return {'open_cells': len(self.label), 'components': len({self._find(l) for l in self.label.values()}),
+                'decision_points': len(self.nodes), 'corridors': len(self.corridors)}
@@ -0,0 +1,163 @@
+import os
+import random
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from search_common.stores import new_store
+
+# Пошукові алгоритми лабіринту без залежності від Tk (для запису трас, експериментів тощо)
+WALL = -1
+PASSAGE = 0
+
+OPERATORS = {
+    "Cardinal (ВВВЛ)": [(0, 1), (0, -1), (1, 0), (-1, 0)],
+    "Diagonal (Діагоналі)": [(1, 1), (1, -1), (-1, 1), (-1, -1)],
+    "Combined (Комбінований)": [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+}
+DEFAULT_OPERATOR = "Cardinal (ВВВЛ)"
+
+# Події хвильового пошуку: розкриття та відкриття вершини з боку старту (s) чи цілі (g)
+WAVE_ACTIONS = ('expand_s', 'expand_g', 'discover_s', 'discover_g', 'meet', 'not_found')
+
+
+def generate_grid(rows, cols, wall_density, rng=random):
+    # Випадкова матриця лабіринту; кути (S та G за замовчуванням) завжди прохідні
+    grid = [[rng.choices([PASSAGE, WALL], weights=[1 - wall_density, wall_density])[0]
+             for _ in range(cols)] for _ in range(rows)]
+    grid[0][0] = PASSAGE
+    grid[rows - 1][cols - 1] = PASSAGE
+    return grid
+
+
+def grid_neighbors(grid, r, c, operator):
+    # Повертає список дійсних сусідів для вузла згідно оператора
+    rows, cols = len(grid), len(grid[0])
+    directions = OPERATORS.get(operator, OPERATORS[DEFAULT_OPERATOR])
+    neighbors = []
+    for dr, dc in directions:
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] != WALL:
+            neighbors.append((nr, nc))
+    return neighbors
+
+
+class GridGraph:
+    # Збережена матриця як неявний граф: той самий інтерфейс (successors, is_open), що й у search_common.implicit
+    def __init__(self, grid, operator=DEFAULT_OPERATOR):
+        self.grid, self.operator = grid, operator
+        self.rows, self.cols = len(grid), len(grid[0])
+        # Сховища з власною перевіркою клітинки (tiled_maze.TiledMaze) читаються без рядків-проксі
+        self._is_open = getattr(grid, 'is_open', None)
+        self.directions = OPERATORS.get(operator, OPERATORS[DEFAULT_OPERATOR])
+
+    def is_open(self, cell):
+        if self._is_open is not None:
+            return self._is_open(cell)
+        return self.grid[cell[0]][cell[1]] != WALL
+
+    def successors(self, cell):
+        if self._is_open is None:
+            return grid_neighbors(self.grid, cell[0], cell[1], self.operator)
+        r, c = cell
+        is_open = self._is_open
+        return [(r + dr, c + dc) for dr, dc in self.directions if is_open((r + dr, c + dc))]
+
+
+def as_space(grid, operator=DEFAULT_OPERATOR):
+    # Неявні простори (ProceduralMaze, тайловий файл тощо) мають власні ходи, тож оператор стосується лише матриць
+    return grid if hasattr(grid, 'successors') else GridGraph(grid, operator)
+
+
+def reconstruct_path(parent_map, current_node):
+    # Відновлює шлях, рухаючись назад по словнику parent
+    path = []
+    while current_node is not None:
+        path.append(current_node)
+        current_node = parent_map.get(current_node)
+    return path
+
+
+class WaveState:
+    # Живий стан двонаправленого пошуку (хвилі, батьки, кількість циклів);
+    # store — необов'язкова фабрика компактного сховища (search_common.stores), окреме для кожної хвилі;
+    # власник стану закриває сховища через close(), коли хвилі більше не потрібні
+    def __init__(self, start_node, goal_node, store=None):
+        self.stores = (new_store(store), new_store(store))
+        self.visited_start, self.parent_start = self.stores[0].visited, self.stores[0].parent
+        self.visited_goal, self.parent_goal = self.stores[1].visited, self.stores[1].parent
+        self.visited_start.add(start_node)
+        self.visited_goal.add(goal_node)
+        self.parent_start[start_node] = None
+        self.parent_goal[goal_node] = None
+        self.cycles = 0
+        self.intersection_node = None
+
+    def path(self):
+        if self.intersection_node is None:
+            return None
+        path_from_start = reconstruct_path(self.parent_start, self.intersection_node)
+        path_from_start.reverse()
+        path_from_goal = reconstruct_path(self.parent_goal, self.intersection_node)
+        return path_from_start + path_from_goal[1:]
+
+    def close(self):
+        # Звільняє сховища хвиль (файли MmapStore); після цього хвилі читати не можна
+        for store in self.stores:
+            store.close()
+
+
+def wave_search_events(grid, start_node, goal_node, operator, state=None, tracer=None):
+    """Двонаправлений хвильовий пошук як потік подій (action, cell).
+
+    Стан пошуку накопичується у ``state`` (WaveState), тож споживач може
+    малювати хвилі між подіями, а записувач трас — лише зберігати події.
+    ``grid`` — матриця або неявний простір із ``successors(cell)``: сусіди
+    обчислюються на вимогу, і в пам'яті лишаються тільки відвідані клітинки.
+    Обидві хвилі ходять тими ж ``successors``, тож ходи мають бути оборотними.
+    """
+    successors = as_space(grid, operator).successors
+    st = state if state is not None else WaveState(start_node, goal_node)
+    tr = tracer
+    queue_start = deque([start_node])
+    queue_goal = deque([goal_node])
+    sides = ((queue_start, st.visited_start, st.parent_start, st.visited_goal, 'expand_s', 'discover_s'),
+             (queue_goal, st.visited_goal, st.parent_goal, st.visited_start, 'expand_g', 'discover_g'))
+
+    while queue_start and queue_goal:
+        for queue, visited, parent, other_visited, expand, discover in sides:
+            if not queue:
+                continue
+            st.cycles += 1
+            current = queue.popleft()
+            if tr: tr.expand(len(queue_start) + len(queue_goal))
+            yield expand, current
+
+            if current in other_visited:
+                st.intersection_node = current
+                yield 'meet', current
+                return
+
+            for neighbor in successors(current):
+                if tr: tr.relax()
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+                    yield discover, neighbor
+
+    yield 'not_found', None
+
+
+def bidirectional_wave_search(grid, start_node, goal_node, operator, on_expand=None, tracer=None, state=None):
+    # Повний пошук; on_expand(state, cell) викликається при кожному розкритті (візуалізація).
+    # state — WaveState викликача (наприклад, з компактним сховищем): хвилі повертаються його
+    # поданнями, тож закриває їх викликач; без state хвилі — звичайні set
+    space = as_space(grid, operator)
+    if not space.is_open(start_node) or not space.is_open(goal_node):
+        return None, 0, {}, {}
+    st = state if state is not None else WaveState(start_node, goal_node)
+    for action, cell in wave_search_events(space, start_node, goal_node, operator, st, tracer):
+        if on_expand is not None and (action == 'expand_s' or action == 'expand_g'):
+            on_expand(st, cell)
+    return st.path(), st.cycles, st.visited_start, st.visited_goal
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from search_common.trace_format import SearchTrace, TracePlayer
+from maze_search import WAVE_ACTIONS, WaveState, as_space, wave_search_events
+
+
+def record_wave_search(grid, start_node, goal_node, operator, tracer=None):
+    # Виконує пошук без GUI і повертає бінарну трасу (клітинка кодується як r * cols + c)
+    space = as_space(grid, operator)
+    rows, cols = space.rows, space.cols
+    trace = SearchTrace(WAVE_ACTIONS, {"engine": "bidirectional_wave", "rows": rows, "cols": cols,
+                                       "start": list(start_node), "goal": list(goal_node), "operator": operator})
+    t = time.perf_counter()
+    if space.is_open(start_node) and space.is_open(goal_node):
+        ops, nodes, codes = trace.ops, trace.nodes, trace.codes
+        for action, cell in wave_search_events(space, start_node, goal_node, operator, tracer=tracer):
+            ops.append(codes[action])
+            nodes.append(-1 if cell is None else cell[0] * cols + cell[1])
+    else:
+        trace.append('not_found')
+    trace.meta["record_seconds"] = round(time.perf_counter() - t, 6)
+    return trace
+
+
+class WaveReplayState:
+    # Відновлює хвилі, показчик і шлях з подій траси
+    def __init__(self, start_node, goal_node, cols):
+        self.start_node, self.goal_node, self.cols = start_node, goal_node, cols
+        self.wave = WaveState(start_node, goal_node)
+        self.highlight = None
+        self.expanding = {'s': None, 'g': None}
+        self.finished = False
+
+    def apply(self, action, node):
+        cell = None if node is None else divmod(node, self.cols)
+        w = self.wave
+        if action == 'expand_s' or action == 'expand_g':
+            w.cycles += 1
+            self.highlight = cell
+            self.expanding[action[-1]] = cell
+        elif action == 'discover_s':
+            w.visited_start.add(cell)
+            w.parent_start[cell] = self.expanding['s']
+        elif action == 'discover_g':
+            w.visited_goal.add(cell)
+            w.parent_goal[cell] = self.expanding['g']
+        elif action == 'meet':
+            w.intersection_node = cell
+            self.finished = True
+        elif action == 'not_found':
+            self.finished = True
+
+    def clone(self):
+        c = WaveReplayState(self.start_node, self.goal_node, self.cols)
+        w, cw = self.wave, c.wave
+        cw.visited_start, cw.visited_goal = set(w.visited_start), set(w.visited_goal)
+        cw.parent_start, cw.parent_goal = dict(w.parent_start), dict(w.parent_goal)
+        cw.cycles, cw.intersection_node = w.cycles, w.intersection_node
+        c.highlight, c.expanding, c.finished = self.highlight, dict(self.expanding), self.finished
+        return c
+
+
+def wave_player(trace, checkpoint_every=1024):
+    meta = trace.meta
+    start, goal, cols = tuple(meta["start"]), tuple(meta["goal"]), meta["cols"]
+    return TracePlayer(trace, lambda: WaveReplayState(start, goal, cols), checkpoint_every)
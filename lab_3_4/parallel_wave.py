@@ -0,0 +1,201 @@
+import os
+import threading
+from multiprocessing import Lock, Process, shared_memory
+
+import numpy as np
+
+import maze_search
+from maze_search import WALL, OPERATORS, DEFAULT_OPERATOR
+from tiled_maze import TiledMaze
+
+# Паралельний двонаправлений хвильовий пошук: кожна хвиля розширюється у власному робітнику
+# (процес або потік) пошарово, векторно (NumPy), над спільними буферами:
+#   open_     int8  [rows*cols]  1 = прохід (матриця лабіринту)
+#   visited   int8  [2, rows*cols]  рядок 0 — хвиля старту, 1 — хвиля цілі (кожен пише лише свій)
+#   parent    int32 [2, rows*cols]  батько клітинки у своїй хвилі (-1 — немає)
+#   meet      int64 [4]  клітинка зустрічі (-1 — ще ні), сторона, що її виявила, розкриття s, розкриття g
+# Зустріч виявляється через спільний масив відвідування: робітник спершу позначає нові клітинки
+# своїми, потім перевіряє, чи їх уже бачила інша хвиля. Перша зустріч фіксується під замком,
+# і обидва робітники зупиняються на наступному шарі.
+
+
+def _layout(cells):
+    # Зсуви буферів у спільній пам'яті (вирівняні для int32/int64)
+    visited_at = (cells + 7) & ~7
+    parent_at = visited_at + ((2 * cells + 7) & ~7)
+    meet_at = parent_at + 8 * cells
+    return visited_at, parent_at, meet_at, meet_at + 32
+
+
+def _views(buf, cells):
+    visited_at, parent_at, meet_at, _ = _layout(cells)
+    open_ = np.ndarray(cells, np.int8, buf, 0)
+    visited = np.ndarray((2, cells), np.int8, buf, visited_at)
+    parent = np.ndarray((2, cells), np.int32, buf, parent_at)
+    meet = np.ndarray(4, np.int64, buf, meet_at)
+    return open_, visited, parent, meet
+
+
+def _expand_side(side, buf, rows, cols, source, directions, lock):
+    # Пошаровий BFS однієї хвилі; обидва робітники виконують цю ж функцію
+    cells = rows * cols
+    open_, visited, parent, meet = _views(buf, cells)
+    own, other = visited[side], visited[1 - side]
+    own_parent = parent[side]
+    frontier = np.array([source], np.int64)
+    expanded = 0
+    while frontier.size and meet[0] < 0:
+        expanded += frontier.size
+        r, c = np.divmod(frontier, cols)
+        layer = []
+        for dr, dc in directions:
+            nr, nc = r + dr, c + dc
+            ok = (nr >= 0) & (nr < rows) & (nc >= 0) & (nc < cols)
+            n = nr[ok] * cols + nc[ok]
+            src = frontier[ok]
+            fresh = (open_[n] == 1) & (own[n] == 0)
+            n, first = np.unique(n[fresh], return_index=True)
+            if not n.size:
+                continue
+            own_parent[n] = src[fresh][first]
+            own[n] = 1
+            layer.append(n)
+            met = n[other[n] != 0]
+            if met.size:
+                with lock:
+                    if meet[0] < 0:
+                        meet[0], meet[1] = met[0], side
+                break
+        frontier = np.concatenate(layer) if layer else frontier[:0]
+    meet[2 + side] = expanded
+
+
+def _process_side(side, name, rows, cols, source, directions, lock):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        _expand_side(side, shm.buf, rows, cols, source, directions, lock)
+    finally:
+        shm.close()
+
+
+def _walk(parent, cell, cols):
+    path = []
+    while cell >= 0:
+        path.append(divmod(int(cell), cols))
+        cell = parent[cell]
+    return path
+
+
+def parallel_wave_search(grid, start_node, goal_node, operator=DEFAULT_OPERATOR, backend='process'):
+    """Двонаправлений хвильовий пошук, де кожна хвиля — окремий робітник.
+
+    ``backend='process'`` запускає два процеси над ``multiprocessing.shared_memory``,
+    ``'thread'`` — два потоки (NumPy відпускає GIL у сортуваннях і копіюваннях).
+    Повертає те саме, що й maze_search.bidirectional_wave_search: (шлях, розкриття,
+    відвідані зі старту, відвідані з цілі). Хвилі ростуть шарами незалежно, тож
+    шлях може відрізнятися від послідовного, але й там найкоротший не гарантовано.
+    Працює з матрицями в пам'яті (для плиткових лабіринтів — послідовний пошук).
+    """
+    rows, cols = len(grid), len(grid[0])
+    if grid[start_node[0]][start_node[1]] == WALL or grid[goal_node[0]][goal_node[1]] == WALL:
+        return None, 0, set(), set()
+    cells = rows * cols
+    directions = OPERATORS.get(operator, OPERATORS[DEFAULT_OPERATOR])
+    start, goal = start_node[0] * cols + start_node[1], goal_node[0] * cols + goal_node[1]
+
+    shm = shared_memory.SharedMemory(create=True, size=_layout(cells)[3])
+    try:
+        open_, visited, parent, meet = _views(shm.buf, cells)
+        open_[:] = (np.asarray(grid, np.int8) != WALL).ravel()
+        visited[:] = 0
+        parent[:] = -1
+        meet[:] = (-1, -1, 0, 0)
+        visited[0, start] = visited[1, goal] = 1
+        if start == goal:
+            meet[0] = start
+        else:
+            lock = Lock() if backend == 'process' else threading.Lock()
+            if backend == 'process':
+                workers = [Process(target=_process_side, args=(side, shm.name, rows, cols, source, directions, lock))
+                           for side, source in ((0, start), (1, goal))]
+            else:
+                workers = [threading.Thread(target=_expand_side, args=(side, shm.buf, rows, cols, source, directions, lock))
+                           for side, source in ((0, start), (1, goal))]
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+
+        path = None
+        if meet[0] >= 0:
+            from_start = _walk(parent[0], meet[0], cols)
+            from_start.reverse()
+            path = from_start + _walk(parent[1], meet[0], cols)[1:]
+        cycles = int(meet[2] + meet[3])
+        visited_s = {divmod(int(i), cols) for i in np.flatnonzero(visited[0])}
+        visited_g = {divmod(int(i), cols) for i in np.flatnonzero(visited[1])}
+        del open_, visited, parent, meet
+    finally:
+        shm.close()
+        shm.unlink()
+    return path, cycles, visited_s, visited_g
+
+
+# --- Пакет незалежних запитів на одному лабіринті ---
+
+_worker_grid = None
+
+
+def _init_query_worker(source, shape):
+    # Матриця передається робітнику один раз: через спільну пам'ять або шлях до файлу плиток
+    global _worker_grid
+    if shape is None:
+        _worker_grid = TiledMaze(source, read_only=True)
+        return
+    shm = shared_memory.SharedMemory(name=source)
+    walls = np.ndarray(shape, np.int8, shm.buf).copy()
+    shm.close()
+    _worker_grid = np.where(walls == 1, WALL, maze_search.PASSAGE).tolist()
+
+
+def _run_queries(queries, operator):
+    results = []
+    for start_node, goal_node in queries:
+        path, cycles, _, _ = maze_search.bidirectional_wave_search(_worker_grid, start_node, goal_node, operator)
+        results.append((path, cycles))
+    return results
+
+
+def batch_wave_search(grid, queries, operator=DEFAULT_OPERATOR, processes=None, chunk=8):
+    """Багато незалежних пар (старт, ціль) на одному лабіринті, розкиданих по пулу процесів.
+
+    Повертає [(шлях або None, розкриття)] у порядку ``queries``. Лабіринт
+    передається кожному процесу один раз (спільна пам'ять; плитковий — шлях до
+    файлу), завдання несуть лише координати. На одному ядрі або для кількох
+    запитів — послідовно в поточному процесі.
+    """
+    queries = [(tuple(s), tuple(g)) for s, g in queries]
+    workers = processes or os.cpu_count() or 1
+    if workers <= 1 or len(queries) <= chunk:
+        return [maze_search.bidirectional_wave_search(grid, s, g, operator)[:2] for s, g in queries]
+    from concurrent.futures import ProcessPoolExecutor
+    parts = [queries[i:i + chunk] for i in range(0, len(queries), chunk)]
+    shm = None
+    if isinstance(grid, TiledMaze):
+        grid.flush()    # правки зі сторінок кешу мають потрапити у файл до того, як його відкриють робітники
+        initargs = (grid.path, None)
+    else:
+        walls = (np.asarray(grid, np.int8) == WALL).astype(np.int8)
+        shm = shared_memory.SharedMemory(create=True, size=max(walls.nbytes, 1))
+        np.ndarray(walls.shape, np.int8, shm.buf)[:] = walls
+        initargs = (shm.name, walls.shape)
+    results = []
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_query_worker, initargs=initargs) as pool:
+            for part in pool.map(_run_queries, parts, [operator] * len(parts)):
+                results.extend(part)
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+    return results
@@ -0,0 +1,196 @@
+import mmap
+import os
+import random
+import struct
+import tempfile
+from collections import OrderedDict
+
+from maze_search import WALL, PASSAGE
+
+# Лабіринт, більший за пам'ять: стіни зберігаються побітово у файлі, поділеному на плитки
+# TILE x TILE клітинок, файл відображається у пам'ять (mmap), а розпаковані плитки
+# тримаються в LRU-кеші. Плитки генеруються ліниво за зерном при першому зверненні,
+# тож лабіринт 100k x 100k створюється миттєво, а файл лишається розрідженим (sparse).
+#
+# Формат файлу: заголовок | бітова карта "плитку згенеровано" | плитки по TILE*TILE/8 байт
+
+MAGIC = b'TMAZ'
+VERSION = 1
+TILE = 64
+_HEADER = struct.Struct('<4sBxxxIIIQd')   # magic, version, rows, cols, tile, seed, density
+_HEADER_SIZE = 64
+
+_UNPACK = [bytes((b >> k) & 1 for k in range(8)) for b in range(256)]
+_PACK = {bits: b for b, bits in enumerate(_UNPACK)}
+
+
+class _TileRow:
+    # Рядок-проксі, щоб код, написаний для списку списків (grid[r][c]), працював без змін
+    __slots__ = ('maze', 'r')
+
+    def __init__(self, maze, r):
+        self.maze, self.r = maze, r
+
+    def __len__(self):
+        return self.maze.cols
+
+    def __getitem__(self, c):
+        return WALL if self.maze.is_wall(self.r, c) else PASSAGE
+
+    def __setitem__(self, c, value):
+        self.maze.set_wall(self.r, c, value == WALL)
+
+
+class TiledMaze:
+    def __init__(self, path, cache_tiles=1024, delete_on_close=False, read_only=False):
+        # read_only: окремий дескриптор для іншого потоку чи процесу — згенеровані плитки лишаються
+        # лише в його кеші, у файл він нічого не пише (не змагається з власником за байти прапорців)
+        self.path = path
+        self.delete_on_close = delete_on_close and not read_only
+        self.read_only = read_only
+        self._file = open(path, 'rb' if read_only else 'r+b')
+        magic, version, rows, cols, tile, seed, density = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError('not a tiled maze file')
+        if version > VERSION:
+            raise ValueError(f'unsupported tiled maze version {version}')
+        self.rows, self.cols, self.tile, self.seed, self.wall_density = rows, cols, tile, seed, density
+        self.shift = tile.bit_length() - 1
+        self.tiles_r, self.tiles_c = -(-rows // tile), -(-cols // tile)
+        self.tile_bytes = tile * tile // 8
+        self._flags_at = _HEADER_SIZE
+        self._data_at = _HEADER_SIZE + ((self.tiles_r * self.tiles_c + 7) // 8 + 4095) // 4096 * 4096
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ if read_only else mmap.ACCESS_WRITE)
+        self.cache_tiles = cache_tiles
+        self._cache = OrderedDict()     # (tr, tc) -> bytearray(tile*tile), 1 = стіна
+        self._dirty = set()
+        self._last_key, self._last_tile = None, None
+        self.loads = self.generated = self.evictions = 0
+
+    @classmethod
+    def create(cls, rows, cols, wall_density, seed=None, path=None, tile=TILE, cache_tiles=1024):
+        # Створює розріджений файл лабіринту; без path — тимчасовий файл, що видаляється при close()
+        if tile & (tile - 1) or tile < 8:
+            raise ValueError('tile size must be a power of two >= 8')
+        if seed is None:
+            seed = random.getrandbits(63)
+        temp = path is None
+        if temp:
+            fd, path = tempfile.mkstemp(suffix='.tmaze')
+            os.close(fd)
+        tiles = -(-rows // tile) * -(-cols // tile)
+        data_at = _HEADER_SIZE + ((tiles + 7) // 8 + 4095) // 4096 * 4096
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, rows, cols, tile, seed, wall_density).ljust(_HEADER_SIZE, b'\0'))
+            f.truncate(data_at + tiles * (tile * tile // 8))
+        return cls(path, cache_tiles, delete_on_close=temp)
+
+    # --- плитки ---
+
+    def _flag(self, index):
+        return self._map[self._flags_at + (index >> 3)] >> (index & 7) & 1
+
+    def _generate(self, tr, tc):
+        # Детермінована плитка: залежить лише від зерна та координат плитки
+        t = self.tile
+        rng = random.Random((self.seed * 1000003 + tr) * 1000003 + tc)
+        threshold = int(self.wall_density * 256)
+        noise = rng.getrandbits(8 * t * t).to_bytes(t * t, 'little')
+        cells = bytearray(1 if b < threshold else 0 for b in noise)
+        for r, c in ((0, 0), (self.rows - 1, self.cols - 1)):   # кути S і G за замовчуванням завжди прохідні
+            if r >> self.shift == tr and c >> self.shift == tc:
+                cells[(r & (t - 1)) * t + (c & (t - 1))] = 0
+        self.generated += 1
+        return cells
+
+    def _load(self, key):
+        tr, tc = key
+        index = tr * self.tiles_c + tc
+        if self._flag(index):
+            at = self._data_at + index * self.tile_bytes
+            cells = bytearray(b''.join(_UNPACK[b] for b in self._map[at:at + self.tile_bytes]))
+            self.loads += 1
+        else:
+            cells = self._generate(tr, tc)
+            if not self.read_only:
+                self._dirty.add(key)
+        self._cache[key] = cells
+        if len(self._cache) > self.cache_tiles:
+            old, old_cells = self._cache.popitem(last=False)
+            if old in self._dirty:
+                self._write(old, old_cells)
+            self.evictions += 1
+        return cells
+
+    def _write(self, key, cells):
+        tr, tc = key
+        index = tr * self.tiles_c + tc
+        at = self._data_at + index * self.tile_bytes
+        self._map[at:at + self.tile_bytes] = bytes(_PACK[bytes(cells[i:i + 8])] for i in range(0, len(cells), 8))
+        flag_at = self._flags_at + (index >> 3)
+        self._map[flag_at] = self._map[flag_at] | (1 << (index & 7))
+        self._dirty.discard(key)
+
+    def _tile(self, r, c):
+        key = (r >> self.shift, c >> self.shift)
+        if key == self._last_key:
+            return self._last_tile
+        cells = self._cache.get(key)
+        if cells is None:
+            cells = self._load(key)
+        else:
+            self._cache.move_to_end(key)
+        self._last_key, self._last_tile = key, cells
+        return cells
+
+    # --- клітинки ---
+
+    def is_wall(self, r, c):
+        mask = self.tile - 1
+        return self._tile(r, c)[(r & mask) * self.tile + (c & mask)] == 1
+
+    def is_open(self, cell):
+        r, c = cell
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return False
+        mask = self.tile - 1
+        return self._tile(r, c)[(r & mask) * self.tile + (c & mask)] == 0
+
+    def set_wall(self, r, c, wall):
+        if self.read_only:
+            raise ValueError('tiled maze handle is read-only')
+        mask = self.tile - 1
+        self._tile(r, c)[(r & mask) * self.tile + (c & mask)] = 1 if wall else 0
+        self._dirty.add((r >> self.shift, c >> self.shift))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, r):
+        return _TileRow(self, r)
+
+    def reader(self):
+        """Скидає правки у файл і відкриває незалежний дескриптор лише для читання.
+
+        Кеш плиток не потокобезпечний: фонове завдання має працювати з власним
+        дескриптором, а не з тим, який редагує потік Tk. Викликати з потоку-власника.
+        """
+        self.flush()
+        return TiledMaze(self.path, self.cache_tiles, read_only=True)
+
+    def flush(self):
+        if self.read_only:
+            return
+        for key in list(self._dirty):
+            self._write(key, self._cache[key])
+        self._map.flush()
+
+    def close(self):
+        if self._map.closed:
+            return
+        if not self.delete_on_close:
+            self.flush()
+        self._map.close()
+        self._file.close()
+        if self.delete_on_close:
+            os.remove(self.path)
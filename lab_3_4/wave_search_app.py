@@ -1,12 +1,37 @@
 import tkinter as tk
-from tkinter import messagebox, simpledialog
-from collections import deque
-import random
+from tkinter import messagebox, simpledialog, filedialog
+from contextlib import nullcontext
 import time
+import random
 import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from search_common.instrumentation import tracer_from_env
+from search_common.background import run_in_background
+from search_common.startup import StartupTimer
+from search_common.scheduler import TurboScheduler
+from search_common.result_cache import ResultCache
+from search_common.trace_format import SearchTrace
+from search_common.stores import GridStore
+import maze_search
+from tiled_maze import TiledMaze
+import parallel_wave
+from maze_index import MazeIndex
+from dstar_lite import DStarLite
+from maze_trace import record_wave_search, wave_player
+from maze_export import export_maze_trace
 
 # --- Налаштування GUI та Констант ---
 CELL_SIZE = 30
+SMALL_CELL_SIZE = 8          # клітинка для лабіринтів більших за 50x50 (без підписів 0/-1)
+# Межа пошуку на плитковому лабіринті — вільне місце на диску, а не пам'ять: visited/parent хвиль
+# лежать у розріджених тимчасових файлах (GridStore із mmap), 8.125 байт на клітинку на хвилю
+# (int64 батьки понад 2**31 клітинок), і займають місце лише сторінки, яких торкнулися хвилі
+# (щонайменше 4 КБ на кожний зачеплений відрізок рядка з 512 клітинок). Повний обхід 100000x100000
+# потребує до ~160 ГБ диска; хвилі радіусом 10k клітинок — порядку 1-2 ГБ.
+MAX_SIZE = 100000
+TILED_FROM_CELLS = 250000    # більші лабіринти зберігаються плитками у файлі (tiled_maze)
 WALL = -1
 PASSAGE = 0
 START = 1
@@ -32,11 +57,27 @@ class BidirectionalWaveSearchApp:
         self.cols = 15
         self.wall_density = 0.3
         self.grid = []
+        self.cell_size = CELL_SIZE
+        self.indexes = {}           # оператор -> MazeIndex (оновлюється при зміні клітинок)
+        self.planner = None         # DStarLite останнього запиту
+        self.scheduler = None       # TurboScheduler поточного турбо-пошуку
+        self.waves = None           # WaveState останнього пошуку з хвилями на диску (закривається наступним)
+        self.results = ResultCache()  # (версія лабіринту, S, G, оператор, режим) -> результат пошуку
+        self._last_draw = {}
+        self._redraw_job = None
         self.start_node = (0, 0)
         self.goal_node = (self.rows - 1, self.cols - 1)
         self.path_result = []
         self.cycles = 0
         self.search_running = False
+        # Трасування пошуку (вмикається змінною оточення SEARCH_TRACE)
+        self.tracer = tracer_from_env()
+        # Записана траса пошуку та її програвач
+        self.trace = None
+        self.trace_player = None
+        self.replay_running = False
+        self.generating = False
+        self.startup = StartupTimer(master, "wave_search")
 
         # Створення основних фреймів
         self.controls_frame = tk.Frame(master)
@@ -103,7 +144,17 @@ class BidirectionalWaveSearchApp:
         
         tk.Button(self.controls_frame, text="Оновити Точки", command=self.update_start_goal).pack(pady=5)
         
-        tk.Button(self.controls_frame, text="Знайти Шлях", command=self.start_search, bg='lightblue').pack(pady=20)
+        tk.Button(self.controls_frame, text="Знайти Шлях", command=self.start_search, bg='lightblue').pack(pady=(20, 5))
+        # Кожна хвиля у власному процесі (без покрокової анімації)
+        self.parallel_var = tk.BooleanVar(self.master, value=False)
+        tk.Checkbutton(self.controls_frame, text="Паралельно (процес на хвилю)", variable=self.parallel_var).pack()
+        # Попередня обробка: компоненти (O(1) відмова) і стиснені коридори; будується на оператор
+        self.index_var = tk.BooleanVar(self.master, value=False)
+        tk.Checkbutton(self.controls_frame, text="Індекс (компоненти + коридори)", variable=self.index_var).pack()
+        # D* Lite зберігає стан між запитами і після кліку по клітинці лише ремонтує шлях
+        self.dstar_var = tk.BooleanVar(self.master, value=False)
+        tk.Checkbutton(self.controls_frame, text="Інкрементно (D* Lite)", variable=self.dstar_var).pack()
+        tk.Button(self.controls_frame, text="Пакет Запитів...", command=self.run_query_batch).pack(pady=(5, 15))
         tk.Button(self.controls_frame, text="Показати Матрицю Суміжності", command=self.show_adjacency_matrix).pack(pady=5)
 
     def create_canvas(self):
@@ -116,14 +167,34 @@ class BidirectionalWaveSearchApp:
                                 yscrollcommand=self.v_scroll.set, 
                                 xscrollcommand=self.h_scroll.set)
         
-        self.v_scroll.config(command=self.canvas.yview)
-        self.h_scroll.config(command=self.canvas.xview)
+        # Малюється лише видима частина, тож прокрутка та зміна розміру перемальовують полотно
+        self.v_scroll.config(command=self.on_yscroll)
+        self.h_scroll.config(command=self.on_xscroll)
         
         self.v_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.h_scroll.pack(side=tk.BOTTOM, fill=tk.X)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         self.canvas.bind("<Button-1>", self.on_canvas_click)
+        self.canvas.bind("<Configure>", lambda event: self.schedule_redraw())
+
+    def on_yscroll(self, *args):
+        self.canvas.yview(*args)
+        self.schedule_redraw()
+
+    def on_xscroll(self, *args):
+        self.canvas.xview(*args)
+        self.schedule_redraw()
+
+    def schedule_redraw(self):
+        # Одна перемальовка на кадр, хоч би скільки подій прокрутки надійшло
+        if self._redraw_job is None and self.maze_ready():
+            self._redraw_job = self.master.after_idle(self.redraw)
+
+    def redraw(self):
+        self._redraw_job = None
+        if self.maze_ready():
+            self.draw_labyrinth(**self._last_draw)
 
     def create_results_window(self):
         # Створює текстове вікно для виводу результатів та повзунок затримки
@@ -135,9 +206,33 @@ class BidirectionalWaveSearchApp:
         self.delay_scale = tk.Scale(self.results_frame, from_=0, to=500, orient=tk.HORIZONTAL, length=200)
         self.delay_scale.set(VISUALIZATION_DELAY_MS)
         self.delay_scale.pack()
+        # Турбо: стільки кроків, скільки вміщує кадр, і одна перемальовка на кадр (замість затримки)
+        frame_turbo = tk.Frame(self.results_frame)
+        frame_turbo.pack()
+        self.turbo_var = tk.BooleanVar(self.master, value=False)
+        tk.Checkbutton(frame_turbo, text="Турбо, кроків/с (0 = макс.):", variable=self.turbo_var).pack(side=tk.LEFT)
+        self.turbo_rate_entry = tk.Entry(frame_turbo, width=8)
+        self.turbo_rate_entry.insert(0, "0")
+        self.turbo_rate_entry.pack(side=tk.LEFT)
+
+        # Запис і відтворення трас пошуку
+        tk.Label(self.results_frame, text="Траса Пошуку", font=TITLE_FONT_STYLE).pack(pady=(10, 0))
+        frame_trace = tk.Frame(self.results_frame)
+        frame_trace.pack()
+        tk.Button(frame_trace, text="Записати", command=self.record_trace).pack(side=tk.LEFT, padx=2)
+        tk.Button(frame_trace, text="Зберегти", command=self.save_trace).pack(side=tk.LEFT, padx=2)
+        tk.Button(frame_trace, text="Завантажити", command=self.load_trace).pack(side=tk.LEFT, padx=2)
+        tk.Button(frame_trace, text="Експорт GIF/MP4", command=self.export_animation).pack(side=tk.LEFT, padx=2)
+        self.replay_button = tk.Button(self.results_frame, text="Відтворити", command=self.toggle_replay)
+        self.replay_button.pack(pady=5)
+        self.trace_scale = tk.Scale(self.results_frame, from_=0, to=0, orient=tk.HORIZONTAL, length=200,
+                                    label="Подія траси", command=self.on_trace_scrub)
+        self.trace_scale.pack()
 
     def on_canvas_click(self, event):
         # Обробляє кліки миші на полотні для зміни стін/проходів
+        if not self.maze_ready():
+            return
         if self.search_running:
              messagebox.showinfo("Увага", "Пошук триває. Зачекайте.")
              return
@@ -146,8 +241,8 @@ class BidirectionalWaveSearchApp:
         x = self.canvas.canvasx(event.x)
         y = self.canvas.canvasy(event.y)
         
-        col = int(x // CELL_SIZE)
-        row = int(y // CELL_SIZE)
+        col = int(x // self.cell_size)
+        row = int(y // self.cell_size)
         
         if 0 <= row < self.rows and 0 <= col < self.cols:
             if (row, col) != self.start_node and (row, col) != self.goal_node:
@@ -155,12 +250,33 @@ class BidirectionalWaveSearchApp:
                     self.grid[row][col] = PASSAGE
                 else:
                     self.grid[row][col] = WALL
+                self.results.bump()
+                for index in self.indexes.values():
+                    index.update((row, col))
+                if self.planner is not None:
+                    self.planner.update_cell((row, col))
+                    if self.dstar_var.get():
+                        self.replan()
+                        return
                 self.draw_labyrinth() 
                 self.path_result = [] 
                 self.update_results()
 
+    def replan(self):
+        # Ремонт шляху D* Lite одразу після редагування стіни
+        start_time = time.time()
+        path, expanded = self.planner.plan()
+        elapsed = time.time() - start_time
+        self.cycles = expanded
+        self.path_result = path
+        self.draw_labyrinth(path=path)
+        message = "Шлях переплановано (D* Lite)" if path else "Шлях не знайдено (D* Lite)."
+        self.update_results(message, elapsed, len(path) if path else 0, self.planner.operator)
+
     def update_start_goal(self):
         # Зчитує та оновлює координати S та G з полів вводу
+        if not self.maze_ready():
+            return
         try:
             r_start = int(self.start_row_entry.get())
             c_start = int(self.start_col_entry.get())
@@ -185,48 +301,98 @@ class BidirectionalWaveSearchApp:
             messagebox.showerror("Помилка Вводу", f"Неправильні координати: {e}")
 
     def generate_labyrinth(self):
-        # Генерує нову матрицю лабіринту, оновлює scrollregion
+        # Зчитує параметри і генерує нову матрицю лабіринту у фоновому потоці
+        if self.generating:
+            return
+        if self.search_running:
+            messagebox.showinfo("Увага", "Пошук вже триває.")
+            return
         try:
-            self.rows = int(self.row_entry.get())
-            self.cols = int(self.col_entry.get())
-            self.wall_density = float(self.density_entry.get())
-            
-            # Дозволяємо великі розміри (до 50х50)
-            if not (5 <= self.rows <= 50 and 5 <= self.cols <= 50 and 0.1 <= self.wall_density <= 0.5):
-                raise ValueError("Розмір має бути 5-50, щільність 0.1-0.5.")
-                
-            canvas_width = self.cols * CELL_SIZE
-            canvas_height = self.rows * CELL_SIZE
-            # Встановлюємо scrollregion, щоб скролбари знали розмір
-            self.canvas.config(scrollregion=(0, 0, canvas_width, canvas_height))
-
-            self.grid = [[random.choices([PASSAGE, WALL], weights=[1 - self.wall_density, self.wall_density])[0]
-                          for _ in range(self.cols)] for _ in range(self.rows)]
+            rows = int(self.row_entry.get())
+            cols = int(self.col_entry.get())
+            wall_density = float(self.density_entry.get())
             
-            self.start_node = (0, 0)
-            self.goal_node = (self.rows - 1, self.cols - 1)
-            
-            self.grid[self.start_node[0]][self.start_node[1]] = PASSAGE
-            self.grid[self.goal_node[0]][self.goal_node[1]] = PASSAGE
-            
-            self.start_row_entry.delete(0, tk.END)
-            self.start_row_entry.insert(0, str(self.start_node[0]))
-            self.start_col_entry.delete(0, tk.END)
-            self.start_col_entry.insert(0, str(self.start_node[1]))
-            self.goal_row_entry.delete(0, tk.END)
-            self.goal_row_entry.insert(0, str(self.goal_node[0]))
-            self.goal_col_entry.delete(0, tk.END)
-            self.goal_col_entry.insert(0, str(self.goal_node[1]))
-
-            self.draw_labyrinth()
-            self.path_result = []
-            self.update_results()
+            # Великі лабіринти (понад TILED_FROM_CELLS клітинок) зберігаються плитками у файлі
+            if not (5 <= rows <= MAX_SIZE and 5 <= cols <= MAX_SIZE and 0.1 <= wall_density <= 0.5):
+                raise ValueError(f"Розмір має бути 5-{MAX_SIZE}, щільність 0.1-0.5.")
         except ValueError as e:
             messagebox.showerror("Помилка Вводу", f"Неправильні параметри: {e}")
+            return
+
+        self.generating = True
+        if rows * cols > TILED_FROM_CELLS:
+            make = lambda: TiledMaze.create(rows, cols, wall_density)
+        else:
+            make = lambda: maze_search.generate_grid(rows, cols, wall_density)
+        run_in_background(self.master, lambda: (rows, cols, wall_density, make()), self.attach_labyrinth,
+                          self.generation_failed)
+
+    def generation_failed(self, exc):
+        # Помилка у фоновому потоці (немає місця для файлу плиток, MemoryError тощо): кнопка знову доступна
+        self.generating = False
+        messagebox.showerror("Помилка", f"Не вдалося згенерувати лабіринт: {exc}")
+
+    def attach_labyrinth(self, result):
+        # Підключає згенерований лабіринт (у головному потоці), оновлює scrollregion
+        self.generating = False
+        # Турбо-пошук по старому лабіринту більше не крокує: інакше step() читав би закритий файл плиток,
+        # а render/done малювали б старі хвилі поверх нового лабіринту
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+        self.search_running = False
+        self.close_labyrinth()
+        self.rows, self.cols, self.wall_density, self.grid = result
+        self.cell_size = CELL_SIZE if self.rows <= 50 and self.cols <= 50 else SMALL_CELL_SIZE
+        self.indexes = {}
+        self.planner = None
+        self.results.bump()
+        self._last_draw = {}
+
+        canvas_width = self.cols * self.cell_size
+        canvas_height = self.rows * self.cell_size
+        # Встановлюємо scrollregion, щоб скролбари знали розмір
+        self.canvas.config(scrollregion=(0, 0, canvas_width, canvas_height))
+
+        self.start_node = (0, 0)
+        self.goal_node = (self.rows - 1, self.cols - 1)
+        
+        self.start_row_entry.delete(0, tk.END)
+        self.start_row_entry.insert(0, str(self.start_node[0]))
+        self.start_col_entry.delete(0, tk.END)
+        self.start_col_entry.insert(0, str(self.start_node[1]))
+        self.goal_row_entry.delete(0, tk.END)
+        self.goal_row_entry.insert(0, str(self.goal_node[0]))
+        self.goal_col_entry.delete(0, tk.END)
+        self.goal_col_entry.insert(0, str(self.goal_node[1]))
+
+        self.draw_labyrinth()
+        self.path_result = []
+        self.update_results()
+        self.startup.ready()
+
+    def close_labyrinth(self):
+        # Плитковий лабіринт тримає відкритий файл (тимчасовий файл видаляється)
+        self.close_waves()
+        if isinstance(self.grid, TiledMaze):
+            self.grid.close()
+        self.grid = []
+
+    def on_close(self):
+        self.close_labyrinth()
+        self.master.destroy()
+
+    def maze_ready(self):
+        # Чи вже згенеровано лабіринт (генерація йде у фоні)
+        return bool(self.grid) and not self.generating
 
     def draw_labyrinth(self, path=None, visited_start=None, visited_goal=None, highlight_node=None):
-        # Повністю перемальовує полотно (сітку, стіни, хвилі, показчик)
+        # Перемальовує видиму частину полотна (сітку, стіни, хвилі, показчик)
+        self._last_draw = dict(path=path, visited_start=visited_start, visited_goal=visited_goal,
+                               highlight_node=highlight_node)
         self.canvas.delete("all")
+        size = self.cell_size
+        path = set(path) if path else None
         
         color_map = {
             WALL: 'gray',
@@ -238,10 +404,17 @@ class BidirectionalWaveSearchApp:
             VISITED_GOAL: 'lightgreen' 
         }
         
-        for r in range(self.rows):
-            for c in range(self.cols):
-                x1, y1 = c * CELL_SIZE, r * CELL_SIZE
-                x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
+        # Видиме вікно у клітинках: лише ці плитки читаються з файлу великого лабіринту
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        r0, c0 = max(0, int(y0 // size)), max(0, int(x0 // size))
+        r1 = min(self.rows, int((y0 + self.canvas.winfo_height()) // size) + 1)
+        c1 = min(self.cols, int((x0 + self.canvas.winfo_width()) // size) + 1)
+        with_text = size >= CELL_SIZE
+
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                x1, y1 = c * size, r * size
+                x2, y2 = x1 + size, y1 + size
                 
                 cell_type = self.grid[r][c]
                 fill_color = color_map.get(cell_type, 'white')
@@ -262,14 +435,14 @@ class BidirectionalWaveSearchApp:
                 if (r, c) == highlight_node:
                     fill_color = CURRENT_NODE_HIGHLIGHT
 
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline='black')
+                self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline='black' if with_text else '')
                 
                 # Малюємо текст 0/-1
-                if (r, c) != self.start_node and (r, c) != self.goal_node:
+                if with_text and (r, c) != self.start_node and (r, c) != self.goal_node:
                     text_color = 'black'
                     if fill_color not in ['white', 'gray']:
                          text_color = '#555555' 
-                    self.canvas.create_text(x1 + CELL_SIZE/2, y1 + CELL_SIZE/2, 
+                    self.canvas.create_text(x1 + size/2, y1 + size/2, 
                                             text=str(cell_type), 
                                             fill=text_color, 
                                             font=CELL_FONT_STYLE)
@@ -277,11 +450,12 @@ class BidirectionalWaveSearchApp:
         # Малювання Старт/Ціль (поверх тексту)
         for r, c, tag in [(self.start_node[0], self.start_node[1], "S"), 
                           (self.goal_node[0], self.goal_node[1], "G")]:
-            x1, y1 = c * CELL_SIZE, r * CELL_SIZE
-            x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
+            x1, y1 = c * size, r * size
+            x2, y2 = x1 + size, y1 + size
             color = color_map[START] if tag == "S" else color_map[GOAL]
             self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline='black')
-            self.canvas.create_text(x1 + CELL_SIZE/2, y1 + CELL_SIZE/2, text=tag, fill='white', font=TITLE_FONT_STYLE)
+            if with_text:
+                self.canvas.create_text(x1 + size/2, y1 + size/2, text=tag, fill='white', font=TITLE_FONT_STYLE)
 
         self.master.update_idletasks()
         self.master.update()
@@ -289,103 +463,37 @@ class BidirectionalWaveSearchApp:
 
     def get_neighbors(self, r, c, operator):
         # Повертає список дійсних сусідів для вузла згідно оператора
-        operator_map = {
-            "Cardinal (ВВВЛ)": [(0, 1), (0, -1), (1, 0), (-1, 0)],
-            "Diagonal (Діагоналі)": [(1, 1), (1, -1), (-1, 1), (-1, -1)],
-            "Combined (Комбінований)": [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
-        }
-        directions = operator_map.get(operator, operator_map["Cardinal (ВВВЛ)"])
-        neighbors = []
-        for dr, dc in directions:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < self.rows and 0 <= nc < self.cols and self.grid[nr][nc] != WALL:
-                neighbors.append((nr, nc))
-        return neighbors
+        return maze_search.grid_neighbors(self.grid, r, c, operator)
 
     def reconstruct_path(self, parent_map, current_node):
         # Відновлює шлях, рухаючись назад по словнику parent
-        path = []
-        while current_node is not None:
-            path.append(current_node)
-            current_node = parent_map.get(current_node)
-        return path
+        return maze_search.reconstruct_path(parent_map, current_node)
 
     def bidirectional_wave_search(self, start_node, goal_node, operator):
-        # Основний алгоритм двонаправленого пошуку
-        
-        if self.grid[start_node[0]][start_node[1]] == WALL or self.grid[goal_node[0]][goal_node[1]] == WALL:
-            return None, 0, {}, {}
-            
-        queue_start = deque([start_node])
-        visited_start = {start_node}
-        parent_start = {start_node: None}
-        
-        queue_goal = deque([goal_node])
-        visited_goal = {goal_node}
-        parent_goal = {goal_node: None}
-        
-        cycles = 0
-        intersection_node = None
+        # Основний алгоритм двонаправленого пошуку (сам алгоритм — у maze_search)
         delay = self.delay_scale.get()
-        self.search_running = True
+        tr = self.tracer
 
-        while queue_start and queue_goal:
-            
-            # --- Крок від Старту ---
-            if queue_start:
-                cycles += 1
-                current_start = queue_start.popleft()
-                
-                # Візуалізація показчика СТАРТУ
-                if delay > 0:
-                    self.draw_labyrinth(visited_start=visited_start, visited_goal=visited_goal, highlight_node=current_start)
-                    self.master.after(delay)
-                
-                if current_start in visited_goal:
-                    intersection_node = current_start
-                    break 
-
-                for neighbor in self.get_neighbors(current_start[0], current_start[1], operator):
-                    if neighbor not in visited_start:
-                        visited_start.add(neighbor)
-                        parent_start[neighbor] = current_start
-                        queue_start.append(neighbor)
-            
-            # --- Крок від Цілі ---
-            if queue_goal:
-                cycles += 1
-                current_goal = queue_goal.popleft()
-                
-                # Візуалізація показчика ЦІЛІ
-                if delay > 0:
-                    self.draw_labyrinth(visited_start=visited_start, visited_goal=visited_goal, highlight_node=current_goal)
-                    self.master.after(delay)
-
-                if current_goal in visited_start:
-                    intersection_node = current_goal
-                    break 
+        def on_expand(state, node):
+            # Візуалізація показчика поточної вершини
+            if delay > 0:
+                with tr.phase('render') if tr else nullcontext():
+                    self.draw_labyrinth(visited_start=state.visited_start, visited_goal=state.visited_goal, highlight_node=node)
+                self.master.after(delay)
 
-                for neighbor in self.get_neighbors(current_goal[0], current_goal[1], operator):
-                    if neighbor not in visited_goal:
-                        visited_goal.add(neighbor)
-                        parent_goal[neighbor] = current_goal
-                        queue_goal.append(neighbor)
-
-        self.search_running = False
-        
-        # Відновлення шляху
-        if intersection_node:
-            path_from_start = self.reconstruct_path(parent_start, intersection_node)
-            path_from_start.reverse() 
-            path_from_goal = self.reconstruct_path(parent_goal, intersection_node)
-            final_path = path_from_start + path_from_goal[1:]
-            return final_path, cycles, visited_start, visited_goal
-            
-        # Шлях не знайдено
-        return None, cycles, visited_start, visited_goal
+        self.search_running = True
+        try:
+            if self.parallel_var.get() and not isinstance(self.grid, TiledMaze):
+                return parallel_wave.parallel_wave_search(self.grid, start_node, goal_node, operator)
+            return maze_search.bidirectional_wave_search(self.grid, start_node, goal_node, operator,
+                                                         on_expand=on_expand, tracer=tr, state=self.wave_state())
+        finally:
+            self.search_running = False
 
     def start_search(self):
         # Головна функція, що запускає пошук та вимірює час
+        if not self.maze_ready():
+            return
         if self.search_running:
             messagebox.showinfo("Увага", "Пошук вже триває.")
             return
@@ -397,10 +505,49 @@ class BidirectionalWaveSearchApp:
 
         operator = self.operator_var.get()
         
+        tr = self.tracer
+        if tr:
+            tr.begin("bidirectional_wave", start=self.start_node, goal=self.goal_node, operator=operator,
+                     rows=self.rows, cols=self.cols, wall_density=self.wall_density)
         start_time = time.time()
-        path, cycles, visited_s, visited_g = self.bidirectional_wave_search(self.start_node, self.goal_node, operator)
+        key = self.result_key(operator)
+        cached = self.results.get(key) if key is not None else None
+        if cached is not None:
+            self.finish_search(*cached, time.time() - start_time, operator, cached=True)
+            return
+        if self.turbo_var.get() and not (self.dstar_var.get() or self.index_var.get() or self.parallel_var.get()):
+            self.start_turbo_search(operator, start_time, key)
+            return
+        with tr.phase('search') if tr else nullcontext():
+            if self.dstar_var.get():
+                path, cycles, visited_s, visited_g = self.planned_search(operator)
+            elif self.index_var.get() and not isinstance(self.grid, TiledMaze):
+                path, cycles, visited_s, visited_g = self.indexed_search(operator)
+            else:
+                path, cycles, visited_s, visited_g = self.bidirectional_wave_search(self.start_node, self.goal_node, operator)
         end_time = time.time()
-        search_time = end_time - start_time
+        if key is not None:
+            self.remember_result(key, path, cycles, visited_s, visited_g)
+        self.finish_search(path, cycles, visited_s, visited_g, end_time - start_time, operator)
+
+    def result_key(self, operator):
+        # Ключ кешу результатів; D* Lite не кешується: його стан і так зберігається між запитами
+        if self.dstar_var.get():
+            return None
+        tiled = isinstance(self.grid, TiledMaze)
+        if self.index_var.get() and not tiled:
+            mode = 'index'
+        elif self.parallel_var.get() and not tiled:
+            mode = 'parallel'
+        else:
+            mode = 'wave'
+        return self.results.key(self.start_node, self.goal_node, operator, mode)
+
+    def finish_search(self, path, cycles, visited_s, visited_g, search_time, operator, cached=False):
+        tr = self.tracer
+        if tr:
+            tr.end(found=bool(path), cycles=cycles, path_len=len(path) if path else 0,
+                   visited=len(visited_s) + len(visited_g), cached=cached)
         
         self.cycles = cycles
         self.path_result = path
@@ -411,9 +558,145 @@ class BidirectionalWaveSearchApp:
         else:
             self.draw_labyrinth(visited_start=visited_s, visited_goal=visited_g) 
             message = "Шлях не знайдено."
+        if cached:
+            message += " (з кешу)"
         
         self.update_results(message, search_time, len(path) if path else 0, operator)
     
+    def start_turbo_search(self, operator, start_time, key=None):
+        # Хвильовий пошук подіями через TurboScheduler; результат — у finish_search після останнього кадру
+        space = maze_search.as_space(self.grid, operator)
+        if not space.is_open(self.start_node) or not space.is_open(self.goal_node):
+            self.finish_search(None, 0, set(), set(), time.time() - start_time, operator)
+            return
+        tr = self.tracer
+        st = self.wave_state()
+        events = maze_search.wave_search_events(space, self.start_node, self.goal_node, operator, st, tr)
+        current = [self.start_node]
+
+        def step():
+            with tr.phase('search') if tr else nullcontext():
+                action, cell = next(events)
+            if action == 'expand_s' or action == 'expand_g':
+                current[0] = cell
+            return action != 'meet' and action != 'not_found'
+
+        def render(steps, finished):
+            if not finished:
+                with tr.phase('render') if tr else nullcontext():
+                    self.draw_labyrinth(visited_start=st.visited_start, visited_goal=st.visited_goal,
+                                        highlight_node=current[0])
+
+        def done():
+            self.search_running = False
+            path = st.path()
+            if key is not None:
+                self.remember_result(key, path, st.cycles, st.visited_start, st.visited_goal)
+            self.finish_search(path, st.cycles, st.visited_start, st.visited_goal,
+                               time.time() - start_time, operator)
+
+        try:
+            rate = max(0, int(self.turbo_rate_entry.get()))
+        except ValueError:
+            rate = 0
+        self.search_running = True
+        self.scheduler = TurboScheduler(self.master, step, render, steps_per_sec=rate, on_done=done)
+        self.scheduler.start()
+
+    def planned_search(self, operator):
+        # Новий планувальник лише при зміні цілі чи оператора; зсув старту — через move_start
+        p = self.planner
+        if p is None or p.operator != operator or p.goal != self.goal_node:
+            p = self.planner = DStarLite(self.grid, self.start_node, self.goal_node, operator)
+        elif p.start != self.start_node:
+            p.move_start(self.start_node)
+        path, expanded = p.plan()
+        return path, expanded, set(), set()
+
+    def indexed_search(self, operator):
+        # Запит через MazeIndex: різні компоненти — відповідь одразу, інакше A* по точках рішення
+        index = self.indexes.get(operator)
+        if index is None:
+            index = self.indexes[operator] = MazeIndex(self.grid, operator)
+        path, settled = index.shortest_path(self.start_node, self.goal_node)
+        return path, settled, set(), set()
+
+    def search_store(self):
+        # Плитковому лабіринту — хвилі на диску (див. MAX_SIZE): set/dict по ~200 байт на клітинку
+        # вичерпали б пам'ять задовго до того, як хвилі перетнуть лабіринт
+        if not isinstance(self.grid, TiledMaze):
+            return None
+        rows, cols = self.rows, self.cols
+        return lambda: GridStore(rows, cols, mmap=True)
+
+    def wave_state(self):
+        # Стан хвиль нового пошуку. Хвилі попереднього пошуку на диску вже ніхто не малює
+        # (start_search спершу перемальовує полотно), тож їхні файли закриваються тут
+        self.close_waves()
+        st = maze_search.WaveState(self.start_node, self.goal_node, self.search_store())
+        if isinstance(self.grid, TiledMaze):
+            self.waves = st
+        return st
+
+    def close_waves(self):
+        if self.waves is not None:
+            self.waves.close()
+            self.waves = None
+
+    def remember_result(self, key, path, cycles, visited_s, visited_g):
+        # Хвилі на диску закриє наступний пошук, тож для них кеш тримає лише шлях і кількість циклів
+        if self.waves is not None and visited_s is self.waves.visited_start:
+            visited_s, visited_g = set(), set()
+        self.results.put(key, (path, cycles, visited_s, visited_g))
+
+    def background_grid(self):
+        # Лабіринт для фонового потоку: плитковому — власний дескриптор лише для читання,
+        # бо кеш плиток спільного TiledMaze не потокобезпечний (правки спершу скидаються у файл)
+        return self.grid.reader() if isinstance(self.grid, TiledMaze) else self.grid
+
+    def run_query_batch(self):
+        # Багато випадкових пар (S, G) на поточному лабіринті через пул процесів; показує пропускну здатність
+        if not self.maze_ready():
+            return
+        if self.search_running:
+            messagebox.showinfo("Увага", "Пошук вже триває.")
+            return
+        count = simpledialog.askinteger("Пакет Запитів", "Кількість пар (S, G):", initialvalue=100,
+                                        minvalue=1, maxvalue=100000, parent=self.master)
+        if not count:
+            return
+        rng = random.Random()
+        queries = []
+        while len(queries) < count:
+            s = (rng.randrange(self.rows), rng.randrange(self.cols))
+            g = (rng.randrange(self.rows), rng.randrange(self.cols))
+            if self.grid[s[0]][s[1]] != WALL and self.grid[g[0]][g[1]] != WALL:
+                queries.append((s, g))
+        operator = self.operator_var.get()
+        grid = self.background_grid()
+        started = time.time()
+        self.search_running = True
+
+        def job():
+            try:
+                return parallel_wave.batch_wave_search(grid, queries, operator)
+            finally:
+                if isinstance(grid, TiledMaze):
+                    grid.close()
+
+        def done(results):
+            self.search_running = False
+            elapsed = time.time() - started
+            found = sum(1 for path, _ in results if path)
+            self.update_results(f"Пакет: знайдено {found}/{count} шляхів, {count / max(elapsed, 1e-9):.1f} запитів/сек",
+                                elapsed, 0, operator)
+
+        def failed(exc):
+            self.search_running = False
+            messagebox.showerror("Помилка", f"Пакет запитів не виконано: {exc}")
+
+        run_in_background(self.master, job, done, failed)
+
     def update_results(self, message="Очікування запуску", time=0.0, path_len=0, operator="N/A"):
         # Форматує та виводить статистику пошуку у текстове вікно
         self.results_text.config(state=tk.NORMAL)
@@ -426,6 +709,7 @@ class BidirectionalWaveSearchApp:
         output += f"Цикли (Розкриття Вершин): {self.cycles}\n"
         output += f"Довжина шляху (Віддаль): {path_len}\n" 
         output += f"Розмір Лабіринту: {self.rows}x{self.cols}\n"
+        output += f"Кеш результатів: {self.results.describe()}\n"
         
         if self.path_result:
             output += "\nКоординати Знайденого Шляху (частина):\n"
@@ -437,8 +721,122 @@ class BidirectionalWaveSearchApp:
         self.results_text.insert(tk.END, output)
         self.results_text.config(state=tk.DISABLED)
 
+    def record_trace(self):
+        # Записує пошук без візуалізації (на повній швидкості)
+        if not self.maze_ready():
+            return
+        if self.search_running or self.replay_running:
+            messagebox.showinfo("Увага", "Пошук вже триває.")
+            return
+        if self.rows * self.cols > 2**31 - 1:
+            messagebox.showerror("Помилка", "Траса кодує клітинки як int32: лабіринт завеликий для запису.")
+            return
+        operator = self.operator_var.get()
+        self.trace = record_wave_search(self.grid, self.start_node, self.goal_node, operator)
+        self.attach_trace()
+        messagebox.showinfo("Траса", f"Записано {len(self.trace)} подій за {self.trace.meta['record_seconds']:.4f} сек "
+                                     f"({self.trace.nbytes} байт)")
+
+    def attach_trace(self):
+        self.trace_player = wave_player(self.trace)
+        self.trace_scale.config(to=max(0, len(self.trace) - 1))
+        self.trace_scale.set(0)
+
+    def save_trace(self):
+        if self.trace is None:
+            messagebox.showerror("Помилка", "Спочатку запишіть трасу.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension='.srtr', filetypes=[('Search trace', '*.srtr')])
+        if path:
+            self.trace.save(path)
+
+    def export_animation(self):
+        # Рендер кадрів без Tk у процесах; вікно лишається чутливим
+        if self.trace is None:
+            messagebox.showerror("Помилка", "Спочатку запишіть трасу.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension='.gif',
+                                            filetypes=[('GIF animation', '*.gif'), ('MP4 video', '*.mp4')])
+        if not path:
+            return
+        trace, grid, started = self.trace, self.background_grid(), time.time()
+
+        def job():
+            try:
+                return export_maze_trace(trace, grid, path)
+            finally:
+                if isinstance(grid, TiledMaze):
+                    grid.close()
+
+        def done(frames):
+            messagebox.showinfo("Експорт", f"Записано {frames} кадрів за {time.time() - started:.1f} сек: {path}")
+
+        def failed(exc):
+            messagebox.showerror("Помилка", f"Експорт не вдався: {exc}")
+
+        run_in_background(self.master, job, done, failed)
+
+    def load_trace(self):
+        path = filedialog.askopenfilename(filetypes=[('Search trace', '*.srtr')])
+        if not path:
+            return
+        try:
+            trace = SearchTrace.load(path)
+        except Exception as e:
+            messagebox.showerror("Помилка", f"Не вдалося прочитати трасу: {e}")
+            return
+        if (trace.meta.get("rows"), trace.meta.get("cols")) != (self.rows, self.cols):
+            messagebox.showerror("Помилка", "Траса записана для лабіринту іншого розміру.")
+            return
+        self.trace = trace
+        self.start_node, self.goal_node = tuple(trace.meta["start"]), tuple(trace.meta["goal"])
+        self.attach_trace()
+
+    def draw_trace_state(self, state):
+        # Малює стан траси: шлях після зустрічі хвиль, інакше хвилі та показчик
+        w = state.wave
+        path = w.path()
+        if path:
+            self.draw_labyrinth(path=path)
+        else:
+            self.draw_labyrinth(visited_start=w.visited_start, visited_goal=w.visited_goal, highlight_node=state.highlight)
+
+    def on_trace_scrub(self, value):
+        if self.trace_player is None or self.replay_running:
+            return
+        self.draw_trace_state(self.trace_player.seek(int(float(value))))
+
+    def toggle_replay(self):
+        # Запускає/зупиняє анімацію записаної траси зі швидкістю повзунка затримки
+        if self.trace_player is None:
+            messagebox.showerror("Помилка", "Спочатку запишіть або завантажте трасу.")
+            return
+        self.replay_running = not self.replay_running
+        self.replay_button.config(text="Зупинити" if self.replay_running else "Відтворити")
+        if self.replay_running:
+            if self.trace_player.finished:
+                self.trace_player.seek(-1)
+            self.replay_step()
+
+    def replay_step(self):
+        if not self.replay_running:
+            return
+        state = self.trace_player.step()
+        self.trace_scale.set(self.trace_player.position)
+        self.draw_trace_state(state)
+        if self.trace_player.finished:
+            self.replay_running = False
+            self.replay_button.config(text="Відтворити")
+            return
+        self.master.after(max(1, self.delay_scale.get()), self.replay_step)
+
     def show_adjacency_matrix(self):
         # Генерує та показує N x N матрицю суміжності
+        if not self.maze_ready():
+            return
+        if self.rows > 50 or self.cols > 50:
+            messagebox.showinfo("Увага", "Матриця суміжності доступна лише для лабіринтів до 50x50.")
+            return
         node_map = {}
         idx = 0
         passage_nodes = []
@@ -501,4 +899,5 @@ class BidirectionalWaveSearchApp:
 if __name__ == "__main__":
     root = tk.Tk()
     app = BidirectionalWaveSearchApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_close)
     root.mainloop()
\ No newline at end of file
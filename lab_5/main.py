@@ -1,9 +1,35 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.image as mpimg
+from tkinter import filedialog, messagebox, ttk
+import os
+import sys
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from search_common.instrumentation import tracer_from_env
+from search_common.background import run_in_background
+from search_common.startup import StartupTimer
+from search_common.result_cache import ResultCache
+
+# Важкі модулі (networkx, matplotlib) імпортуються у фоновому потоці, щоб вікно з'являлося одразу
+nx = plt = FigureCanvasTkAgg = ImagePyramid = None
+ROUTE_ALGORITHMS = dijkstra_route = None
+BG_ALPHA = 0.8  # прозорість фону (накладається на білий один раз при побудові піраміди)
+# Накладка аналітики на карту: назва -> атрибут RoadAnalytics
+OVERLAYS = {"Немає": None, "Посередництво": "betweenness", "Близькість": "closeness"}
+
+
+def import_heavy():
+    global nx, plt, FigureCanvasTkAgg, ImagePyramid, ROUTE_ALGORITHMS, dijkstra_route
+    if nx is not None:
+        return
+    import matplotlib.pyplot
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as canvas_cls
+    import networkx
+    import routing
+    import map_pyramid
+    plt, FigureCanvasTkAgg, ImagePyramid = matplotlib.pyplot, canvas_cls, map_pyramid.ImagePyramid
+    ROUTE_ALGORITHMS, dijkstra_route = routing.ROUTE_ALGORITHMS, routing.dijkstra_route
+    nx = networkx
 
 class RoadMapApp:
     def __init__(self, root):
@@ -11,135 +37,52 @@ class RoadMapApp:
         self.root.title("Лабораторна робота 5: Навігатор Україною")
         self.root.geometry("1400x900")
 
-        self.graph = nx.Graph()
-        self.pos = {} 
+        self.graph = None
+        self.pos = {}
+        self.ax = None
         
         # Параметри фону
         self.bg_x = 0.0
         self.bg_y = 0.0
         self.bg_scale = 1.0
         self.background_image_path = "ukraine_map.png" 
-        self.bg_image = None
+        # Піраміда фону (альфа вже накладена) і поточне зображення фону на осях
+        self.bg_pyramid = None
+        self.bg_artist = None
 
-        self.load_full_data()
+        # Трасування пошуку (вмикається змінною оточення SEARCH_TRACE)
+        self.tracer = tracer_from_env()
+        # Кеш маршрутів: (версія графа, алгоритм, звідки, куди) -> (маршрут, еталон Дейкстри)
+        self.routes = ResultCache()
+        # Центральність і вразливість мережі (рахується на вимогу, далі оновлюється інкрементно)
+        self.analytics = None
+
+        self.dragging_node = None
+        self.startup = StartupTimer(root, "road_map")
         self.create_widgets()
-        self.load_background_image()
+        # Розбір даних, імпорт matplotlib/networkx та декодування PNG — у фоні
+        run_in_background(self.root, self.load_data, self.attach_data,
+                          lambda e: messagebox.showerror("Помилка", f"Не вдалося завантажити дані: {e}"))
+
+    def load_data(self):
+        # Виконується у фоновому потоці: жодних звернень до Tk
+        import_heavy()
+        from road_data import build_road_graph
+        graph, pos = build_road_graph()
+        return graph, pos, self.load_background_image()
+
+    def attach_data(self, result):
+        self.graph, self.pos, self.bg_pyramid = result
+        self.create_canvas()
+        self.algo_combo['values'] = list(ROUTE_ALGORITHMS)
+        self.update_combos()
         self.draw_graph()
 
         # Події миші
-        self.dragging_node = None
         self.cid_press = self.figure.canvas.mpl_connect('button_press_event', self.on_press)
         self.cid_motion = self.figure.canvas.mpl_connect('motion_notify_event', self.on_motion)
         self.cid_release = self.figure.canvas.mpl_connect('button_release_event', self.on_release)
-
-    def load_full_data(self):
-        # Базові зв'язки (можна редагувати через інтерфейс)
-        roads = [
-            ("Ужгород", "Мукачево", 40), ("Мукачево", "Іршава", 25), 
-            ("Мукачево", "Львів", 220), ("Львів", "Тернопіль", 128), 
-            ("Львів", "Івано-Франківськ", 134), ("Львів", "Луцьк", 152), 
-            ("Львів", "Рівне", 211), ("Луцьк", "Рівне", 75), 
-            ("Луцьк", "Ковель", 65), ("Ковель", "Сарни", 130), 
-            ("Сарни", "Коростень", 100), ("Рівне", "Житомир", 189), 
-            ("Тернопіль", "Хмельницький", 112), ("Тернопіль", "Рівне", 160),
-            ("Тернопіль", "Чернівці", 175), ("Івано-Франківськ", "Чернівці", 135),
-            ("Хмельницький", "Вінниця", 120), ("Хмельницький", "Житомир", 155),
-            ("Житомир", "Київ", 141), ("Житомир", "Вінниця", 129),
-            ("Вінниця", "Умань", 160), ("Вінниця", "Біла Церква", 125),
-            ("Київ", "Біла Церква", 85), ("Київ", "Чернігів", 149),
-            ("Київ", "Черкаси", 192), ("Київ", "Пирятин", 155),
-            ("Біла Церква", "Умань", 125), ("Черкаси", "Сміла", 30),
-            ("Сміла", "Кропивницький", 105), ("Сміла", "Умань", 155),
-            ("Черкаси", "Кременчук", 130), ("Умань", "Кропивницький", 168),
-            ("Умань", "Одеса", 271), ("Умань", "Первомайськ", 85),
-            ("Кропивницький", "Кривий Ріг", 120), ("Кропивницький", "Дніпро", 180),
-            ("Кропивницький", "Олександрія", 75),
-            ("Чернігів", "Суми", 180), ("Суми", "Харків", 185), ("Чернігів", "Прилуки", 130),
-            ("Пирятин", "Полтава", 185), ("Полтава", "Харків", 145),
-            ("Полтава", "Кременчук", 115), ("Полтава", "Дніпро", 195),
-            ("Харків", "Дніпро", 220), ("Харків", "Ізюм", 125),
-            ("Дніпро", "Запоріжжя", 86), ("Дніпро", "Кривий Ріг", 145),
-            ("Дніпро", "Донецьк", 250), ("Дніпро", "Кам'янське", 40), ("Дніпро", "Павлоград", 75),
-            ("Одеса", "Миколаїв", 133), ("Миколаїв", "Херсон", 71),
-            ("Первомайськ", "Миколаїв", 165), ("Херсон", "Мелітополь", 230),
-            ("Херсон", "Сімферополь", 280), 
-            ("Запоріжжя", "Мелітополь", 120), ("Запоріжжя", "Маріуполь", 225),
-            ("Мелітополь", "Маріуполь", 170), ("Мелітополь", "Сімферополь", 240),
-            ("Ізюм", "Слов'янськ", 50), ("Слов'янськ", "Донецьк", 110),
-            ("Слов'янськ", "Луганськ", 160), ("Донецьк", "Луганськ", 150),
-            ("Донецьк", "Маріуполь", 115), ("Луганськ", "Ізварине", 60),
-            ("Сімферополь", "Севастополь", 80), ("Сімферополь", "Ялта", 85), 
-            ("Сімферополь", "Керч", 210), ("Севастополь", "Ялта", 80),
-            ("Конотоп", "Суми", 120), ("Конотоп", "Чернігів", 150)
-        ]
-        for u, v, w in roads:
-            self.graph.add_edge(u, v, weight=w)
-
-        self.pos = {
-          "Ужгород": (0.010, 0.549),
-          "Мукачево": (0.044, 0.548),
-          "Іршава": (0.075, 0.486),
-          "Львів": (0.114, 0.683),
-          "Івано-Франківськ": (0.139, 0.567),
-          "Тернопіль": (0.192, 0.635),
-          "Чернівці": (0.204, 0.475),
-          "Луцьк": (0.188, 0.785),
-          "Рівне": (0.235, 0.760),
-          "Ковель": (0.167, 0.837),
-          "Сарни": (0.261, 0.867),
-          "Коростень": (0.363, 0.801),
-          "Хмельницький": (0.271, 0.612),
-          "Кам'янець-Подільський": (0.286, 0.515),
-          "Житомир": (0.363, 0.708),
-          "Вінниця": (0.350, 0.579),
-          "Біла Церква": (0.446, 0.654),
-          "Київ": (0.450, 0.730),
-          "Чернігів": (0.560, 0.900),
-          "Прилуки": (0.566, 0.754),
-          "Черкаси": (0.538, 0.605),
-          "Сміла": (0.506, 0.598),
-          "Умань": (0.448, 0.530),
-          "Кропивницький": (0.555, 0.499),
-          "Олександрія": (0.605, 0.526),
-          "Конотоп": (0.609, 0.826),
-          "Суми": (0.685, 0.786),
-          "Пирятин": (0.648, 0.722),
-          "Полтава": (0.679, 0.628),
-          "Кременчук": (0.620, 0.570),
-          "Харків": (0.766, 0.689),
-          "Ізюм": (0.910, 0.600),
-          "Дніпро": (0.709, 0.495),
-          "Кам'янське": (0.685, 0.517),
-          "Павлоград": (0.759, 0.529),
-          "Кривий Ріг": (0.622, 0.434),
-          "Запоріжжя": (0.715, 0.431),
-          "Нікополь": (0.678, 0.396),
-          "Донецьк": (0.868, 0.458),
-          "Краматорськ": (0.849, 0.548),
-          "Слов'янськ": (0.929, 0.583),
-          "Луганськ": (0.946, 0.541),
-          "Маріуполь": (0.862, 0.356),
-          "Бердянськ": (0.819, 0.322),
-          "Мелітополь": (0.743, 0.307),
-          "Первомайськ": (0.489, 0.443),
-          "Одеса": (0.473, 0.255),
-          "Миколаїв": (0.542, 0.318),
-          "Херсон": (0.579, 0.277),
-          "Ізмаїл": (0.420, 0.120),
-          "Сімферополь": (0.671, 0.082),
-          "Севастополь": (0.638, 0.039),
-          "Євпаторія": (0.628, 0.112),
-          "Ялта": (0.685, 0.034),
-          "Керч": (0.813, 0.139),
-          "Ізварине": (0.965, 0.489),
-        }
-        
-        # Додаємо вузли, яких немає в списку доріг, але є в координатах
-        for node in self.pos:
-            if node not in self.graph: self.graph.add_node(node)
-        # І навпаки
-        for node in self.graph.nodes():
-            if node not in self.pos: self.pos[node] = (0.5, 0.5)
+        self.startup.ready()
 
     def create_widgets(self):
         # --- ЛІВА ПАНЕЛЬ ---
@@ -171,17 +114,22 @@ class RoadMapApp:
         path_frame = tk.LabelFrame(left_panel, text="Пошук маршруту", bg="#f0f0f0")
         path_frame.pack(fill=tk.X, pady=5)
 
-        self.start_combo = ttk.Combobox(path_frame, values=sorted(self.graph.nodes()))
+        self.start_combo = ttk.Combobox(path_frame, values=[])
         self.start_combo.set("Ужгород")
         self.start_combo.pack(fill=tk.X, pady=2)
 
-        self.end_combo = ttk.Combobox(path_frame, values=sorted(self.graph.nodes()))
+        self.end_combo = ttk.Combobox(path_frame, values=[])
         self.end_combo.set("Луганськ")
         self.end_combo.pack(fill=tk.X, pady=2)
 
+        tk.Label(path_frame, text="Алгоритм:", bg="#f0f0f0", font=("Arial", 8)).pack(anchor="w")
+        self.algo_combo = ttk.Combobox(path_frame, values=["Дейкстра"], state="readonly")
+        self.algo_combo.set("Дейкстра")
+        self.algo_combo.pack(fill=tk.X, pady=2)
+
         tk.Button(path_frame, text="ЗНАЙТИ ШЛЯХ", command=self.find_path, bg="green", fg="white").pack(fill=tk.X, pady=5)
 
-        self.result_text = tk.Text(left_panel, height=6, width=35, font=("Consolas", 9))
+        self.result_text = tk.Text(left_panel, height=8, width=35, font=("Consolas", 9))
         self.result_text.pack(pady=5)
 
         # 3. Додавання міста/дороги
@@ -206,11 +154,40 @@ class RoadMapApp:
         del_frame = tk.LabelFrame(left_panel, text="Видалити місто", bg="#f0f0f0")
         del_frame.pack(fill=tk.X, pady=5)
         
-        self.del_combo = ttk.Combobox(del_frame, values=sorted(self.graph.nodes()))
+        self.del_combo = ttk.Combobox(del_frame, values=[])
         self.del_combo.pack(fill=tk.X, pady=2)
         tk.Button(del_frame, text="Видалити", command=self.remove_node_gui, bg="#ffcccb").pack(fill=tk.X)
 
-        # 5. ІНСТРУМЕНТ ДЛЯ ЗЧИТУВАННЯ КООРДИНАТ
+        # 5. Маршрут через кілька міст (початок — місто «звідки» з пошуку маршруту)
+        tour_frame = tk.LabelFrame(left_panel, text="Маршрут доставки", bg="#f0f0f0")
+        tour_frame.pack(fill=tk.X, pady=5)
+
+        tk.Label(tour_frame, text="Зупинки (Ctrl/Shift — кілька):", bg="#f0f0f0", font=("Arial", 8)).pack(anchor="w")
+        self.stops_list = tk.Listbox(tour_frame, selectmode=tk.EXTENDED, height=5, exportselection=False)
+        self.stops_list.pack(fill=tk.X)
+        self.tour_closed = tk.BooleanVar(value=True)
+        tk.Checkbutton(tour_frame, text="Повернутися на початок", variable=self.tour_closed, bg="#f0f0f0").pack(anchor="w")
+        tk.Button(tour_frame, text="Оптимізувати порядок", command=self.plan_tour_gui).pack(fill=tk.X, pady=2)
+
+        # 6. Аналітика мережі
+        stats_frame = tk.LabelFrame(left_panel, text="Аналітика мережі", bg="#f0f0f0")
+        stats_frame.pack(fill=tk.X, pady=5)
+
+        tk.Label(stats_frame, text="Вибірка джерел (0 — усі):", bg="#f0f0f0", font=("Arial", 8)).pack(anchor="w")
+        self.entry_samples = tk.Entry(stats_frame)
+        self.entry_samples.insert(0, "0")
+        self.entry_samples.pack(fill=tk.X)
+        self.analytics_button = tk.Button(stats_frame, text="Обчислити центральність", command=self.compute_analytics)
+        self.analytics_button.pack(fill=tk.X, pady=2)
+
+        tk.Label(stats_frame, text="Розмір і колір міст:", bg="#f0f0f0", font=("Arial", 8)).pack(anchor="w")
+        self.overlay_combo = ttk.Combobox(stats_frame, values=list(OVERLAYS), state="readonly")
+        self.overlay_combo.set("Немає")
+        self.overlay_combo.bind("<<ComboboxSelected>>", lambda _: self.draw_graph())
+        self.overlay_combo.pack(fill=tk.X, pady=2)
+        tk.Button(stats_frame, text="Експорт CSV", command=self.export_analytics).pack(fill=tk.X, pady=2)
+
+        # 7. ІНСТРУМЕНТ ДЛЯ ЗЧИТУВАННЯ КООРДИНАТ
         tk.Label(left_panel, text="Інструменти розробника:", font=("Arial", 10, "bold"), bg="#f0f0f0", fg="gray").pack(pady=(20, 0))
         tk.Button(left_panel, text="🖨 ВИВЕСТИ КООРДИНАТИ В КОНСОЛЬ", command=self.print_coordinates, bg="black", fg="white").pack(fill=tk.X, pady=5)
         tk.Label(left_panel, text="(Після перетягування натисніть цю кнопку,\nскопіюйте текст з консолі і вставте в код)", font=("Arial", 8), bg="#f0f0f0").pack()
@@ -218,36 +195,59 @@ class RoadMapApp:
         # --- ПРАВА ПАНЕЛЬ (Карта) ---
         self.canvas_frame = tk.Frame(self.root, bg="white")
         self.canvas_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
-        
+        self.loading_label = tk.Label(self.canvas_frame, text="Завантаження карти...", font=("Arial", 14), bg="white")
+        self.loading_label.pack(expand=True)
+
+    def create_canvas(self):
+        self.loading_label.destroy()
         self.figure, self.ax = plt.subplots(figsize=(10, 10))
         self.canvas = FigureCanvasTkAgg(self.figure, master=self.canvas_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
     def load_background_image(self):
         try:
-            self.bg_image = mpimg.imread(self.background_image_path)
+            # Рівні зі зменшеною роздільністю кешуються на диску за хешем файлу
+            return ImagePyramid.load(self.background_image_path, alpha=BG_ALPHA)
         except Exception:
             print("Фон не знайдено.")
+            return None
 
     def update_bg(self, _=None):
         self.bg_scale = self.scale_slider.get()
         self.bg_x = self.offset_x_slider.get()
         self.bg_y = self.offset_y_slider.get()
-        self.draw_graph()
+        if self.bg_artist is None:
+            self.draw_graph()
+            return
+        # Калібрування зачіпає лише фон: міняємо рівень і межі наявного зображення без перемальовування графа
+        self.bg_artist.set_data(self.background_level())
+        self.bg_artist.set_extent(self.bg_extent())
+        self.canvas.draw_idle()
+
+    def bg_extent(self):
+        return [self.bg_x, self.bg_scale + self.bg_x, self.bg_y, self.bg_scale + self.bg_y]
+
+    def background_level(self):
+        # Фон займає bg_scale ширини й висоти осей — стільки екранних пікселів і треба
+        box = self.ax.bbox
+        return self.bg_pyramid.level_for(box.width * self.bg_scale, box.height * self.bg_scale)
 
     def draw_graph(self, path_edges=None):
+        if self.ax is None:
+            return
         self.ax.clear()
-        
+        self.bg_artist = None
+
         # Малюємо фон
-        if self.bg_image is not None:
-            left = 0.0 + self.bg_x
-            right = (1.0 * self.bg_scale) + self.bg_x
-            bottom = 0.0 + self.bg_y
-            top = (1.0 * self.bg_scale) + self.bg_y
-            self.ax.imshow(self.bg_image, extent=[left, right, bottom, top], aspect='auto', alpha=0.8)
+        if self.bg_pyramid is not None:
+            self.bg_artist = self.ax.imshow(self.background_level(), extent=self.bg_extent(), aspect='auto')
 
         # Малюємо граф
-        nx.draw_networkx_nodes(self.graph, self.pos, ax=self.ax, node_size=200, node_color='#2196F3', edgecolors='white')
+        metric = OVERLAYS.get(self.overlay_combo.get())
+        if metric and self.analytics is not None:
+            self.draw_analytics(getattr(self.analytics, metric))
+        else:
+            nx.draw_networkx_nodes(self.graph, self.pos, ax=self.ax, node_size=200, node_color='#2196F3', edgecolors='white')
         nx.draw_networkx_edges(self.graph, self.pos, ax=self.ax, edge_color='#555', alpha=0.6)
         
         # Підписи
@@ -265,24 +265,70 @@ class RoadMapApp:
         self.ax.set_ylim(0, 1)
         self.canvas.draw()
 
+    def draw_analytics(self, values):
+        # Розмір і колір — за метрикою; точки з'єднання обведені чорним, мости — пунктиром
+        nodes = list(self.graph.nodes())
+        top = max((values.get(n, 0.0) for n in nodes), default=0.0) or 1.0
+        scores = [values.get(n, 0.0) / top for n in nodes]
+        nx.draw_networkx_nodes(self.graph, self.pos, nodelist=nodes, ax=self.ax, node_size=[80 + 500 * x for x in scores],
+                               node_color=scores, cmap='plasma', vmin=0, vmax=1,
+                               edgecolors=['black' if n in self.analytics.articulation else 'white' for n in nodes],
+                               linewidths=[2 if n in self.analytics.articulation else 1 for n in nodes])
+        bridges = [(u, v) for u, v in self.analytics.bridges if self.graph.has_edge(u, v)]
+        if bridges:
+            nx.draw_networkx_edges(self.graph, self.pos, edgelist=bridges, ax=self.ax, edge_color='#FF9800', width=2,
+                                   style='dashed')
+
+    def data_ready(self):
+        if self.graph is None:
+            messagebox.showinfo("Зачекайте", "Дані ще завантажуються")
+            return False
+        return True
+
     def find_path(self):
+        if not self.data_ready():
+            return
         s, e = self.start_combo.get(), self.end_combo.get()
+        algo = self.algo_combo.get()
+        tr = self.tracer
+        if tr: tr.begin(algo, source=s, target=e, nodes=self.graph.number_of_nodes())
         try:
-            path = nx.dijkstra_path(self.graph, s, e, weight='weight')
-            dist = nx.dijkstra_path_length(self.graph, s, e, weight='weight')
-            path_edges = list(zip(path, path[1:]))
+            key = self.routes.key(algo, s, e)
+            cached = self.routes.get(key)
+            if cached is not None:
+                route, baseline = cached
+            else:
+                with tr.phase('search') if tr else nullcontext():
+                    route = ROUTE_ALGORITHMS[algo](self.graph, self.pos, s, e, tracer=tr)
+                # Дейкстра як еталон для порівняння кількості розкритих вершин
+                with tr.phase('baseline') if tr else nullcontext():
+                    baseline = route if algo == "Дейкстра" else dijkstra_route(self.graph, s, e)
+                self.routes.put(key, (route, baseline))
+            path_edges = list(zip(route.path, route.path[1:]))
             self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, f"{s} -> {e}\nВідстань: {dist} км\nМаршрут: {' -> '.join(path)}")
-            self.draw_graph(path_edges)
+            self.result_text.insert(tk.END, f"{s} -> {e} ({algo}){' з кешу' if cached else ''}\nВідстань: {route.distance} км\n"
+                                            f"Розкрито вершин: {route.expanded} (Дейкстра: {baseline.expanded})\n"
+                                            f"Маршрут: {' -> '.join(route.path)}\n"
+                                            f"Кеш: {self.routes.describe()}")
+            with tr.phase('render') if tr else nullcontext():
+                self.draw_graph(path_edges)
+            if tr: tr.end(distance=route.distance, expanded=route.expanded, baseline_expanded=baseline.expanded,
+                           cached=cached is not None)
         except:
+            if tr: tr.end(found=False)
             messagebox.showerror("Помилка", "Шлях не знайдено")
 
     def add_edge_gui(self):
+        if not self.data_ready():
+            return
         u, v, w_str = self.entry_u.get().strip(), self.entry_v.get().strip(), self.entry_w.get().strip()
         if u and v and w_str:
             try:
                 w = int(w_str)
                 self.graph.add_edge(u, v, weight=w)
+                self.routes.bump()
+                if self.analytics is not None:
+                    self.show_analytics(self.analytics.edge_added(u, v, w))
                 if u not in self.pos: self.pos[u] = (0.5, 0.5)
                 if v not in self.pos: self.pos[v] = (0.5, 0.5)
                 self.update_combos()
@@ -294,19 +340,103 @@ class RoadMapApp:
             messagebox.showerror("Помилка", "Заповніть всі поля")
 
     def remove_node_gui(self):
+        if not self.data_ready():
+            return
         node = self.del_combo.get()
         if node in self.graph:
             self.graph.remove_node(node)
             if node in self.pos: del self.pos[node]
+            self.routes.bump()
+            if self.analytics is not None:
+                self.show_analytics(self.analytics.node_removed(node))
             self.update_combos()
             self.draw_graph()
             messagebox.showinfo("Ок", f"Місто {node} видалено")
 
+    def plan_tour_gui(self):
+        if not self.data_ready():
+            return
+        from tour import plan_tour, tour_edges
+        start = self.start_combo.get()
+        stops = [start] + [self.stops_list.get(i) for i in self.stops_list.curselection()]
+        if len(set(stops)) < 2:
+            messagebox.showinfo("Маршрут", "Виберіть хоча б одну зупинку, крім початкової")
+            return
+        try:
+            result = plan_tour(self.graph, stops, closed=self.tour_closed.get())
+        except ValueError as e:
+            messagebox.showerror("Помилка", str(e))
+            return
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, f"Тур: {len(result.order) - self.tour_closed.get()} міст, {result.method}\n"
+                                        f"Довжина: {result.distance:.0f} км\n"
+                                        f"Порядок: {' -> '.join(result.order)}")
+        self.draw_graph(tour_edges(result))
+
+    def compute_analytics(self):
+        if not self.data_ready():
+            return
+        try:
+            samples = int(self.entry_samples.get() or 0)
+        except ValueError:
+            messagebox.showerror("Помилка", "Вибірка має бути цілим числом")
+            return
+        from road_analytics import RoadAnalytics
+        # Рахуємо на копії, щоб редагування карти під час обчислення не зачепило фоновий потік
+        analytics = RoadAnalytics(self.graph.copy(), samples=samples or None)
+        self.analytics_button.config(state=tk.DISABLED, text="Обчислення...")
+
+        def done(result):
+            self.analytics_button.config(state=tk.NORMAL, text="Обчислити центральність")
+            # Граф могли змінити, поки йшло обчислення — тоді рахуємо ще раз
+            if set(result.graph.edges(data='weight')) != set(self.graph.edges(data='weight')):
+                self.compute_analytics()
+                return
+            result.graph = self.graph
+            self.analytics = result
+            self.show_analytics("повний розрахунок" + (" (вибірка джерел)" if result.approximate else ""))
+            self.draw_graph()
+
+        def failed(e):
+            self.analytics_button.config(state=tk.NORMAL, text="Обчислити центральність")
+            messagebox.showerror("Помилка", f"Не вдалося обчислити: {e}")
+
+        run_in_background(self.root, analytics.compute, done, failed)
+
+    def show_analytics(self, note):
+        a = self.analytics
+        lines = [f"Аналітика: {note}"]
+        if a.diameter:
+            km, x, y = a.diameter
+            lines.append(f"Діаметр: {km} км ({x} — {y})" + (" ≥" if a.approximate else ""))
+        lines.append(f"Точки з'єднання: {', '.join(sorted(a.articulation)) or 'немає'}")
+        lines.append(f"Мости: {len(a.bridges)}")
+        lines.append("Топ-10 за посередництвом:")
+        lines += [f"{i}. {city}: {a.normalized_betweenness(city):.3f}"
+                  for i, (city, _) in enumerate(a.ranking(top=10), 1)]
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, "\n".join(lines))
+
+    def export_analytics(self):
+        if self.analytics is None:
+            messagebox.showinfo("Аналітика", "Спочатку обчисліть центральність")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
+        if path:
+            self.analytics.write_csv(path)
+            messagebox.showinfo("Експорт", f"Збережено: {path}")
+
     def update_combos(self):
         vals = sorted(self.graph.nodes())
         self.start_combo['values'] = vals
         self.end_combo['values'] = vals
         self.del_combo['values'] = vals
+        chosen = {self.stops_list.get(i) for i in self.stops_list.curselection()}
+        self.stops_list.delete(0, tk.END)
+        for i, city in enumerate(vals):
+            self.stops_list.insert(tk.END, city)
+            if city in chosen:
+                self.stops_list.selection_set(i)
 
     def print_coordinates(self):
         """Виводить поточні координати в консоль у форматі Python-словника"""
@@ -332,6 +462,9 @@ class RoadMapApp:
             self.pos[self.dragging_node] = (event.xdata, event.ydata)
             self.draw_graph()
     def on_release(self, event):
+        # Евристика A* залежить від координат, тож переміщення міста теж змінює результати
+        if self.dragging_node is not None:
+            self.routes.bump()
         self.dragging_node = None
 
 if __name__ == "__main__":
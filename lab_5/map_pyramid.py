@@ -0,0 +1,95 @@
+"""Піраміда зображень для фону карти.
+
+Фон один раз накладається на колір полотна з потрібною прозорістю (альфу
+враховано заздалегідь, тож imshow малює непрозорий RGB uint8 без змішування), після
+чого будуються рівні, кожен удвічі менший за попередній (усереднення 2×2).
+Рівні кешуються на диску в .npz, ключ — SHA-1 вмісту файлу разом із
+прозорістю та кольором тла, тому змінена карта автоматично перебудовується.
+
+Під час малювання береться найменший рівень, якого ще вистачає на поточний
+розмір полотна і масштаб фону, — matplotlib не передискретизує мегапікселі
+при кожному русі повзунка чи перетягуванні міста.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ais_2025", "map_pyramid")
+MIN_SIDE = 64   # менших рівнів не будуємо
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def composite(image, alpha=0.8, background=(1.0, 1.0, 1.0)):
+    """RGB(A) будь-якого типу -> float RGB, уже змішаний з тлом (як imshow(alpha=...) на цьому тлі)."""
+    img = np.asarray(image)
+    img = img.astype(np.float32) / 255 if img.dtype == np.uint8 else img.astype(np.float32)
+    if img.ndim == 2:
+        img = np.stack([img] * 3, axis=-1)
+    a = alpha * (img[..., 3:4] if img.shape[-1] == 4 else 1.0)
+    return img[..., :3] * a + np.asarray(background, dtype=np.float32) * (1 - a)
+
+
+def downsample(img):
+    # Усереднення блоків 2×2 (непарний край відкидається)
+    h, w = img.shape[0] // 2 * 2, img.shape[1] // 2 * 2
+    img = img[:h, :w]
+    return (img[0::2, 0::2] + img[1::2, 0::2] + img[0::2, 1::2] + img[1::2, 1::2]) / 4
+
+
+def _to_uint8(img):
+    return (np.clip(img, 0, 1) * 255 + 0.5).astype(np.uint8)
+
+
+class ImagePyramid:
+    def __init__(self, levels):
+        self.levels = levels    # levels[0] — повна роздільність, далі кожен удвічі менший
+
+    @classmethod
+    def build(cls, image, alpha=0.8, background=(1.0, 1.0, 1.0)):
+        img = composite(image, alpha, background)
+        levels = [_to_uint8(img)]
+        while min(img.shape[:2]) // 2 >= MIN_SIDE:
+            img = downsample(img)
+            levels.append(_to_uint8(img))
+        return cls(levels)
+
+    @classmethod
+    def load(cls, path, alpha=0.8, background=(1.0, 1.0, 1.0), cache_dir=CACHE_DIR):
+        """Піраміда для файлу ``path``: з дискового кешу, а якщо його немає — будується й зберігається."""
+        key = f"{file_hash(path)}-{alpha:g}-{'-'.join(f'{c:g}' for c in background)}"
+        cached = os.path.join(cache_dir, key + ".npz")
+        try:
+            with np.load(cached) as data:
+                return cls([data[f"level_{i}"] for i in range(len(data.files))])
+        except (OSError, KeyError, ValueError):
+            pass
+        import matplotlib.image as mpimg
+        pyramid = cls.build(mpimg.imread(path), alpha, background)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = cached + ".tmp.npz"
+            np.savez(tmp, **{f"level_{i}": level for i, level in enumerate(pyramid.levels)})
+            os.replace(tmp, cached)
+        except OSError:
+            pass    # кеш лише прискорює наступні запуски
+        return pyramid
+
+    @property
+    def shape(self):
+        return self.levels[0].shape
+
+    def level_for(self, width_px, height_px):
+        """Найменший рівень, не менший за (width_px, height_px) екранних пікселів."""
+        for level in reversed(self.levels):
+            if level.shape[1] >= width_px and level.shape[0] >= height_px:
+                return level
+        return self.levels[0]
@@ -0,0 +1,322 @@
+"""Аналітика дорожньої мережі: центральність і вразливість.
+
+* посередництво (betweenness) — алгоритм Брандеса для зважених графів: Дейкстра з
+  кожного джерела з підрахунком найкоротших шляхів і зворотним накопиченням залежностей;
+* близькість (closeness) — як у networkx (wf_improved): (r-1)/сума відстаней * (r-1)/(n-1);
+* ексцентриситет і діаметр (у км, у межах компоненти зв'язності);
+* точки з'єднання (articulation points) і мости — один обхід Тарьяна, лінійний час.
+
+Джерела розподіляються між процесами (граф передається кожному процесу один раз),
+а з ``samples`` береться лише вибірка джерел і результати масштабуються (наближення).
+Після додавання дороги чи видалення міста перераховуються лише зачеплені компоненти,
+а дорога, довша за вже наявний шлях між її кінцями, центральності не змінює зовсім.
+Граф вважається неорієнтованим (дороги двосторонні).
+"""
+
+import csv
+import heapq
+import os
+import random
+from collections import deque
+from itertools import count
+
+CSV_FIELDS = ['city', 'betweenness', 'betweenness_norm', 'closeness', 'eccentricity_km', 'component',
+              'articulation']
+
+
+def graph_arrays(graph, weight='weight'):
+    """Міста -> індекси та списки суміжності [(сусід, вага)] для передачі в процеси."""
+    nodes = list(graph.nodes())
+    index = {n: i for i, n in enumerate(nodes)}
+    adj = [[] for _ in nodes]
+    for u, v, w in graph.edges(data=weight, default=1):
+        adj[index[u]].append((index[v], w))
+        adj[index[v]].append((index[u], w))
+    return nodes, index, adj
+
+
+def components(adj):
+    label = [-1] * len(adj)
+    k = 0
+    for s in range(len(adj)):
+        if label[s] < 0:
+            label[s] = k
+            queue = deque([s])
+            while queue:
+                for v, _ in adj[queue.popleft()]:
+                    if label[v] < 0:
+                        label[v] = k
+                        queue.append(v)
+            k += 1
+    return label
+
+
+def articulation_and_bridges(adj):
+    """Точки з'єднання та мости ітеративним обходом у глибину (low-link Тарьяна)."""
+    n = len(adj)
+    order = [-1] * n
+    low = [0] * n
+    points, bridges = set(), []
+    t = 0
+    for root in range(n):
+        if order[root] >= 0:
+            continue
+        order[root] = low[root] = t
+        t += 1
+        root_children = 0
+        stack = [(root, -1, iter(adj[root]))]
+        while stack:
+            u, parent, it = stack[-1]
+            for v, _ in it:
+                if order[v] < 0:
+                    order[v] = low[v] = t
+                    t += 1
+                    stack.append((v, u, iter(adj[v])))
+                    break
+                if v != parent:
+                    low[u] = min(low[u], order[v])
+            else:
+                stack.pop()
+                if parent < 0:
+                    continue
+                low[parent] = min(low[parent], low[u])
+                if low[u] > order[parent]:
+                    bridges.append((parent, u))
+                if parent == root:
+                    root_children += 1
+                elif low[u] >= order[parent]:
+                    points.add(parent)
+        if root_children > 1:
+            points.add(root)
+    return points, bridges
+
+
+def _single_source(adj, s, part):
+    # Дейкстра з лічильниками найкоротших шляхів (sigma) і списками попередників
+    bc, far, reach, ecc = part
+    dist, sigma, preds = {s: 0}, {s: 1}, {s: []}
+    order = []
+    done = set()
+    tie = count()
+    heap = [(0, next(tie), s)]
+    while heap:
+        d, _, v = heapq.heappop(heap)
+        if v in done:
+            continue
+        done.add(v)
+        order.append(v)
+        for w, length in adj[v]:
+            nd = d + length
+            old = dist.get(w)
+            if old is None or nd < old:
+                dist[w] = nd
+                sigma[w] = sigma[v]
+                preds[w] = [v]
+                heapq.heappush(heap, (nd, next(tie), w))
+            elif nd == old and w not in done:
+                sigma[w] += sigma[v]
+                preds[w].append(v)
+    # зворотне накопичення залежностей; заодно стовпчикові суми відстаней і максимуми
+    delta = dict.fromkeys(order, 0.0)
+    for w in reversed(order):
+        coeff = (1.0 + delta[w]) / sigma[w]
+        for v in preds[w]:
+            delta[v] += sigma[v] * coeff
+        if w != s:
+            bc[w] = bc.get(w, 0.0) + delta[w]
+        d = dist[w]
+        far[w] = far.get(w, 0) + d
+        reach[w] = reach.get(w, 0) + 1
+        if d > ecc.get(w, (-1, None))[0]:
+            ecc[w] = (d, s)
+
+
+def _new_part():
+    return {}, {}, {}, {}
+
+
+def _merge(total, part):
+    for acc, add in zip(total[:3], part[:3]):
+        for k, v in add.items():
+            acc[k] = acc.get(k, 0) + v
+    for k, v in part[3].items():
+        if v[0] > total[3].get(k, (-1, None))[0]:
+            total[3][k] = v
+
+
+_worker_adj = None
+
+
+def _init_worker(adj):
+    global _worker_adj
+    _worker_adj = adj
+
+
+def _brandes_chunk(sources):
+    part = _new_part()
+    for s in sources:
+        _single_source(_worker_adj, s, part)
+    return part
+
+
+def brandes(adj, sources, processes=None, chunk=8):
+    """Суми Брандеса по джерелах: (посередництво, суми відстаней, кількість джерел, (ексцентриситет, джерело))."""
+    sources = list(sources)
+    workers = processes or os.cpu_count() or 1
+    total = _new_part()
+    if workers <= 1 or len(sources) <= chunk:
+        for s in sources:
+            _single_source(adj, s, total)
+        return total
+    from concurrent.futures import ProcessPoolExecutor
+    parts = [sources[i:i + chunk] for i in range(0, len(sources), chunk)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(adj,)) as pool:
+        for part in pool.map(_brandes_chunk, parts):
+            _merge(total, part)
+    return total
+
+
+class RoadAnalytics:
+    def __init__(self, graph, weight='weight', samples=None, seed=0, processes=None):
+        """``samples`` — скільки джерел брати (None — усі, точний результат)."""
+        self.graph, self.weight = graph, weight
+        self.samples, self.seed, self.processes = samples, seed, processes
+        self.betweenness = {}   # місто -> кількість пар, чиї найкоротші шляхи проходять через нього
+        self._closeness = {}    # місто -> (r-1) * досяжні / сума відстаней; ділиться на (n-1) при читанні
+        self.eccentricity = {}  # місто -> (км, найвіддаленіше місто)
+        self.component = {}
+        self.articulation = set()
+        self.bridges = []
+        self.approximate = False
+
+    # --- обчислення ---
+
+    def compute(self):
+        self._snapshot()
+        self.betweenness, self._closeness, self.eccentricity = {}, {}, {}
+        self._centrality(set(self._label))
+        return self
+
+    def _snapshot(self):
+        # Масиви поточного графа, компоненти, точки з'єднання і мости (усе лінійне, рахується завжди)
+        self.nodes, self.index, self.adj = graph_arrays(self.graph, self.weight)
+        self._label = components(self.adj)
+        self._sizes = {}
+        for k in self._label:
+            self._sizes[k] = self._sizes.get(k, 0) + 1
+        self.component = {n: self._label[i] for i, n in enumerate(self.nodes)}
+        points, bridges = articulation_and_bridges(self.adj)
+        self.articulation = {self.nodes[i] for i in points}
+        self.bridges = [(self.nodes[u], self.nodes[v]) for u, v in bridges]
+
+    def _sources(self, members):
+        # Вибірка джерел компоненти пропорційно її розміру (не менше одного)
+        if not self.samples or self.samples >= len(self.nodes):
+            return members
+        k = min(len(members), max(1, round(self.samples * len(members) / len(self.nodes))))
+        return random.Random(self.seed).sample(members, k) if k < len(members) else members
+
+    def _centrality(self, labels):
+        members = {k: [] for k in labels}
+        for i, k in enumerate(self._label):
+            if k in members:
+                members[k].append(i)
+        picked = {k: self._sources(m) for k, m in members.items()}
+        self.approximate = self.approximate or any(len(picked[k]) < len(members[k]) for k in members)
+        bc, far, reach, ecc = brandes(self.adj, [s for k in picked for s in picked[k]], self.processes)
+        sampled = {s for k in picked for s in picked[k]}
+        for k, nodes in members.items():
+            r, used = len(nodes), len(picked[k])
+            scale = r / used / 2      # /2: неорієнтований граф, кожну пару пройдено з обох кінців
+            for i in nodes:
+                name = self.nodes[i]
+                self.betweenness[name] = bc.get(i, 0.0) * scale
+                others = reach.get(i, 0) - (i in sampled)
+                self._closeness[name] = (r - 1) * others / far[i] if others and far.get(i) else 0.0
+                d, s = ecc.get(i, (0, i))
+                self.eccentricity[name] = (d, self.nodes[s])
+
+    # --- інкрементні оновлення ---
+
+    def edge_added(self, u, v, w):
+        """Викликати після graph.add_edge(u, v, weight=w); повертає короткий опис виконаної роботи."""
+        old_index, old_adj, old_label = self.index, self.adj, self._label
+        same = u in old_index and v in old_index and old_label[old_index[u]] == old_label[old_index[v]]
+        existed = same and any(x == old_index[v] for x, _ in old_adj[old_index[u]])
+        if same and not existed and w > _distance(old_adj, old_index[u], old_index[v]):
+            # Дорога довша за наявний шлях: жоден найкоротший шлях не змінився
+            self._snapshot()
+            return "дорога не скорочує жодного шляху: центральності без змін"
+        self._snapshot()
+        labels = {self._label[self.index[u]]}
+        self._centrality(labels)
+        return f"перераховано компоненту з {self._sizes[labels.pop()]} міст"
+
+    def node_removed(self, node):
+        """Викликати після graph.remove_node(node)."""
+        old = self.component.get(node)
+        affected = [n for n, k in self.component.items() if k == old and n != node]
+        for table in (self.betweenness, self._closeness, self.eccentricity):
+            table.pop(node, None)
+        self._snapshot()
+        labels = {self.component[n] for n in affected}
+        self._centrality(labels)
+        return f"перераховано {len(labels)} компонент(и), {len(affected)} міст"
+
+    # --- результати ---
+
+    @property
+    def diameter(self):
+        """(км, місто, місто) — найбільший ексцентриситет; з вибіркою — оцінка знизу."""
+        if not self.eccentricity:
+            return None
+        a, (d, b) = max(self.eccentricity.items(), key=lambda item: item[1][0])
+        return d, a, b
+
+    @property
+    def closeness(self):
+        """Місто -> близькість. Множник (r-1)/(n-1) залежить від загальної кількості міст n, тож
+        застосовується при читанні: після видалення міста чи додавання нового значення в
+        неперерахованих компонентах лишаються правильними."""
+        n = len(self.nodes)
+        return {name: c / (n - 1) for name, c in self._closeness.items()} if n > 1 else dict.fromkeys(self._closeness, 0.0)
+
+    def normalized_betweenness(self, name):
+        n = len(self.nodes)
+        return self.betweenness.get(name, 0.0) * 2 / ((n - 1) * (n - 2)) if n > 2 else 0.0
+
+    def ranking(self, metric='betweenness', top=None):
+        table = self.betweenness if metric == 'betweenness' else self.closeness
+        ranked = sorted(table.items(), key=lambda item: -item[1])
+        return ranked[:top] if top else ranked
+
+    def rows(self):
+        closeness = self.closeness
+        return [{'city': n, 'betweenness': round(self.betweenness.get(n, 0.0), 3),
+                 'betweenness_norm': round(self.normalized_betweenness(n), 6),
+                 'closeness': round(closeness.get(n, 0.0), 6),
+                 'eccentricity_km': self.eccentricity.get(n, (0, None))[0],
+                 'component': self.component.get(n), 'articulation': n in self.articulation}
+                for n, _ in self.ranking()]
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, delimiter=';')
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+
+def _distance(adj, s, t):
+    dist = {s: 0}
+    heap = [(0, s)]
+    while heap:
+        d, v = heapq.heappop(heap)
+        if v == t:
+            return d
+        if d > dist[v]:
+            continue
+        for w, length in adj[v]:
+            if d + length < dist.get(w, float('inf')):
+                dist[w] = d + length
+                heapq.heappush(heap, (d + length, w))
+    return float('inf')
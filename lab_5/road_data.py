@@ -0,0 +1,114 @@
+# Дорожня мережа України: (місто 1, місто 2, відстань у км) та нормовані координати міст на карті
+ROADS = [
+    ("Ужгород", "Мукачево", 40), ("Мукачево", "Іршава", 25), 
+    ("Мукачево", "Львів", 220), ("Львів", "Тернопіль", 128), 
+    ("Львів", "Івано-Франківськ", 134), ("Львів", "Луцьк", 152), 
+    ("Львів", "Рівне", 211), ("Луцьк", "Рівне", 75), 
+    ("Луцьк", "Ковель", 65), ("Ковель", "Сарни", 130), 
+    ("Сарни", "Коростень", 100), ("Рівне", "Житомир", 189), 
+    ("Тернопіль", "Хмельницький", 112), ("Тернопіль", "Рівне", 160),
+    ("Тернопіль", "Чернівці", 175), ("Івано-Франківськ", "Чернівці", 135),
+    ("Хмельницький", "Вінниця", 120), ("Хмельницький", "Житомир", 155),
+    ("Житомир", "Київ", 141), ("Житомир", "Вінниця", 129),
+    ("Вінниця", "Умань", 160), ("Вінниця", "Біла Церква", 125),
+    ("Київ", "Біла Церква", 85), ("Київ", "Чернігів", 149),
+    ("Київ", "Черкаси", 192), ("Київ", "Пирятин", 155),
+    ("Біла Церква", "Умань", 125), ("Черкаси", "Сміла", 30),
+    ("Сміла", "Кропивницький", 105), ("Сміла", "Умань", 155),
+    ("Черкаси", "Кременчук", 130), ("Умань", "Кропивницький", 168),
+    ("Умань", "Одеса", 271), ("Умань", "Первомайськ", 85),
+    ("Кропивницький", "Кривий Ріг", 120), ("Кропивницький", "Дніпро", 180),
+    ("Кропивницький", "Олександрія", 75),
+    ("Чернігів", "Суми", 180), ("Суми", "Харків", 185), ("Чернігів", "Прилуки", 130),
+    ("Пирятин", "Полтава", 185), ("Полтава", "Харків", 145),
+    ("Полтава", "Кременчук", 115), ("Полтава", "Дніпро", 195),
+    ("Харків", "Дніпро", 220), ("Харків", "Ізюм", 125),
+    ("Дніпро", "Запоріжжя", 86), ("Дніпро", "Кривий Ріг", 145),
+    ("Дніпро", "Донецьк", 250), ("Дніпро", "Кам'янське", 40), ("Дніпро", "Павлоград", 75),
+    ("Одеса", "Миколаїв", 133), ("Миколаїв", "Херсон", 71),
+    ("Первомайськ", "Миколаїв", 165), ("Херсон", "Мелітополь", 230),
+    ("Херсон", "Сімферополь", 280), 
+    ("Запоріжжя", "Мелітополь", 120), ("Запоріжжя", "Маріуполь", 225),
+    ("Мелітополь", "Маріуполь", 170), ("Мелітополь", "Сімферополь", 240),
+    ("Ізюм", "Слов'янськ", 50), ("Слов'янськ", "Донецьк", 110),
+    ("Слов'янськ", "Луганськ", 160), ("Донецьк", "Луганськ", 150),
+    ("Донецьк", "Маріуполь", 115), ("Луганськ", "Ізварине", 60),
+    ("Сімферополь", "Севастополь", 80), ("Сімферополь", "Ялта", 85), 
+    ("Сімферополь", "Керч", 210), ("Севастополь", "Ялта", 80),
+    ("Конотоп", "Суми", 120), ("Конотоп", "Чернігів", 150)
+]
+
+POSITIONS = {
+  "Ужгород": (0.010, 0.549),
+  "Мукачево": (0.044, 0.548),
+  "Іршава": (0.075, 0.486),
+  "Львів": (0.114, 0.683),
+  "Івано-Франківськ": (0.139, 0.567),
+  "Тернопіль": (0.192, 0.635),
+  "Чернівці": (0.204, 0.475),
+  "Луцьк": (0.188, 0.785),
+  "Рівне": (0.235, 0.760),
+  "Ковель": (0.167, 0.837),
+  "Сарни": (0.261, 0.867),
+  "Коростень": (0.363, 0.801),
+  "Хмельницький": (0.271, 0.612),
+  "Кам'янець-Подільський": (0.286, 0.515),
+  "Житомир": (0.363, 0.708),
+  "Вінниця": (0.350, 0.579),
+  "Біла Церква": (0.446, 0.654),
+  "Київ": (0.450, 0.730),
+  "Чернігів": (0.560, 0.900),
+  "Прилуки": (0.566, 0.754),
+  "Черкаси": (0.538, 0.605),
+  "Сміла": (0.506, 0.598),
+  "Умань": (0.448, 0.530),
+  "Кропивницький": (0.555, 0.499),
+  "Олександрія": (0.605, 0.526),
+  "Конотоп": (0.609, 0.826),
+  "Суми": (0.685, 0.786),
+  "Пирятин": (0.648, 0.722),
+  "Полтава": (0.679, 0.628),
+  "Кременчук": (0.620, 0.570),
+  "Харків": (0.766, 0.689),
+  "Ізюм": (0.910, 0.600),
+  "Дніпро": (0.709, 0.495),
+  "Кам'янське": (0.685, 0.517),
+  "Павлоград": (0.759, 0.529),
+  "Кривий Ріг": (0.622, 0.434),
+  "Запоріжжя": (0.715, 0.431),
+  "Нікополь": (0.678, 0.396),
+  "Донецьк": (0.868, 0.458),
+  "Краматорськ": (0.849, 0.548),
+  "Слов'янськ": (0.929, 0.583),
+  "Луганськ": (0.946, 0.541),
+  "Маріуполь": (0.862, 0.356),
+  "Бердянськ": (0.819, 0.322),
+  "Мелітополь": (0.743, 0.307),
+  "Первомайськ": (0.489, 0.443),
+  "Одеса": (0.473, 0.255),
+  "Миколаїв": (0.542, 0.318),
+  "Херсон": (0.579, 0.277),
+  "Ізмаїл": (0.420, 0.120),
+  "Сімферополь": (0.671, 0.082),
+  "Севастополь": (0.638, 0.039),
+  "Євпаторія": (0.628, 0.112),
+  "Ялта": (0.685, 0.034),
+  "Керч": (0.813, 0.139),
+  "Ізварине": (0.965, 0.489),
+}
+
+
+def build_road_graph():
+    """Будує граф доріг і словник координат (networkx імпортується лише тут)."""
+    import networkx as nx
+    graph = nx.Graph()
+    for u, v, w in ROADS:
+        graph.add_edge(u, v, weight=w)
+    pos = dict(POSITIONS)
+    # Додаємо вузли, яких немає в списку доріг, але є в координатах
+    for node in pos:
+        if node not in graph: graph.add_node(node)
+    # І навпаки
+    for node in graph.nodes():
+        if node not in pos: pos[node] = (0.5, 0.5)
+    return graph, pos
@@ -0,0 +1,429 @@
+"""Локальний сервіс маршрутів і пошуку без вікна Tk: asyncio, HTTP/1.1, JSON.
+
+Граф доріг, згенерований зважений граф (lab_1_2) і лабіринт (lab_3_4)
+завантажуються один раз у кожному процесі пулу; запити несуть лише параметри.
+Однакові запити, що виконуються одночасно, зливаються в один (coalescing),
+готові відповіді зберігаються в LRU-кеші, а запити відстаней "багато-до-
+багатьох" збираються в мікропакети: за вікно --batch-ms усі джерела
+об'єднуються й кожне рахується один раз.
+
+    python lab_5/route_service.py --port 8765 --graph-nodes 20000 --maze 200
+
+    GET  /route?from=Київ&to=Львів&algo=astar        (dijkstra | astar | bidirectional)
+    GET  /graph/path?start=0&goal=99&algo=ucs         (bfs | ucs)
+    GET  /maze/path?start=0,0&goal=199,199&operator=...
+    POST /distances  {"graph": "road" | "graph", "sources": [...], "targets": [...]}
+    GET  /metrics                                     (затримки, пропускна здатність, пакети)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+for path in (ROOT, HERE, os.path.join(ROOT, 'lab_1_2'), os.path.join(ROOT, 'lab_3_4')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+from search_common.result_cache import ResultCache
+
+ROUTE_KEYS = {'dijkstra': "Дейкстра", 'astar': "A* (геометричний)", 'bidirectional': "Двонаправлений A*"}
+DEFAULT_CONFIG = {'graph_nodes': 20000, 'graph_edges': 60000, 'max_weight': 100, 'maze': 200,
+                  'wall_density': 0.3, 'seed': 1}
+LATENCY_SAMPLES = 10000
+
+
+class BadRequest(ValueError):
+    pass
+
+
+# --- дані та обчислення (виконуються в процесах пулу) ---
+
+_world = None
+
+
+def load_world(config):
+    """Будує всі графи один раз на процес."""
+    global _world
+    if _world is not None:
+        return _world
+    import maze_search
+    from road_data import build_road_graph
+    from routing import fit_km_scale
+    from search_core import ensure_connected_graph
+    road, pos = build_road_graph()
+    graph = ensure_connected_graph(config['graph_nodes'], config['graph_edges'], seed=config['seed'],
+                                   max_weight=config['max_weight'])
+    size = config['maze']
+    grid = maze_search.generate_grid(size, size, config['wall_density'], random.Random(config['seed']))
+    _world = {'road': road, 'pos': pos, 'scale': fit_km_scale(road, pos), 'graph': graph, 'maze': grid}
+    return _world
+
+
+def _warm_up(config):
+    # Повертає лише кількість вершин, щоб графи не пересилались назад у головний процес
+    return load_world(config)['graph'].number_of_nodes()
+
+
+def _route(algo, source, target):
+    import networkx as nx
+    from routing import ROUTE_ALGORITHMS, dijkstra_route
+    w = _world
+    for node in (source, target):
+        if node not in w['road']:
+            raise BadRequest(f"Невідоме місто: {node}")
+    try:
+        if algo == 'dijkstra':
+            route = dijkstra_route(w['road'], source, target)
+        else:
+            route = ROUTE_ALGORITHMS[ROUTE_KEYS[algo]](w['road'], w['pos'], source, target, scale=w['scale'])
+    except nx.NetworkXNoPath:
+        # Частина міст є лише на карті, без доріг: "немає шляху" — звичайна відповідь
+        return {'path': None, 'distance': None, 'expanded': None}
+    return {'path': route.path, 'distance': route.distance, 'expanded': route.expanded}
+
+
+def _graph_path(algo, start, goal):
+    from search_core import bfs_tree
+    from weighted_search import uniform_cost_search
+    G = _world['graph']
+    for node in (start, goal):
+        if node not in G:
+            raise BadRequest(f"Вершини {node} немає в графі")
+    if algo == 'ucs':
+        path, cost, settled = uniform_cost_search(G, start, goal)
+        return {'path': path, 'cost': cost, 'expanded': settled}
+    tree = bfs_tree(G, [start], [goal], first_goal=True)
+    path = tree.path(goal)
+    return {'path': path, 'cost': len(path) - 1 if path else None, 'expanded': len(tree.reached_nodes())}
+
+
+def _maze_path(start, goal, operator):
+    import maze_search
+    grid = _world['maze']
+    for r, c in (start, goal):
+        if not (0 <= r < len(grid) and 0 <= c < len(grid[0])):
+            raise BadRequest(f"Клітинка ({r}, {c}) поза лабіринтом")
+    path, cycles, _, _ = maze_search.bidirectional_wave_search(grid, start, goal, operator)
+    return {'path': [list(cell) for cell in path] if path else None, 'cycles': cycles}
+
+
+def _distances(name, sources, targets):
+    # Один пошук на джерело; зупиняється, щойно всі цілі пакета досягнуті
+    from weighted_search import ucs_distances
+    G = _world[name]
+    return {s: ucs_distances(G, [s], targets=targets) if s in G else {} for s in sources}
+
+
+# --- метрики ---
+
+class Metrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.endpoints = {}     # назва -> [кількість, помилки, deque затримок (с)]
+        self.coalesced = 0
+        self.cached = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.batched_sources = 0
+        self.in_flight = 0
+
+    def record(self, name, seconds, ok=True):
+        entry = self.endpoints.get(name)
+        if entry is None:
+            entry = self.endpoints[name] = [0, 0, deque(maxlen=LATENCY_SAMPLES)]
+        entry[0] += 1
+        entry[1] += 0 if ok else 1
+        entry[2].append(seconds)
+
+    @staticmethod
+    def _percentile(ordered, q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+
+    def snapshot(self):
+        uptime = time.perf_counter() - self.started
+        endpoints = {}
+        total = 0
+        for name, (count, errors, samples) in self.endpoints.items():
+            ordered = sorted(samples)
+            ms = lambda q: round(1000 * self._percentile(ordered, q), 3) if ordered else None
+            endpoints[name] = {'requests': count, 'errors': errors, 'rps': round(count / uptime, 2),
+                               'p50_ms': ms(0.5), 'p95_ms': ms(0.95), 'p99_ms': ms(0.99),
+                               'max_ms': round(1000 * ordered[-1], 3) if ordered else None}
+            total += count
+        return {'uptime_s': round(uptime, 3), 'requests': total, 'rps': round(total / uptime, 2),
+                'in_flight': self.in_flight, 'coalesced': self.coalesced, 'cache_hits': self.cached,
+                'batches': self.batches, 'batched_requests': self.batched_requests,
+                'mean_batch_sources': round(self.batched_sources / self.batches, 2) if self.batches else None,
+                'endpoints': endpoints}
+
+
+# --- сервіс ---
+
+class SearchService:
+    def __init__(self, config=None, processes=None, batch_ms=5.0, max_batch=64, cache_bytes=32 << 20):
+        self.config = dict(DEFAULT_CONFIG, **(config or {}))
+        self.processes = (os.cpu_count() or 1) if processes is None else processes
+        self.batch_window = batch_ms / 1000
+        self.max_batch = max_batch
+        self.metrics = Metrics()
+        self.results = ResultCache(max_bytes=cache_bytes)   # графи незмінні, версія не змінюється
+        self._inflight = {}         # ключ запиту -> Future спільної відповіді
+        self._pending = {}          # граф -> [(джерела, цілі, Future)] поточного мікропакета
+        self._flush_jobs = {}
+        self._connections = set()   # StreamWriter відкритих з'єднань (закриваються в close)
+        self.pool = None
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8765):
+        loop = asyncio.get_running_loop()
+        if self.processes > 0:
+            self.pool = ProcessPoolExecutor(self.processes, initializer=load_world, initargs=(self.config,))
+            # прогрів: кожен процес будує графи до першого запиту
+            await asyncio.gather(*(loop.run_in_executor(self.pool, _warm_up, self.config)
+                                   for _ in range(self.processes)))
+        else:
+            # без процесів: обчислення у потоці, щоб не блокувати цикл подій
+            self.pool = ThreadPoolExecutor(1)
+            await loop.run_in_executor(self.pool, _warm_up, self.config)
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            # keep-alive з'єднання чекають наступного запиту: закриваємо їх, щоб обробники завершились
+            for writer in list(self._connections):
+                writer.close()
+            while self._connections:
+                await asyncio.sleep(0.01)
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+
+    async def query(self, fn, *args):
+        """Відповідь на запит шляху: з кешу, зі спільного Future такого ж запиту або новим обчисленням."""
+        key = self.results.key(fn.__name__, *args)
+        cached = self.results.get(key)
+        if cached is not None:
+            self.metrics.cached += 1
+            return cached
+        future = self._inflight.get(key)
+        if future is not None:
+            self.metrics.coalesced += 1
+            return await asyncio.shield(future)
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await self._run(fn, *args)
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()      # позначено як отримане: очікувачі отримають його самі
+            raise
+        else:
+            self.results.put(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def distances(self, name, sources, targets):
+        """Матриця відстаней sources x targets; запити в межах вікна рахуються одним пакетом."""
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(name, [])
+        pending.append((sources, targets, future))
+        if len(pending) >= self.max_batch:
+            self._flush(name)
+        elif name not in self._flush_jobs:
+            self._flush_jobs[name] = asyncio.get_running_loop().call_later(self.batch_window, self._flush, name)
+        return await future
+
+    def _flush(self, name):
+        job = self._flush_jobs.pop(name, None)
+        if job is not None:
+            job.cancel()
+        batch = self._pending.pop(name, [])
+        if batch:
+            asyncio.ensure_future(self._run_batch(name, batch))
+
+    async def _run_batch(self, name, batch):
+        # Усе тіло під try: кожен клієнт пакета має отримати результат або помилку, інакше він чекає вічно
+        try:
+            sources = list(dict.fromkeys(s for req in batch for s in req[0]))
+            targets = list(dict.fromkeys(t for req in batch for t in req[1]))
+            self.metrics.batches += 1
+            self.metrics.batched_requests += len(batch)
+            self.metrics.batched_sources += len(sources)
+            # джерела діляться між процесами пулу
+            parts = max(1, min(len(sources), self.processes))
+            chunks = [sources[i::parts] for i in range(parts)]
+            rows = {}
+            for part in await asyncio.gather(*(self._run(_distances, name, chunk, targets) for chunk in chunks)):
+                rows.update(part)
+            for req_sources, req_targets, future in batch:
+                if not future.done():
+                    future.set_result([[rows[s].get(t) for t in req_targets] for s in req_sources])
+        except Exception as exc:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+
+    # --- HTTP ---
+
+    async def dispatch(self, method, path, params, body):
+        arg = lambda name, default=None: params.get(name, [default])[0]
+        if method == 'GET' and path == '/metrics':
+            return self.metrics.snapshot()
+        if method == 'GET' and path == '/route':
+            algo = arg('algo', 'astar')
+            if algo not in ROUTE_KEYS:
+                raise BadRequest(f"algo: одне з {', '.join(ROUTE_KEYS)}")
+            if arg('from') is None or arg('to') is None:
+                raise BadRequest("потрібні параметри from і to")
+            return await self.query(_route, algo, arg('from'), arg('to'))
+        if method == 'GET' and path == '/graph/path':
+            algo = arg('algo', 'ucs')
+            if algo not in ('bfs', 'ucs'):
+                raise BadRequest("algo: bfs або ucs")
+            return await self.query(_graph_path, algo, _int(arg('start')), _int(arg('goal')))
+        if method == 'GET' and path == '/maze/path':
+            import maze_search
+            operator = arg('operator', maze_search.DEFAULT_OPERATOR)
+            if operator not in maze_search.OPERATORS:
+                raise BadRequest(f"operator: одне з {', '.join(maze_search.OPERATORS)}")
+            return await self.query(_maze_path, _cell(arg('start')), _cell(arg('goal')), operator)
+        if method == 'POST' and path == '/distances':
+            try:
+                req = json.loads(body or b'{}')
+            except ValueError:
+                raise BadRequest("тіло запиту має бути JSON")
+            name = req.get('graph', 'road')
+            if name not in ('road', 'graph'):
+                raise BadRequest("graph: road або graph")
+            sources, targets = req.get('sources') or [], req.get('targets') or []
+            if not isinstance(sources, list) or not isinstance(targets, list):
+                raise BadRequest("sources і targets мають бути списками")
+            if name == 'graph':
+                sources, targets = [_int(s) for s in sources], [_int(t) for t in targets]
+            else:
+                sources, targets = [_city(s) for s in sources], [_city(t) for t in targets]
+            return {'sources': sources, 'targets': targets, 'distances': await self.distances(name, sources, targets)}
+        return None
+
+    async def handle(self, reader, writer):
+        # HTTP/1.1 з keep-alive: кілька запитів на одне з'єднання
+        self._connections.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, _ = line.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b'\r\n', b'\n', b''):
+                        break
+                    k, _, v = h.decode('latin-1').partition(':')
+                    headers[k.strip().lower()] = v.strip()
+                length = int(headers.get('content-length', 0) or 0)
+                body = await reader.readexactly(length) if length else b''
+                url = urlsplit(target)
+                started = time.perf_counter()
+                self.metrics.in_flight += 1
+                status, ok = 200, True
+                try:
+                    payload = await self.dispatch(method, url.path, parse_qs(url.query), body)
+                    if payload is None:
+                        status, ok, payload = 404, False, {'error': f"немає {method} {url.path}"}
+                except BadRequest as exc:
+                    status, ok, payload = 400, False, {'error': str(exc)}
+                except Exception as exc:
+                    status, ok, payload = 500, False, {'error': repr(exc)}
+                finally:
+                    self.metrics.in_flight -= 1
+                if url.path != '/metrics':
+                    self.metrics.record(url.path, time.perf_counter() - started, ok)
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                close = headers.get('connection', '').lower() == 'close'
+                writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise BadRequest(f"очікувалось ціле число, отримано {value!r}")
+
+
+def _city(value):
+    if not isinstance(value, str):
+        raise BadRequest(f"очікувалась назва міста (рядок), отримано {value!r}")
+    return value
+
+
+def _cell(value):
+    try:
+        r, c = (int(x) for x in value.split(','))
+    except (AttributeError, ValueError):
+        raise BadRequest(f"клітинка має бути у форматі 'рядок,стовпець', отримано {value!r}")
+    return r, c
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('--processes', type=int, default=None, help='0 — обчислення в одному потоці')
+    ap.add_argument('--batch-ms', type=float, default=5.0, help='вікно мікропакета запитів відстаней')
+    ap.add_argument('--graph-nodes', type=int, default=DEFAULT_CONFIG['graph_nodes'])
+    ap.add_argument('--graph-edges', type=int, default=None, help='за замовчуванням 3 на вершину')
+    ap.add_argument('--max-weight', type=int, default=DEFAULT_CONFIG['max_weight'])
+    ap.add_argument('--maze', type=int, default=DEFAULT_CONFIG['maze'], help='сторона квадратного лабіринту')
+    ap.add_argument('--seed', type=int, default=DEFAULT_CONFIG['seed'])
+    args = ap.parse_args()
+    config = {'graph_nodes': args.graph_nodes, 'graph_edges': args.graph_edges or 3 * args.graph_nodes,
+              'max_weight': args.max_weight, 'maze': args.maze, 'seed': args.seed}
+
+    async def serve():
+        service = SearchService(config, args.processes, args.batch_ms)
+        port = await service.start(args.host, args.port)
+        print(f"Сервіс слухає http://{args.host}:{port} ({service.processes} процесів)")
+        try:
+            await service.server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
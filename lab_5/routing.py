@@ -0,0 +1,154 @@
+import heapq
+import math
+from collections import namedtuple
+from itertools import count
+
+import networkx as nx
+
+# Результат пошуку маршруту: шлях, довжина (км) та кількість розкритих вершин
+RouteResult = namedtuple("RouteResult", ["path", "distance", "expanded"])
+
+
+def fit_km_scale(graph, pos, weight="weight"):
+    """Підбирає масштаб км/одиниця карти за наявними дорогами.
+
+    Береться мінімальне відношення довжини дороги до прямої відстані між її
+    кінцями, тому пряма відстань * масштаб ніколи не перевищує жодної дороги,
+    а отже (за нерівністю трикутника) і жодного маршруту. Така евристика
+    допустима та монотонна.
+    """
+    best = None
+    for u, v, w in graph.edges(data=weight, default=1):
+        d = math.dist(pos[u], pos[v])
+        if d <= 1e-12:
+            continue
+        ratio = w / d
+        if best is None or ratio < best:
+            best = ratio
+    return best or 0.0
+
+
+def _check_nodes(graph, source, target):
+    for node in (source, target):
+        if node not in graph:
+            raise nx.NodeNotFound(f"Вершини {node} немає в графі")
+
+
+def _build_path(parent, node):
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+
+def dijkstra_route(graph, source, target, weight="weight", tracer=None):
+    # Звичайний Дейкстра з підрахунком розкритих вершин (для порівняння з A*)
+    return astar_route(graph, None, source, target, scale=0.0, weight=weight, tracer=tracer)
+
+
+def astar_route(graph, pos, source, target, scale=None, weight="weight", tracer=None):
+    # A* з евристикою "пряма відстань на карті * масштаб"
+    _check_nodes(graph, source, target)
+    if scale is None:
+        scale = fit_km_scale(graph, pos, weight)
+    if scale > 0:
+        goal_xy = pos[target]
+        h = lambda v: scale * math.dist(pos[v], goal_xy)
+    else:
+        h = lambda v: 0.0
+
+    tr = tracer
+    tie = count()
+    dist = {source: 0}
+    parent = {source: None}
+    heap = [(h(source), next(tie), source)]
+    closed = set()
+    expanded = 0
+    while heap:
+        _, _, u = heapq.heappop(heap)
+        if u in closed:
+            continue
+        closed.add(u)
+        expanded += 1
+        if tr: tr.expand(len(heap))
+        if u == target:
+            return RouteResult(_build_path(parent, u), dist[u], expanded)
+        du = dist[u]
+        for v, data in graph.adj[u].items():
+            if v in closed:
+                continue
+            if tr: tr.relax()
+            nd = du + data.get(weight, 1)
+            if nd < dist.get(v, math.inf):
+                dist[v] = nd
+                parent[v] = u
+                heapq.heappush(heap, (nd + h(v), next(tie), v))
+    raise nx.NetworkXNoPath(f"Шляху {source} -> {target} не існує")
+
+
+def bidirectional_astar_route(graph, pos, source, target, scale=None, weight="weight", tracer=None):
+    """Двонаправлений A* з усередненими потенціалами.
+
+    Прямий пошук використовує потенціал p(v) = (h_t(v) - h_s(v)) / 2, зворотний
+    -p(v). Обидва потенціали монотонні, тож зупинка відбувається, щойно сума
+    мінімальних ключів обох черг досягає довжини найкращого знайденого шляху.
+    """
+    _check_nodes(graph, source, target)
+    if source == target:
+        return RouteResult([source], 0, 0)
+    if scale is None:
+        scale = fit_km_scale(graph, pos, weight)
+    if scale > 0:
+        ps, pt = pos[source], pos[target]
+        pot = lambda v: 0.5 * scale * (math.dist(pos[v], pt) - math.dist(pos[v], ps))
+    else:
+        pot = lambda v: 0.0
+
+    tr = tracer
+    tie = count()
+    sign = (1, -1)
+    dist = ({source: 0}, {target: 0})
+    parent = ({source: None}, {target: None})
+    heaps = ([(pot(source), next(tie), source)], [(-pot(target), next(tie), target)])
+    closed = (set(), set())
+    best, meet = math.inf, None
+    expanded = 0
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        # Розширюємо меншу чергу — так фронти ростуть приблизно рівномірно
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        _, _, u = heapq.heappop(heaps[side])
+        if u in closed[side]:
+            continue
+        closed[side].add(u)
+        expanded += 1
+        if tr: tr.expand(len(heaps[0]) + len(heaps[1]))
+        du = dist[side][u]
+        other = dist[1 - side]
+        for v, data in graph.adj[u].items():
+            if tr: tr.relax()
+            nd = du + data.get(weight, 1)
+            if nd < dist[side].get(v, math.inf):
+                dist[side][v] = nd
+                parent[side][v] = u
+                heapq.heappush(heaps[side], (nd + sign[side] * pot(v), next(tie), v))
+            if v in other and dist[side][v] + other[v] < best:
+                best, meet = dist[side][v] + other[v], v
+
+    if meet is None:
+        raise nx.NetworkXNoPath(f"Шляху {source} -> {target} не існує")
+    forward = _build_path(parent[0], meet)
+    backward = _build_path(parent[1], meet)
+    backward.reverse()
+    return RouteResult(forward + backward[1:], best, expanded)
+
+
+# Назви режимів для інтерфейсу
+ROUTE_ALGORITHMS = {
+    "Дейкстра": lambda g, pos, s, e, tracer=None: dijkstra_route(g, s, e, tracer=tracer),
+    "A* (геометричний)": astar_route,
+    "Двонаправлений A*": bidirectional_astar_route,
+}
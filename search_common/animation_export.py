@@ -0,0 +1,137 @@
+"""Offscreen export of recorded search traces to GIF/MP4.
+
+A search is recorded headlessly into a SearchTrace (see search_trace and
+maze_trace), and frames are rendered from it without Tk. At most
+``max_frames`` events are picked evenly along the trace, and the last
+event is always included. The picked events are split into contiguous chunks and rendered
+in a process pool. Each worker gets the trace and the renderer options once,
+through the pool initializer. A worker replays the trace only up to its
+own chunk, so the replay work is not repeated across frames.
+
+A renderer is a top-level class (so it can be pickled by name) built as
+``renderer(trace, **options)``. Its ``render(index)`` returns the frame for
+event ``index`` as an (h, w, 3) uint8 array. Indices reach it in increasing
+order within a chunk, which lets renderers update their state incrementally.
+
+GIF is written with Pillow (installed with matplotlib), one frame at a time. MP4 is written by
+piping raw frames to ffmpeg from PATH.
+"""
+
+import os
+import shutil
+import subprocess
+
+import numpy as np
+
+from search_common.trace_format import SearchTrace
+
+
+def frame_indices(events, max_frames):
+    """Event indices to render: evenly spaced, always including the last event."""
+    if events <= 0:
+        return []
+    if events <= max_frames:
+        return list(range(events))
+    if max_frames <= 1:
+        return [events - 1]
+    step = (events - 1) / (max_frames - 1)
+    return sorted({round(i * step) for i in range(max_frames)})
+
+
+def upscale(frame, factor):
+    # Nearest-neighbour enlargement (cell-per-pixel maze frames -> visible cells)
+    return frame if factor == 1 else np.repeat(np.repeat(frame, factor, axis=0), factor, axis=1)
+
+
+_worker = None
+
+
+def _init_worker(renderer, data, options):
+    global _worker
+    _worker = renderer(SearchTrace.from_bytes(data), **options)
+
+
+def _render_chunk(indices):
+    return [_worker.render(i) for i in indices]
+
+
+def render_frames(trace, renderer, options, indices, processes=None, chunks_per_worker=4):
+    """Yields rendered frames in order; with 1 worker renders in this process."""
+    workers = min(processes or os.cpu_count() or 1, max(1, len(indices)))
+    if workers <= 1:
+        r = renderer(trace, **options)
+        for i in indices:
+            yield r.render(i)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    size = max(1, -(-len(indices) // (workers * chunks_per_worker)))
+    chunks = [indices[i:i + size] for i in range(0, len(indices), size)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(renderer, trace.to_bytes(compress=False), options)) as pool:
+        for frames in pool.map(_render_chunk, chunks):
+            yield from frames
+
+
+def write_gif(frames, path, fps, colors=()):
+    """Quantizes frames as they arrive, so only paletted images (1 byte/pixel) are held until the save.
+
+    The palette comes from the first frame plus `colors`: the RGB values the renderer paints later
+    (visited, path, ...) that are not on screen yet. A fixed palette is ~20x faster to quantize
+    against than an adaptive one per frame, and colours do not flicker between frames.
+    """
+    from PIL import Image
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        raise ValueError("no frames to write")
+    sample = first
+    if len(colors):
+        strip = np.zeros((1, first.shape[1], 3), dtype=np.uint8)
+        strip[0] = np.resize(np.asarray(colors, dtype=np.uint8).reshape(-1, 3), (first.shape[1], 3))
+        sample = np.concatenate([first, strip], axis=0)
+    palette = Image.fromarray(sample).quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+
+    def paletted(f):
+        return Image.fromarray(f).quantize(palette=palette, dither=Image.Dither.NONE)
+
+    # optimize=False: Pillow's transparent-delta optimisation flattens every frame in Python (~30 ms each)
+    paletted(first).save(path, save_all=True, append_images=(paletted(f) for f in frames),
+                         duration=max(1, round(1000 / fps)), loop=0, optimize=False)
+
+
+def write_mp4(frames, path, fps):
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        raise RuntimeError("MP4 export needs ffmpeg on PATH (GIF works without it)")
+    proc = None
+    try:
+        for f in frames:
+            if proc is None:
+                h, w = f.shape[:2]
+                # yuv420p needs even sides
+                cmd = [ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{w}x{h}",
+                       '-r', str(fps), '-i', '-', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path]
+                proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+            proc.stdin.write(np.ascontiguousarray(f).tobytes())
+    finally:
+        if proc is not None:
+            proc.stdin.close()
+            if proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed with exit code {proc.returncode}")
+
+
+def export_trace(trace, renderer, path, options=None, max_frames=300, fps=20, scale=1, processes=None, colors=()):
+    """Renders `trace` with `renderer` into `path` (.gif or .mp4); returns the number of frames.
+
+    `colors` lists the RGB values the renderer may paint, so the GIF palette keeps them exact.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in ('.gif', '.mp4'):
+        raise ValueError(f"unsupported animation format {ext!r} (use .gif or .mp4)")
+    indices = frame_indices(len(trace), max_frames)
+    frames = (upscale(f, scale) for f in render_frames(trace, renderer, options or {}, indices, processes))
+    if ext == '.gif':
+        write_gif(frames, path, fps, colors)
+    else:
+        write_mp4(frames, path, fps)
+    return len(indices)
@@ -0,0 +1,38 @@
+"""Runs slow work off the Tk main thread and hands the result back to it."""
+
+import queue
+import threading
+
+
+def run_in_background(widget, job, on_done, on_error=None, poll_ms=30):
+    """Starts ``job()`` in a daemon thread; ``on_done(result)`` runs on the Tk thread.
+
+    Tk is not thread-safe, so the worker never touches widgets: the result is
+    passed through a queue that the main loop polls with ``widget.after``.
+    ``on_error(exc)`` is called (also on the Tk thread) if the job raises.
+    """
+    results = queue.Queue(maxsize=1)
+
+    def worker():
+        try:
+            results.put((True, job()))
+        except BaseException as exc:
+            results.put((False, exc))
+
+    def poll():
+        try:
+            ok, value = results.get_nowait()
+        except queue.Empty:
+            widget.after(poll_ms, poll)
+            return
+        if ok:
+            on_done(value)
+        elif on_error is not None:
+            on_error(value)
+        else:
+            raise value
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    widget.after(poll_ms, poll)
+    return thread
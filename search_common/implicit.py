@@ -0,0 +1,120 @@
+"""Implicit graphs: successors computed on demand instead of a stored graph.
+
+The searches only call ``successors(node)`` (the method networkx graphs
+already have), so any object with that method can be searched directly and
+only the visited set is ever materialized. Grid spaces also provide
+``is_open(cell)``, ``rows``/``cols`` and ``grid[r][c]`` access with the maze
+convention (-1 wall, 0 passage) so they can stand in for a stored grid.
+"""
+
+WALL = -1
+PASSAGE = 0
+CARDINAL = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+_MASK = (1 << 64) - 1
+
+
+def _mix(x):
+    # splitmix64 finalizer: a cheap, well-spread hash of a 64-bit integer
+    x = (x + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+class ImplicitGraph:
+    """Wraps a ``successors(node) -> iterable`` function as a searchable graph."""
+
+    def __init__(self, successors):
+        self._successors = successors
+
+    def successors(self, node):
+        return self._successors(node)
+
+
+class _Row:
+    __slots__ = ('maze', 'r')
+
+    def __init__(self, maze, r):
+        self.maze, self.r = maze, r
+
+    def __len__(self):
+        return self.maze.cols
+
+    def __getitem__(self, c):
+        return PASSAGE if self.maze.is_open((self.r, c)) else WALL
+
+
+class ProceduralMaze:
+    """Grid maze of any size whose walls are a pure function of (seed, r, c).
+
+    Nothing is stored: a cell is a wall when its hash falls below
+    ``wall_density``. The corners (0, 0) and (rows-1, cols-1) are always
+    open, as in maze_search.generate_grid.
+    """
+
+    def __init__(self, rows, cols, wall_density=0.3, seed=0, directions=CARDINAL):
+        self.rows, self.cols = rows, cols
+        self.seed = _mix(seed & _MASK)
+        self.threshold = int(wall_density * (1 << 64))
+        self.directions = tuple(directions)
+
+    def is_open(self, cell):
+        r, c = cell
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return False
+        if (r == 0 and c == 0) or (r == self.rows - 1 and c == self.cols - 1):
+            return True
+        return _mix(self.seed ^ ((r << 32) | c)) >= self.threshold
+
+    def successors(self, cell):
+        r, c = cell
+        return [(r + dr, c + dc) for dr, dc in self.directions if self.is_open((r + dr, c + dc))]
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, r):
+        return _Row(self, r)
+
+
+class SlidingPuzzle:
+    """The (size^2 - 1)-puzzle as a state space; a state is a tuple with 0 for the blank."""
+
+    def __init__(self, size=3):
+        self.size = size
+        self.goal = tuple(range(1, size * size)) + (0,)
+
+    def successors(self, state):
+        n = self.size
+        i = state.index(0)
+        r, c = divmod(i, n)
+        result = []
+        for dr, dc in CARDINAL:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < n and 0 <= nc < n:
+                j = nr * n + nc
+                s = list(state)
+                s[i], s[j] = s[j], s[i]
+                result.append(tuple(s))
+        return result
+
+    def manhattan(self, state):
+        # admissible (and consistent) IDA*/A* heuristic: every move shifts one tile by one cell
+        n = self.size
+        total = 0
+        for i, tile in enumerate(state):
+            if tile:
+                g = tile - 1
+                total += abs(i // n - g // n) + abs(i % n - g % n)
+        return total
+
+    def scrambled(self, moves, seed=None):
+        """A solvable start state: a random walk of ``moves`` steps from the goal."""
+        import random
+        rng = random.Random(seed)
+        state, previous = self.goal, None
+        for _ in range(moves):
+            options = [s for s in self.successors(state) if s != previous]
+            previous, state = state, rng.choice(options)
+        return state
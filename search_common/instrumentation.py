@@ -0,0 +1,175 @@
+"""Lightweight tracing for the search engines.
+
+Engines take an optional ``tracer`` argument. When it is ``None`` (the
+default) the hot loops only pay for a single ``if tr:`` check per expansion,
+so tracing can stay wired in permanently and be switched on from the
+environment when a slow query has to be diagnosed::
+
+    SEARCH_TRACE=counters                 # keep run records in memory
+    SEARCH_TRACE=jsonl:/tmp/search.jsonl  # append one JSON line per run
+    SEARCH_TRACE=profile,jsonl:trace.jsonl  # cProfile + tracemalloc as well
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+
+class TraceSink:
+    """Base sink. ``start``/``stop`` bracket a run, ``write`` receives the record."""
+
+    def start(self, run):
+        pass
+
+    def stop(self, run):
+        pass
+
+    def write(self, run):
+        pass
+
+
+class CounterSink(TraceSink):
+    """Keeps the last ``keep`` run records and running totals in memory."""
+
+    def __init__(self, keep=256):
+        self.runs = deque(maxlen=keep)
+        self.totals = {'runs': 0, 'expanded': 0, 'relaxed': 0, 'seconds': 0.0}
+
+    def write(self, run):
+        self.runs.append(run)
+        self.totals['runs'] += 1
+        self.totals['expanded'] += run['expanded']
+        self.totals['relaxed'] += run['relaxed']
+        self.totals['seconds'] += run['seconds']
+
+    def last(self):
+        return self.runs[-1] if self.runs else None
+
+
+class JsonLinesSink(TraceSink):
+    """Appends every run record as a JSON line to ``path``."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, run):
+        line = json.dumps(run, ensure_ascii=False, default=str)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+class ProfileSink(TraceSink):
+    """Captures cProfile statistics and tracemalloc peak memory for each run."""
+
+    def __init__(self, top=15, sort='cumulative'):
+        self.top = top
+        self.sort = sort
+        self._profile = None
+        self._own_tracemalloc = False
+
+    def start(self, run):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self, run):
+        self._profile.disable()
+        run['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+            self._own_tracemalloc = False
+        out = io.StringIO()
+        pstats.Stats(self._profile, stream=out).sort_stats(self.sort).print_stats(self.top)
+        run['profile'] = out.getvalue()
+        self._profile = None
+
+
+class SearchTracer:
+    """Collects counters for one search run at a time and forwards them to sinks.
+
+    ``frontier_every`` controls how often (in expansions) the frontier size is
+    sampled, which keeps the per-expansion cost constant on long runs.
+    """
+
+    def __init__(self, *sinks, frontier_every=64):
+        self.sinks = list(sinks)
+        self.frontier_every = max(1, int(frontier_every))
+        self.run = None
+
+    def __bool__(self):
+        return bool(self.sinks)
+
+    def begin(self, engine, **query):
+        if self.run is not None:
+            self.end(aborted=True)
+        self.run = {'engine': engine, 'query': query, 'expanded': 0, 'relaxed': 0,
+                    'phases': {}, 'frontier': [], 'max_frontier': 0, 'seconds': 0.0}
+        self._t0 = time.perf_counter()
+        for sink in self.sinks:
+            sink.start(self.run)
+
+    @contextmanager
+    def phase(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases = self.run['phases']
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - t
+
+    def expand(self, frontier_size):
+        run = self.run
+        run['expanded'] += 1
+        if frontier_size > run['max_frontier']:
+            run['max_frontier'] = frontier_size
+        if run['expanded'] % self.frontier_every == 1 or self.frontier_every == 1:
+            run['frontier'].append((round(time.perf_counter() - self._t0, 6), run['expanded'], frontier_size))
+
+    def relax(self, n=1):
+        self.run['relaxed'] += n
+
+    def end(self, **result):
+        run = self.run
+        if run is None:
+            return None
+        run['seconds'] = time.perf_counter() - self._t0
+        run['result'] = result
+        for sink in self.sinks:
+            sink.stop(run)
+        for sink in self.sinks:
+            sink.write(run)
+        self.run = None
+        return run
+
+    def counters(self):
+        return next((s for s in self.sinks if isinstance(s, CounterSink)), None)
+
+
+def tracer_from_env(var='SEARCH_TRACE'):
+    """Builds a tracer from the environment, or returns ``None`` when tracing is off."""
+    spec = os.environ.get(var, '').strip()
+    if not spec:
+        return None
+    sinks = []
+    for part in spec.split(','):
+        kind, _, arg = part.strip().partition(':')
+        if kind == 'profile':
+            sinks.append(ProfileSink())
+        elif kind == 'jsonl':
+            sinks.append(JsonLinesSink(arg or 'search_trace.jsonl'))
+        elif kind == 'counters':
+            sinks.append(CounterSink())
+    if not any(isinstance(s, CounterSink) for s in sinks):
+        sinks.append(CounterSink())
+    return SearchTracer(*sinks)
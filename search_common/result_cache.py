@@ -0,0 +1,99 @@
+"""LRU cache of finished search results, keyed by structure version and query.
+
+Users often repeat the same query (start/goal, algorithm, settings) on an
+unchanged graph or maze. ``ResultCache`` remembers finished results under
+``(version, *query)``: the owner calls ``bump()`` on every structural edit,
+which advances the version and drops the now unreachable entries, so a hit is
+always a result for the current structure. Entries are evicted least recently
+used first once the estimated size of the cached results exceeds ``max_bytes``.
+
+A result computed in the background can be stored with the key taken when
+the query started: if the structure was edited meanwhile, ``put`` ignores it.
+"""
+
+import sys
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+def approx_size(obj, _depth=0):
+    """Rough deep size in bytes of a result made of containers and scalars."""
+    size = sys.getsizeof(obj)
+    if _depth > 4:
+        return size
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += approx_size(k, _depth + 1) + approx_size(v, _depth + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += approx_size(item, _depth + 1)
+    elif isinstance(getattr(obj, 'nbytes', None), int):
+        size += obj.nbytes              # compact stores and arrays report their buffer size
+    elif hasattr(obj, '__dict__'):
+        size += approx_size(vars(obj), _depth + 1)
+    return size
+
+
+class ResultCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=4096):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries = OrderedDict()   # key -> (value, nbytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, *query):
+        """Cache key of ``query`` for the current structure version."""
+        return (self.version,) + query
+
+    def bump(self):
+        """The structure changed: results of earlier versions can no longer be hit."""
+        self.version += 1
+        self._entries.clear()
+        self.bytes = 0
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, nbytes=None):
+        if key[0] != self.version:
+            return                      # computed on a structure that has since been edited
+        nbytes = approx_size(value) if nbytes is None else nbytes
+        if nbytes > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self._entries[key] = (value, nbytes)
+        self.bytes += nbytes
+        while self.bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {'version': self.version, 'entries': len(self._entries), 'bytes': self.bytes,
+                'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate,
+                'evictions': self.evictions}
+
+    def describe(self):
+        return (f"{self.hits}/{self.hits + self.misses} hits ({100 * self.hit_rate:.0f}%), "
+                f"{len(self._entries)} entries, {self.bytes / 1024:.0f} KiB")
@@ -0,0 +1,88 @@
+"""Turbo auto-run: as many search steps per frame as fit a time budget, one render per frame.
+
+The GUIs' auto mode advances one step per ``after(delay)`` tick and redraws
+after each, so a long search spends most of its time idle or repainting.
+``TurboScheduler`` instead runs frames at display rate: each frame calls
+``step()`` until the frame's step budget (a share of the frame time) is used
+or the optional steps/second target for the frame is reached, then calls
+``render(steps, finished)`` once. Visual effects of the steps in a frame are
+therefore merged into a single redraw of the latest state.
+"""
+
+import time
+
+
+class TurboScheduler:
+    def __init__(self, widget, step, render, steps_per_sec=0, fps=60, budget=0.75, on_done=None):
+        """``step() -> bool`` advances the search (False once it is finished);
+        ``render(steps, finished)`` draws the merged result of a frame;
+        ``steps_per_sec`` of 0 means as many as the budget allows."""
+        self.widget, self.step, self.render, self.on_done = widget, step, render, on_done
+        self.steps_per_sec, self.fps, self.budget = steps_per_sec, fps, budget
+        self.running = False
+        self.steps = 0
+        self.frames = 0
+        self.started = 0.0
+        self._carry = 0.0
+        self._job = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.steps = self.frames = 0
+        self._carry = 0.0
+        self.started = time.perf_counter()
+        self._frame()
+
+    def stop(self):
+        self.running = False
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    @property
+    def rate(self):
+        """Achieved steps per second since start()."""
+        elapsed = time.perf_counter() - self.started
+        return self.steps / elapsed if elapsed > 0 else 0.0
+
+    def _quota(self, frame):
+        # steps allowed this frame by the target rate; the fraction carries over
+        if not self.steps_per_sec:
+            return float('inf')
+        self._carry += self.steps_per_sec * frame
+        quota = int(self._carry)
+        self._carry -= quota
+        return quota
+
+    def _frame(self):
+        self._job = None
+        if not self.running:
+            return
+        frame = 1.0 / self.fps
+        t0 = time.perf_counter()
+        deadline = t0 + self.budget * frame
+        quota = self._quota(frame)
+        n = 0
+        finished = False
+        while n < quota:
+            if not self.step():
+                finished = True
+                break
+            n += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.steps += n
+        self.frames += 1
+        self.render(n, finished)
+        if finished:
+            self.running = False
+            if self.on_done is not None:
+                self.on_done()
+            return
+        if not self.running:
+            return
+        # a slow render stretches the frame: the animation then runs at the rate the display keeps up with
+        wait = frame - (time.perf_counter() - t0)
+        self._job = self.widget.after(max(1, int(wait * 1000)), self._frame)
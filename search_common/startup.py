@@ -0,0 +1,38 @@
+"""Cold-start timing for the Tk apps, driven by benchmarks/startup_bench.py.
+
+The benchmark launches an app with ``APP_STARTUP_BENCH=1`` and
+``APP_STARTUP_T0`` set to the launch time. The app marks when its window is
+first idle and when its heavy data is attached; with the benchmark flag set
+it prints the marks as one JSON line and exits.
+"""
+
+import json
+import os
+import sys
+import time
+
+
+class StartupTimer:
+    def __init__(self, root, app):
+        self.root = root
+        self.app = app
+        self.enabled = bool(os.environ.get('APP_STARTUP_BENCH'))
+        self.t0 = float(os.environ.get('APP_STARTUP_T0') or time.time())
+        self.marks = {}
+        self._done = False
+        root.after_idle(self.mark, 'window')
+
+    def mark(self, stage):
+        self.marks.setdefault(stage, round(time.time() - self.t0, 4))
+
+    def ready(self):
+        """Called once the app has attached its data; ends the run under the benchmark."""
+        if self._done:
+            return
+        self._done = True
+        self.mark('window')
+        self.mark('ready')
+        if self.enabled:
+            print(json.dumps({'app': self.app, **self.marks}), flush=True)
+            sys.stdout.flush()
+            self.root.after(0, self.root.destroy)
@@ -0,0 +1,315 @@
+"""Compact visited/parent storage for searches over many nodes.
+
+The searches keep ``visited`` as a set and ``parent`` as a dict, about 100+
+bytes per reached node. A store here provides drop-in replacements with the
+same operations the engines use (``in``, ``add``, ``discard``, ``len`` and
+``parent[x] = y``, ``parent.get(x)``):
+
+* ``SetStore``    - the plain set/dict (default, fastest for small searches)
+* ``BitmapStore`` - dense integer ids 0..capacity-1: one bit per id for
+  visited plus an int32 parent array (int64 above 2**31 - 3 ids), about
+  4.1 (8.1) bytes per id
+* ``GridStore``   - (r, c) cells linearized as ``r * cols + c`` over a bitmap
+* ``MmapStore``   - the bitmap layout in a memory-mapped temporary file, so
+  the OS pages it out instead of the process holding it in RAM
+
+Both compact layouts are zero-initialised mappings (0 = no parent, parents
+are stored shifted by +2 and the start node as 1). Nothing is written up
+front, so only the pages a search actually touches take memory or disk
+(the temporary file stays sparse).
+
+Engines take a zero-argument ``store`` factory (e.g. ``lambda: GridStore(rows,
+cols)``) and create a fresh store per search side. Iterating a compact store
+or calling ``copy()`` materializes a regular set/dict (used by the GUIs).
+Every store has ``close()``; it releases the mapping and temporary file of an
+``MmapStore`` (a no-op for the others), after which its views are unusable.
+"""
+
+import mmap
+import sys
+import tempfile
+from array import array
+
+ABSENT = 0     # no parent recorded (the zero pages of a fresh mapping)
+ROOT = 1       # stored for the start node (parent None)
+_SHIFT = 2     # parent id p is stored as p + _SHIFT
+
+_INT32_MAX = 2 ** 31 - 1
+
+
+def parent_typecode(capacity):
+    """'i' (int32) while every shifted id fits, else 'q' (int64)."""
+    return 'i' if capacity - 1 + _SHIFT <= _INT32_MAX else 'q'
+
+
+def _layout(capacity):
+    # (typecode, bitmap bytes, parent array offset, total bytes) of the bitmap layout
+    code = parent_typecode(capacity)
+    nbits = (capacity + 7) >> 3
+    offset = (nbits + 7) & ~7           # keep the parent array aligned
+    return code, nbits, offset, offset + array(code).itemsize * capacity
+
+
+def store_bytes(capacity):
+    """Mapped size of a bitmap/mmap store for `capacity` ids (only touched pages are resident)."""
+    return _layout(capacity)[3]
+
+_BITS = bytes(1 << i for i in range(8))
+
+
+class BitSet:
+    """Set of ints in [0, capacity) backed by a bytearray (or any writable buffer)."""
+
+    def __init__(self, capacity, buffer=None):
+        self.capacity = capacity
+        self.bits = buffer if buffer is not None else bytearray((capacity + 7) >> 3)
+        self.count = 0
+
+    def __contains__(self, i):
+        return self.bits[i >> 3] & _BITS[i & 7] != 0
+
+    def add(self, i):
+        b = _BITS[i & 7]
+        byte = self.bits[i >> 3]
+        if not byte & b:
+            self.bits[i >> 3] = byte | b
+            self.count += 1
+
+    def discard(self, i):
+        b = _BITS[i & 7]
+        byte = self.bits[i >> 3]
+        if byte & b:
+            self.bits[i >> 3] = byte & ~b
+            self.count -= 1
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        bits = self.bits
+        for byte_index in range(len(bits)):
+            byte = bits[byte_index]
+            if byte:
+                base = byte_index << 3
+                for k in range(8):
+                    if byte >> k & 1:
+                        yield base + k
+
+    def copy(self):
+        return set(self)
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+class ParentArray:
+    """Mapping int -> int | None over a flat zero-initialised int32/int64 array (0 marks missing keys).
+
+    Without ``buffer`` the array is an anonymous mapping, so untouched pages cost no memory.
+    """
+
+    def __init__(self, capacity, buffer=None):
+        self.capacity = capacity
+        if buffer is None:
+            code = parent_typecode(capacity)
+            size = array(code).itemsize * max(capacity, 1)
+            buffer = memoryview(mmap.mmap(-1, size)).cast(code)
+        self.data = buffer
+        self.count = 0
+
+    def __setitem__(self, i, parent):
+        if self.data[i] == ABSENT:
+            self.count += 1
+        self.data[i] = ROOT if parent is None else parent + _SHIFT
+
+    def __getitem__(self, i):
+        p = self.data[i]
+        if p == ABSENT:
+            raise KeyError(i)
+        return None if p == ROOT else p - _SHIFT
+
+    def get(self, i, default=None):
+        p = self.data[i]
+        if p == ABSENT:
+            return default
+        return None if p == ROOT else p - _SHIFT
+
+    def __contains__(self, i):
+        return self.data[i] != ABSENT
+
+    def pop(self, i, default=None):
+        p = self.get(i, default)
+        if self.data[i] != ABSENT:
+            self.data[i] = ABSENT
+            self.count -= 1
+        return p
+
+    def __len__(self):
+        return self.count
+
+    def items(self):
+        data = self.data
+        for i in range(self.capacity):
+            p = data[i]
+            if p != ABSENT:
+                yield i, (None if p == ROOT else p - _SHIFT)
+
+    def copy(self):
+        return dict(self.items())
+
+    @property
+    def nbytes(self):
+        return self.data.itemsize * self.capacity
+
+
+class _CellSet:
+    # (r, c) view over an int set
+    def __init__(self, inner, cols):
+        self.inner, self.cols = inner, cols
+
+    def __contains__(self, cell):
+        return cell[0] * self.cols + cell[1] in self.inner
+
+    def add(self, cell):
+        self.inner.add(cell[0] * self.cols + cell[1])
+
+    def discard(self, cell):
+        self.inner.discard(cell[0] * self.cols + cell[1])
+
+    def __len__(self):
+        return len(self.inner)
+
+    def __iter__(self):
+        cols = self.cols
+        return (divmod(i, cols) for i in self.inner)
+
+    def copy(self):
+        return set(self)
+
+    @property
+    def nbytes(self):
+        return self.inner.nbytes
+
+
+class _CellParents:
+    # (r, c) -> (r, c) view over an int parent array
+    def __init__(self, inner, cols):
+        self.inner, self.cols = inner, cols
+
+    def __setitem__(self, cell, parent):
+        cols = self.cols
+        self.inner[cell[0] * cols + cell[1]] = None if parent is None else parent[0] * cols + parent[1]
+
+    def get(self, cell, default=None):
+        i = cell[0] * self.cols + cell[1]
+        if i not in self.inner:
+            return default
+        p = self.inner.get(i)
+        return None if p is None else divmod(p, self.cols)
+
+    def __getitem__(self, cell):
+        i = cell[0] * self.cols + cell[1]
+        p = self.inner[i]
+        return None if p is None else divmod(p, self.cols)
+
+    def __contains__(self, cell):
+        return cell[0] * self.cols + cell[1] in self.inner
+
+    def pop(self, cell, default=None):
+        p = self.get(cell, default)
+        self.inner.pop(cell[0] * self.cols + cell[1])
+        return p
+
+    def __len__(self):
+        return len(self.inner)
+
+    def items(self):
+        cols = self.cols
+        for i, p in self.inner.items():
+            yield divmod(i, cols), (None if p is None else divmod(p, cols))
+
+    def copy(self):
+        return dict(self.items())
+
+
+class SetStore:
+    """The default: a Python set and dict (any hashable node)."""
+
+    def __init__(self):
+        self.visited = set()
+        self.parent = {}
+
+    @property
+    def nbytes(self):
+        return sys.getsizeof(self.visited) + sys.getsizeof(self.parent)
+
+    def close(self):
+        pass
+
+
+class BitmapStore:
+    """Dense integer ids in [0, capacity): visited bits plus an int32/int64 parent array."""
+
+    def __init__(self, capacity):
+        self.visited = BitSet(capacity)
+        self.parent = ParentArray(capacity)
+
+    @property
+    def nbytes(self):
+        return self.visited.nbytes + self.parent.nbytes
+
+    def close(self):
+        # the anonymous mapping is freed with the arrays
+        pass
+
+
+class MmapStore:
+    """BitmapStore layout in an anonymous temporary file mapped into memory."""
+
+    def __init__(self, capacity, path=None):
+        code, nbits, offset, size = _layout(capacity)
+        self._file = open(path, 'w+b') if path else tempfile.TemporaryFile()
+        self._file.truncate(max(size, 1))   # sparse: zero blocks are allocated on first write
+        self._map = mmap.mmap(self._file.fileno(), max(size, 1))
+        self._view = view = memoryview(self._map)
+        parents = view[offset:size].cast(code)
+        self.visited = BitSet(capacity, view[:nbits])
+        self.parent = ParentArray(capacity, parents)
+        self.size = size
+
+    @property
+    def nbytes(self):
+        return self.size
+
+    def close(self):
+        if self._map.closed:
+            return
+        # exported memoryviews must be released before the map can close
+        for view in (self.visited.bits, self.parent.data, self._view):
+            view.release()
+        self.visited = self.parent = self._view = None
+        self._map.close()
+        self._file.close()
+
+
+class GridStore:
+    """(r, c) cells of a rows x cols grid, linearized to r * cols + c over a bitmap (or mmap) store."""
+
+    def __init__(self, rows, cols, mmap=False):
+        self.rows, self.cols = rows, cols
+        self.base = MmapStore(rows * cols) if mmap else BitmapStore(rows * cols)
+        self.visited = _CellSet(self.base.visited, cols)
+        self.parent = _CellParents(self.base.parent, cols)
+
+    @property
+    def nbytes(self):
+        return self.base.nbytes
+
+    def close(self):
+        self.base.close()
+
+
+def new_store(store):
+    """A fresh store from a factory (``None`` gives a SetStore); the caller closes it when the search ends."""
+    return SetStore() if store is None else store()
@@ -0,0 +1,157 @@
+"""Compact binary traces of search runs and a seekable player for them.
+
+A trace is an event stream: one action code (uint8) and one node id (int32)
+per event, plus a small JSON header describing the run. The layout is::
+
+    b'SRTR' | version u8 | flags u8 | meta_len u32 | meta (utf-8 JSON)
+    | count u32 | payload
+
+where the payload is ``count`` little-endian int32 node ids followed by
+``count`` action bytes, zlib-compressed when ``flags & 1``. Node id ``-1``
+means "no node" (e.g. for ``not_found``).
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+MAGIC = b'SRTR'
+VERSION = 1
+FLAG_ZLIB = 1
+NO_NODE = -1
+
+_HEADER = struct.Struct('<4sBBI')
+_COUNT = struct.Struct('<I')
+
+
+class SearchTrace:
+    """Recorded event stream of one search run."""
+
+    def __init__(self, actions, meta=None):
+        self.actions = list(actions)
+        self.codes = {name: i for i, name in enumerate(self.actions)}
+        self.meta = dict(meta or {})
+        self.ops = bytearray()
+        self.nodes = array('i')
+
+    def append(self, action, node=None):
+        self.ops.append(self.codes[action])
+        self.nodes.append(NO_NODE if node is None else node)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __getitem__(self, i):
+        node = self.nodes[i]
+        return self.actions[self.ops[i]], (None if node == NO_NODE else node)
+
+    def __iter__(self):
+        actions = self.actions
+        for op, node in zip(self.ops, self.nodes):
+            yield actions[op], (None if node == NO_NODE else node)
+
+    @property
+    def nbytes(self):
+        return len(self.ops) + self.nodes.itemsize * len(self.nodes)
+
+    def to_bytes(self, compress=True):
+        meta = dict(self.meta, actions=self.actions)
+        meta_raw = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        nodes = array('i', self.nodes)
+        if sys.byteorder != 'little':
+            nodes.byteswap()
+        payload = nodes.tobytes() + bytes(self.ops)
+        flags = 0
+        if compress:
+            payload = zlib.compress(payload, 6)
+            flags |= FLAG_ZLIB
+        return _HEADER.pack(MAGIC, VERSION, flags, len(meta_raw)) + meta_raw + _COUNT.pack(len(self.ops)) + payload
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, flags, meta_len = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError('not a search trace')
+        if version > VERSION:
+            raise ValueError(f'unsupported trace version {version}')
+        off = _HEADER.size
+        meta = json.loads(bytes(data[off:off + meta_len]).decode('utf-8'))
+        off += meta_len
+        (count,) = _COUNT.unpack_from(data, off)
+        payload = bytes(data[off + _COUNT.size:])
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        trace = cls(meta.pop('actions'), meta)
+        trace.nodes.frombytes(payload[:4 * count])
+        if sys.byteorder != 'little':
+            trace.nodes.byteswap()
+        trace.ops = bytearray(payload[4 * count:4 * count + count])
+        return trace
+
+    def save(self, path, compress=True):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes(compress))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class TracePlayer:
+    """Random access over a trace by replaying events into a state object.
+
+    ``make_state`` returns a fresh reducer with ``apply(action, node)`` and
+    ``clone()``. Checkpoints are taken every ``checkpoint_every`` events as
+    playback moves forward, so seeking backwards only replays from the
+    nearest checkpoint instead of from the start. A clone copies the whole
+    visited/parent state, so at most ``max_checkpoints`` are kept: when the
+    limit is reached the spacing doubles and every other checkpoint is
+    dropped, which bounds memory at ``max_checkpoints`` states while a
+    backward seek replays at most ~2 * len(trace) / max_checkpoints events.
+    """
+
+    def __init__(self, trace, make_state, checkpoint_every=1024, max_checkpoints=32):
+        self.trace = trace
+        self.make_state = make_state
+        self.every = max(1, int(checkpoint_every))
+        self.max_checkpoints = max(1, int(max_checkpoints))
+        self._checkpoints = {}
+        self.state = make_state()
+        self.position = -1
+
+    def __len__(self):
+        return len(self.trace)
+
+    def seek(self, index):
+        """Moves to event ``index`` (inclusive) and returns the reducer."""
+        index = max(-1, min(int(index), len(self.trace) - 1))
+        if index < self.position:
+            base = max((k for k in self._checkpoints if k <= index), default=None)
+            if base is None:
+                self.state, self.position = self.make_state(), -1
+            else:
+                self.state, self.position = self._checkpoints[base].clone(), base
+        trace, state = self.trace, self.state
+        for i in range(self.position + 1, index + 1):
+            state.apply(*trace[i])
+            if i % self.every == 0 and i not in self._checkpoints:
+                self._checkpoints[i] = state.clone()
+                if len(self._checkpoints) > self.max_checkpoints:
+                    self._thin()
+        self.position = index
+        return state
+
+    def _thin(self):
+        # Doubles the checkpoint spacing, keeping only checkpoints on the new grid
+        self.every *= 2
+        self._checkpoints = {k: v for k, v in self._checkpoints.items() if k % self.every == 0}
+
+    def step(self):
+        return self.seek(self.position + 1)
+
+    @property
+    def finished(self):
+        return self.position >= len(self.trace) - 1